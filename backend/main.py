@@ -1,5 +1,7 @@
 # backend/main.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -17,9 +19,22 @@ from routers import (
     law_resolve,
 )
 
+from utils import db_async, db_pool
+from utils.statute_index import get_statute_index
+
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the in-memory statute index before the first section lookup
+    await db_async.run_db(get_statute_index)
+    yield
+    db_async.shutdown()
+    db_pool.close_all()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS Setup
 app.add_middleware(
@@ -11,21 +11,25 @@ Your database columns:
 Endpoints:
 - POST /api/search/keyword - Keyword search using FTS5
 - POST /api/search/semantic - AI semantic search using embeddings
+- POST /api/search/hybrid - Keyword + semantic search fused with reciprocal rank fusion
 - GET /api/search/citation/{citation} - Lookup by citation
 - GET /api/search/recent - Get recent judgments
 - GET /api/search/stats - Database statistics
 - GET /api/search/judgment/{id} - Get full judgment details
+- GET /api/search/judgment/{id}/cited-by - Judgments citing it
+- GET /api/search/judgment/{id}/cites - Judgments it cites
 """
 
 import os
+import asyncio
 import logging
 import sqlite3
-import pickle
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date, datetime, timedelta
 
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, field_validator
 
 # NumPy for vector operations
 try:
@@ -35,16 +39,26 @@ try:
 except ImportError:
     NUMPY_AVAILABLE = False
 
-# OpenAI for semantic search
-try:
-    from openai import OpenAI
-
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
 from dotenv import load_dotenv
 
+from services.citation_graph import (
+    AUTHORITY_WEIGHT,
+    authority_stats,
+    boost_by_authority,
+    cited_judgments,
+    citing_judgments,
+    get_authority,
+)
+from services.ann_index import INDEX_PATH as ANN_INDEX_PATH, get_ann_index
+from services.embedding_backends import EMBEDDING_BACKEND, get_backend
+from services.embedding_store import get_embedding_matrix
+from services.query_embeddings import cache_stats as query_cache_stats, generate_query_embedding
+from utils.citations import citation_where, normalize_citation
+from utils.courts import COURTS
+from utils.db_async import executor_stats, run_db
+from utils.db_pool import acquire, pool_stats
+from utils.fts_query import compile_fts_query
+
 load_dotenv()
 
 # =============================================================================
@@ -58,23 +72,46 @@ logger = logging.getLogger(__name__)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(SCRIPT_DIR, '..', 'data', 'legal_db.sqlite')
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
 
 # =============================================================================
 # PYDANTIC MODELS (Request/Response schemas)
 # =============================================================================
 
+class SearchFilters(BaseModel):
+    """Structured filters applied before ranking. Unset fields do not filter."""
+    date_from: Optional[date] = Field(None, description="Earliest judgment_date (inclusive)")
+    date_to: Optional[date] = Field(None, description="Latest judgment_date (inclusive)")
+    courts: Optional[List[str]] = Field(None, description="Court codes, e.g. SCP, LHC, SHC, IHC, PHC, BHC, FSC")
+    has_citation: Optional[bool] = Field(None, description="Only reported (true) or unreported (false) judgments")
+
+    @field_validator("courts")
+    @classmethod
+    def validate_courts(cls, courts: Optional[List[str]]) -> Optional[List[str]]:
+        if courts is None:
+            return None
+        codes = [c.strip().upper() for c in courts]
+        unknown = [c for c in codes if c not in COURTS]
+        if unknown:
+            raise ValueError(f"Unknown court code(s): {', '.join(unknown)}. Known: {', '.join(COURTS)}")
+        return codes
+
+    @property
+    def active(self) -> bool:
+        return any(v is not None for v in (self.date_from, self.date_to, self.courts, self.has_citation))
+
+
 class KeywordSearchRequest(BaseModel):
     """Request model for keyword search."""
     query: str = Field(..., min_length=1, max_length=500, description="Search query")
     limit: int = Field(20, ge=1, le=100, description="Maximum results to return")
+    filters: Optional[SearchFilters] = None
 
     class Config:
         json_schema_extra = {
             "example": {
                 "query": "bail murder",
-                "limit": 20
+                "limit": 20,
+                "filters": {"courts": ["SCP"], "date_from": "2015-01-01"}
             }
         }
 
@@ -83,12 +120,46 @@ class SemanticSearchRequest(BaseModel):
     """Request model for semantic/AI search."""
     query: str = Field(..., min_length=3, max_length=1000, description="Natural language query")
     limit: int = Field(10, ge=1, le=50, description="Maximum results to return")
+    nprobe: Optional[int] = Field(
+        None, ge=1, le=4096,
+        description="ANN lists to scan (higher = better recall, slower). Defaults to ANN_NPROBE"
+    )
+    exact: bool = Field(False, description="Skip the ANN index and scan every embedding")
+    filters: Optional[SearchFilters] = None
 
     class Config:
         json_schema_extra = {
             "example": {
                 "query": "can police arrest someone without a warrant",
-                "limit": 10
+                "limit": 10,
+                "nprobe": 16,
+                "filters": {"courts": ["LHC", "IHC"], "has_citation": True}
+            }
+        }
+
+
+class HybridSearchRequest(BaseModel):
+    """Request model for hybrid (keyword + semantic) search."""
+    query: str = Field(..., min_length=1, max_length=1000, description="Search query")
+    limit: int = Field(10, ge=1, le=50, description="Maximum results to return")
+    keyword_weight: float = Field(1.0, ge=0, le=10, description="RRF weight of the FTS5 ranking")
+    semantic_weight: float = Field(1.0, ge=0, le=10, description="RRF weight of the embedding ranking")
+    rrf_k: int = Field(60, ge=1, le=1000, description="RRF constant: higher flattens the rank curve")
+    candidates: int = Field(50, ge=1, le=200, description="Candidates taken from each source before fusion")
+    nprobe: Optional[int] = Field(
+        None, ge=1, le=4096,
+        description="ANN lists to scan (higher = better recall, slower). Defaults to ANN_NPROBE"
+    )
+    exact: bool = Field(False, description="Skip the ANN index and scan every embedding")
+    filters: Optional[SearchFilters] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query": "489-F cheque dishonour bail",
+                "limit": 10,
+                "keyword_weight": 1.0,
+                "semantic_weight": 1.0
             }
         }
 
@@ -105,6 +176,14 @@ class JudgmentSummary(BaseModel):
     relevance_score: Optional[float] = None
 
 
+class HybridJudgment(JudgmentSummary):
+    """Search result with the rank and score it got from each source (None = not retrieved)."""
+    keyword_rank: Optional[int] = None
+    keyword_score: Optional[float] = None
+    semantic_rank: Optional[int] = None
+    semantic_score: Optional[float] = None
+
+
 class JudgmentFull(BaseModel):
     """Full judgment model with all details."""
     id: int
@@ -128,6 +207,27 @@ class SearchResponse(BaseModel):
     search_type: str
 
 
+class HybridSearchResponse(BaseModel):
+    """Hybrid search response; sources lists the rankings that were fused."""
+    success: bool
+    query: str
+    total_results: int
+    results: List[HybridJudgment]
+    search_type: str
+    sources: List[str]
+
+
+class CitationGraphResponse(BaseModel):
+    """Judgments linked to one judgment in the citation graph."""
+    success: bool
+    judgment_id: int
+    cited_by_count: int
+    authority: Optional[float] = None
+    total_results: int
+    results: List[JudgmentSummary]
+    unresolved: List[str] = []
+
+
 class StatsResponse(BaseModel):
     """Database statistics response model."""
     total_judgments: int
@@ -143,7 +243,8 @@ class StatsResponse(BaseModel):
 
 def get_db_connection() -> sqlite3.Connection:
     """
-    Get database connection with row factory.
+    Get a pooled read-only database connection with row factory
+    (close() returns it to the pool).
     Raises HTTPException if database not found.
     """
     if not os.path.exists(DB_PATH):
@@ -152,9 +253,7 @@ def get_db_connection() -> sqlite3.Connection:
             detail="Database not found. Please run the scraper first."
         )
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return acquire(DB_PATH)
 
 
 def row_to_judgment_summary(row: sqlite3.Row, score: float = None) -> JudgmentSummary:
@@ -188,56 +287,263 @@ def row_to_judgment_full(row: sqlite3.Row) -> JudgmentFull:
 
 
 # =============================================================================
-# EMBEDDING FUNCTIONS
+# SEARCH HELPERS
 # =============================================================================
 
-def generate_query_embedding(query: str) -> Optional[List[float]]:
+SUMMARY_COLUMNS = "id, title, citation, summary, pdf_url, judgment_date, created_at"
+SUMMARY_COLUMNS_J = ", ".join(f"j.{c}" for c in SUMMARY_COLUMNS.split(", "))
+
+
+def filter_predicates(filters: Optional[SearchFilters], alias: str = "") -> Tuple[str, List[Any]]:
     """
-    Generate embedding vector for search query using OpenAI.
-    Returns None if OpenAI is not available or fails.
+    SQL for the active filters as (" AND ...", params), ready to append to a
+    WHERE clause; ("", []) when nothing filters. Predicates only touch
+    judgment_date / court / citation so they can use idx_judgments_court_date
+    and idx_judgments_date (scripts/add_court_column.py).
     """
-    if not OPENAI_AVAILABLE:
-        return None
+    if filters is None or not filters.active:
+        return "", []
+
+    col = f"{alias}." if alias else ""
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    if filters.date_from:
+        clauses.append(f"{col}judgment_date >= ?")
+        params.append(filters.date_from.isoformat())
+    if filters.date_to:
+        # Exclusive upper bound so dates stored with a time part still match
+        clauses.append(f"{col}judgment_date < ?")
+        params.append((filters.date_to + timedelta(days=1)).isoformat())
+    if filters.courts:
+        clauses.append(f"{col}court IN ({','.join('?' * len(filters.courts))})")
+        params.extend(filters.courts)
+    if filters.has_citation is not None:
+        reported = f"({col}citation IS NOT NULL AND {col}citation NOT IN ('', 'Unreported'))"
+        clauses.append(reported if filters.has_citation else f"NOT {reported}")
+
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def check_filters_supported(conn: sqlite3.Connection, filters: Optional[SearchFilters]) -> None:
+    """Court filters need judgments.court; fail clearly if the migration has not run."""
+    if filters is None or not filters.courts:
+        return
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(judgments)")}
+    if "court" not in columns:
+        raise HTTPException(
+            status_code=400,
+            detail="Court filter unavailable: run backend/scripts/add_court_column.py"
+        )
 
-    if not OPENAI_API_KEY:
-        return None
 
-    try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        response = client.embeddings.create(
-            input=query,
-            model="text-embedding-3-small"
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        logging.getLogger(__name__).error("Embedding generation failed: %s", e)
+def eligible_ids(conn: sqlite3.Connection, filters: Optional[SearchFilters]) -> Optional["np.ndarray"]:
+    """
+    Sorted ids of judgments passing the filters, or None when nothing
+    filters. Vector search turns this into a bitmask over its id array so
+    only eligible rows are scored.
+    """
+    where, params = filter_predicates(filters)
+    if not where:
         return None
+    cur = conn.execute(f"SELECT id FROM judgments WHERE 1=1{where}", params)
+    return np.sort(np.fromiter((row[0] for row in cur), dtype=np.int64))
+
 
+# Trigram FTS5 tables (scripts/build_trigram_index.py) covering each column
+TRIGRAM_TABLES = {
+    "title": "judgments_trigram",
+    "citation": "judgments_trigram",
+    "summary": "judgments_text_trigram",
+    "full_text": "judgments_text_trigram",
+}
+# SQLite steps a LIKE scan gets before the trigram index takes over (~2k judgments)
+LIKE_SCAN_STEPS = 25_000
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
+
+def substring_match(conn: sqlite3.Connection, needle: str, columns: List[str]) -> Optional[Tuple[str, List[Any]]]:
     """
-    Calculate cosine similarity between two vectors.
-    Returns value between -1 and 1 (1 = identical, 0 = orthogonal, -1 = opposite).
+    SELECT (and params) yielding the ids of judgments containing `needle`
+    in any of `columns`, answered from the trigram indexes. An id can repeat
+    once per trigram table. None if a trigram table is missing or the needle
+    is shorter than a trigram.
     """
-    if not NUMPY_AVAILABLE:
-        # Fallback without numpy (slower)
-        dot_product = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot_product / (norm_a * norm_b)
-
-    a = np.array(a)
-    b = np.array(b)
+    if len(needle) < 3:
+        return None
+    tables = {TRIGRAM_TABLES[c] for c in columns}
+    placeholders = ",".join("?" * len(tables))
+    present = {
+        row[0] for row in conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})",
+            tuple(tables),
+        )
+    }
+    if present != tables:
+        return None
 
-    norm_a = np.linalg.norm(a)
-    norm_b = np.linalg.norm(b)
+    phrase = '"' + needle.replace('"', '""') + '"'
+    selects, params = [], []
+    for table in sorted(tables):
+        cols = " ".join(c for c in columns if TRIGRAM_TABLES[c] == table)
+        selects.append(f"SELECT rowid FROM {table} WHERE {table} MATCH ?")
+        params.append(f"{{{cols}}} : {phrase}")
+    return " UNION ALL ".join(selects), params
+
+
+def substring_search(
+    cur: sqlite3.Cursor,
+    needle: str,
+    columns: List[str],
+    limit: int,
+    filters: Optional[SearchFilters] = None,
+) -> List[sqlite3.Row]:
+    """
+    Judgments containing `needle` in any of `columns`, first `limit` rows.
+    A common needle fills the LIMIT after a few rows of a LIKE scan; a rare
+    one makes LIKE read the whole table. So the LIKE scan gets
+    LIKE_SCAN_STEPS SQLite steps and, if it runs out, the trigram index
+    answers instead. Without the trigram tables LIKE runs to completion.
+    """
+    like_where, filter_params = filter_predicates(filters)
+    like = " OR ".join(f"{c} LIKE ?" for c in columns)
+    like_sql = f"SELECT {SUMMARY_COLUMNS} FROM judgments WHERE ({like}){like_where} LIMIT ?"
+    like_params = (*[f"%{needle}%"] * len(columns), *filter_params, limit)
 
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
+    trigram = substring_match(cur.connection, needle, columns)
+    if trigram is None:
+        return cur.execute(like_sql, like_params).fetchall()
 
-    return float(np.dot(a, b) / (norm_a * norm_b))
+    conn = cur.connection
+    conn.set_progress_handler(lambda: 1, LIKE_SCAN_STEPS)
+    try:
+        return cur.execute(like_sql, like_params).fetchall()
+    except sqlite3.OperationalError as e:
+        if "interrupted" not in str(e):
+            raise
+    finally:
+        conn.set_progress_handler(None, 0)
+
+    match_sql, match_params = trigram
+    j_where, _ = filter_predicates(filters, alias="j")
+    return cur.execute(f"""
+                       SELECT DISTINCT {SUMMARY_COLUMNS_J}
+                       FROM ({match_sql}) AS m, judgments AS j
+                       WHERE j.id = m.rowid{j_where} LIMIT ?
+                       """, (*match_params, *filter_params, limit)).fetchall()
+
+
+def run_keyword_query(
+    cur: sqlite3.Cursor,
+    query: str,
+    limit: int,
+    filters: Optional[SearchFilters] = None,
+) -> List[Tuple[sqlite3.Row, Optional[float]]]:
+    """
+    Keyword matches as (row, bm25 score) pairs, best first (boosted by
+    authority once the citation graph is built).
+    Multiple words use AND logic; phrases, prefixes, OR, NEAR and exclusion
+    are compiled by utils.fts_query. Filters are applied inside the SQL. If
+    judgments_fts is unavailable, falls back to a substring search (LIKE,
+    or the trigram index) whose rows carry no score.
+    """
+    # "bail 489-F" -> '"bail" AND "489 f"': always valid FTS5 syntax
+    fts_query = compile_fts_query(query)
+    if not fts_query:
+        return []
+    fts_where, filter_params = filter_predicates(filters, alias="j")
+    # Over-fetch so cited authorities can move up (services/citation_graph.py)
+    boosted = AUTHORITY_WEIGHT > 0 and get_authority(cur.connection) is not None
+    fetch = limit * 2 if boosted else limit
+
+    # Try FTS5 search first
+    try:
+        cur.execute(f"""
+                    SELECT j.id,
+                           j.title,
+                           j.citation,
+                           j.summary,
+                           j.pdf_url,
+                           j.judgment_date,
+                           j.created_at,
+                           bm25(judgments_fts) as rank
+                    FROM judgments_fts
+                             JOIN judgments j ON judgments_fts.rowid = j.id
+                    WHERE judgments_fts MATCH ?{fts_where}
+                    ORDER BY rank LIMIT ?
+                    """, (fts_query, *filter_params, fetch))
+
+        rows = {row['id']: row for row in cur.fetchall()}
+        scored = [(judgment_id, abs(row['rank'])) for judgment_id, row in rows.items()]
+        if boosted:
+            scored = boost_by_authority(cur.connection, scored, limit)
+        return [(rows[judgment_id], score) for judgment_id, score in scored]
+
+    except sqlite3.OperationalError as e:
+        # FTS5 not available - fallback to substring search
+        logger.warning("FTS5 search failed, using substring fallback: %s", e)
+
+        rows = substring_search(cur, query.strip(), ["title", "full_text", "citation", "summary"], limit, filters)
+        return [(row, None) for row in rows]
+
+
+def rank_semantic(
+    conn: sqlite3.Connection,
+    query_embedding: "np.ndarray",
+    limit: int,
+    nprobe: Optional[int] = None,
+    exact: bool = False,
+    filters: Optional[SearchFilters] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Top (judgment_id, cosine score) pairs for a query embedding.
+    Uses the IVF index when one has been built, otherwise ranks against
+    the in-memory embedding matrix (loaded once per process). With filters,
+    only eligible judgments are scored. Once the citation graph is built,
+    scores are boosted by authority.
+    """
+    allowed = eligible_ids(conn, filters)
+    if allowed is not None and allowed.shape[0] == 0:
+        return []
+    boosted = AUTHORITY_WEIGHT > 0 and get_authority(conn) is not None
+    fetch = limit * 2 if boosted else limit
+    ann_index = None if exact else get_ann_index(conn)
+    if ann_index is not None:
+        scored = ann_index.search(query_embedding, fetch, nprobe, allowed)
+    else:
+        scored = get_embedding_matrix(conn).search(query_embedding, fetch, allowed)
+    return boost_by_authority(conn, scored, limit) if boosted else scored
+
+
+def fetch_summary_rows(cur: sqlite3.Cursor, ids: List[int]) -> Dict[int, sqlite3.Row]:
+    """Summary columns for the given judgment ids, keyed by id."""
+    if not ids:
+        return {}
+    cur.execute(f"""
+                SELECT {SUMMARY_COLUMNS}
+                FROM judgments
+                WHERE id IN ({",".join("?" * len(ids))})
+                """, ids)
+    return {row['id']: row for row in cur.fetchall()}
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, List[int]],
+    weights: Dict[str, float],
+    k: int = 60,
+) -> List[Tuple[int, float]]:
+    """
+    Fuse ranked id lists: score(d) = sum over sources of weight / (k + rank),
+    with 1-based ranks. Only ranks are used, so BM25 and cosine scores
+    never need to be put on a common scale.
+    """
+    fused: Dict[int, float] = {}
+    for source, ids in rankings.items():
+        weight = weights.get(source, 1.0)
+        if weight <= 0:
+            continue
+        for rank, judgment_id in enumerate(ids, start=1):
+            fused[judgment_id] = fused.get(judgment_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
 
 
 # =============================================================================
@@ -256,37 +562,40 @@ async def get_stats():
     - last_updated: Timestamp of most recent judgment
     - database_path: Path to the database file
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
+    def query():
+        conn = get_db_connection()
+        cur = conn.cursor()
 
-    try:
-        # Total judgments
-        cur.execute("SELECT COUNT(*) as count FROM judgments")
-        total = cur.fetchone()['count']
-
-        # With embeddings
-        cur.execute("SELECT COUNT(*) as count FROM judgments WHERE embedding IS NOT NULL")
-        with_embeddings = cur.fetchone()['count']
-
-        # With full text
-        cur.execute("SELECT COUNT(*) as count FROM judgments WHERE full_text IS NOT NULL AND full_text != ''")
-        with_full_text = cur.fetchone()['count']
-
-        # Last updated
-        cur.execute("SELECT MAX(created_at) as last FROM judgments")
-        result = cur.fetchone()
-        last_updated = result['last'] if result else None
-
-        return StatsResponse(
-            total_judgments=total,
-            with_embeddings=with_embeddings,
-            with_full_text=with_full_text,
-            last_updated=last_updated,
-            database_path=DB_PATH
-        )
+        try:
+            # Total judgments
+            cur.execute("SELECT COUNT(*) as count FROM judgments")
+            total = cur.fetchone()['count']
+
+            # With embeddings
+            cur.execute("SELECT COUNT(*) as count FROM judgments WHERE embedding IS NOT NULL")
+            with_embeddings = cur.fetchone()['count']
+
+            # With full text
+            cur.execute("SELECT COUNT(*) as count FROM judgments WHERE full_text IS NOT NULL AND full_text != ''")
+            with_full_text = cur.fetchone()['count']
+
+            # Last updated
+            cur.execute("SELECT MAX(created_at) as last FROM judgments")
+            result = cur.fetchone()
+            last_updated = result['last'] if result else None
+
+            return StatsResponse(
+                total_judgments=total,
+                with_embeddings=with_embeddings,
+                with_full_text=with_full_text,
+                last_updated=last_updated,
+                database_path=DB_PATH
+            )
 
-    finally:
-        conn.close()
+        finally:
+            conn.close()
+
+    return await run_db(query)
 
 
 @router.get("/recent", response_model=SearchResponse)
@@ -302,29 +611,32 @@ async def recent_judgments(
     Returns:
     - List of recent judgments ordered by created_at descending
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
+    def query():
+        conn = get_db_connection()
+        cur = conn.cursor()
 
-    try:
-        cur.execute("""
-                    SELECT id, title, citation, summary, pdf_url, judgment_date, created_at
-                    FROM judgments
-                    ORDER BY created_at DESC LIMIT ?
-                    """, (limit,))
-
-        rows = cur.fetchall()
-        results = [row_to_judgment_summary(row) for row in rows]
-
-        return SearchResponse(
-            success=True,
-            query="recent",
-            total_results=len(results),
-            results=results,
-            search_type="recent"
-        )
+        try:
+            cur.execute("""
+                        SELECT id, title, citation, summary, pdf_url, judgment_date, created_at
+                        FROM judgments
+                        ORDER BY created_at DESC LIMIT ?
+                        """, (limit,))
 
-    finally:
-        conn.close()
+            rows = cur.fetchall()
+            results = [row_to_judgment_summary(row) for row in rows]
+
+            return SearchResponse(
+                success=True,
+                query="recent",
+                total_results=len(results),
+                results=results,
+                search_type="recent"
+            )
+
+        finally:
+            conn.close()
+
+    return await run_db(query)
 
 
 @router.post("/keyword", response_model=SearchResponse)
@@ -334,10 +646,14 @@ async def keyword_search(request: KeywordSearchRequest):
 
     Searches across title, citation, full_text, and summary fields.
     Uses AND logic for multiple words (e.g., "bail murder" finds documents with BOTH words).
+    Also supports "exact phrase", bail* (prefix), OR, -word / NOT word
+    (exclude) and NEAR(bail cancellation, 5). Punctuation is safe: "489-F"
+    searches the tokens 489 and F side by side.
 
     Request body:
     - query: Search keywords (required)
     - limit: Maximum results (default 20)
+    - filters: date_from / date_to / courts / has_citation (optional, applied in the SQL)
 
     Example:
     ```json
@@ -347,82 +663,57 @@ async def keyword_search(request: KeywordSearchRequest):
     }
     ```
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    try:
-        # Build FTS5 query - convert "bail murder" to "bail AND murder"
-        search_terms = request.query.strip().split()
-        fts_query = ' AND '.join(search_terms)
+    def query():
+        conn = get_db_connection()
+        cur = conn.cursor()
 
-        # Try FTS5 search first
         try:
-            cur.execute("""
-                        SELECT j.id,
-                               j.title,
-                               j.citation,
-                               j.summary,
-                               j.pdf_url,
-                               j.judgment_date,
-                               j.created_at,
-                               bm25(judgments_fts) as rank
-                        FROM judgments_fts
-                                 JOIN judgments j ON judgments_fts.rowid = j.id
-                        WHERE judgments_fts MATCH ?
-                        ORDER BY rank LIMIT ?
-                        """, (fts_query, request.limit))
-
-            rows = cur.fetchall()
-            results = [row_to_judgment_summary(row, score=abs(row['rank'])) for row in rows]
-
-        except sqlite3.OperationalError as e:
-            # FTS5 not available or query syntax error - fallback to LIKE search
-            logger.warning("FTS5 search failed, using LIKE fallback: %s", e)
+            check_filters_supported(conn, request.filters)
+            results = [
+                row_to_judgment_summary(row, score=score)
+                for row, score in run_keyword_query(cur, request.query, request.limit, request.filters)
+            ]
 
-            like_pattern = f'%{request.query}%'
-            cur.execute("""
-                        SELECT id, title, citation, summary, pdf_url, judgment_date, created_at
-                        FROM judgments
-                        WHERE title LIKE ?
-                           OR full_text LIKE ?
-                           OR citation LIKE ?
-                           OR summary LIKE ? LIMIT ?
-                        """, (like_pattern, like_pattern, like_pattern, like_pattern, request.limit))
+            return SearchResponse(
+                success=True,
+                query=request.query,
+                total_results=len(results),
+                results=results,
+                search_type="keyword"
+            )
 
-            rows = cur.fetchall()
-            results = [row_to_judgment_summary(row) for row in rows]
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception("Keyword search failed: %s", e)
+            raise HTTPException(status_code=500, detail="Search failed. Please try again.")
 
-        return SearchResponse(
-            success=True,
-            query=request.query,
-            total_results=len(results),
-            results=results,
-            search_type="keyword"
-        )
+        finally:
+            conn.close()
 
-    except Exception as e:
-        logger.exception("Keyword search failed: %s", e)
-        raise HTTPException(status_code=500, detail="Search failed. Please try again.")
-
-    finally:
-        conn.close()
+    return await run_db(query)
 
 
 @router.post("/semantic", response_model=SearchResponse)
 async def semantic_search(request: SemanticSearchRequest):
     """
-    AI-powered semantic search using OpenAI embeddings.
+    AI-powered semantic search using embeddings.
 
     Finds conceptually similar judgments even without exact keyword matches.
-    Uses cosine similarity to compare query embedding with stored document embeddings.
+    Ranks every stored embedding against the query with one matrix-vector
+    product over a pre-normalised in-memory matrix (cosine similarity).
 
-    Requirements:
-    - OPENAI_API_KEY environment variable must be set
-    - Judgments must have embeddings generated (run scraper with OpenAI key)
+    Requirements (EMBEDDING_BACKEND selects the encoder):
+    - openai (default): OPENAI_API_KEY must be set and judgments must have
+      embeddings generated (run scraper with OpenAI key)
+    - local: run scripts/build_local_embeddings.py once; no network needed
 
     Request body:
     - query: Natural language question (required, min 3 chars)
     - limit: Maximum results (default 10)
+    - nprobe: ANN recall knob, lists scanned per query (optional)
+    - exact: Force an exact scan instead of the ANN index (default false)
+    - filters: date_from / date_to / courts / has_citation (optional, applied before scoring)
 
     Example:
     ```json
@@ -433,107 +724,196 @@ async def semantic_search(request: SemanticSearchRequest):
     ```
     """
     # Check prerequisites
-    if not OPENAI_AVAILABLE:
-        raise HTTPException(
-            status_code=503,
-            detail="Semantic search requires OpenAI library. Install with: pip install openai"
-        )
-
-    if not OPENAI_API_KEY:
-        raise HTTPException(
-            status_code=503,
-            detail="Semantic search requires OpenAI API key. Set OPENAI_API_KEY in your .env file"
-        )
-
     if not NUMPY_AVAILABLE:
         raise HTTPException(
             status_code=503,
             detail="Semantic search requires numpy. Install with: pip install numpy"
         )
 
-    # Generate query embedding
-    query_embedding = generate_query_embedding(request.query)
-    if not query_embedding:
+    unavailable = get_backend().unavailable_reason()
+    if unavailable:
+        raise HTTPException(status_code=503, detail=unavailable)
+
+    # Generate query embedding (off the event loop so concurrent requests can share a batch)
+    query_embedding = await run_in_threadpool(generate_query_embedding, request.query)
+    if query_embedding is None:
         raise HTTPException(
             status_code=500,
-            detail="Failed to generate query embedding. Check your OpenAI API key."
+            detail=f"Failed to generate query embedding. Check the {EMBEDDING_BACKEND} embedding backend."
         )
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+    def rank():
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        try:
+            check_filters_supported(conn, request.filters)
+            top_results = rank_semantic(
+                conn, query_embedding, request.limit, request.nprobe, request.exact, request.filters
+            )
+
+            if not top_results:
+                return SearchResponse(
+                    success=True,
+                    query=request.query,
+                    total_results=0,
+                    results=[],
+                    search_type="semantic"
+                )
+
+            # Fetch only the winning rows
+            rows_by_id = fetch_summary_rows(cur, [judgment_id for judgment_id, _ in top_results])
+
+            # Convert to response format (keep similarity order)
+            results = [
+                row_to_judgment_summary(rows_by_id[judgment_id], score=round(score, 4))
+                for judgment_id, score in top_results
+                if judgment_id in rows_by_id
+            ]
 
-    try:
-        # Get all judgments with embeddings
-        cur.execute("""
-                    SELECT id,
-                           title,
-                           citation,
-                           summary,
-                           pdf_url,
-                           judgment_date,
-                           created_at,
-                           embedding
-                    FROM judgments
-                    WHERE embedding IS NOT NULL
-                    """)
-
-        rows = cur.fetchall()
-
-        if not rows:
             return SearchResponse(
                 success=True,
                 query=request.query,
-                total_results=0,
-                results=[],
+                total_results=len(results),
+                results=results,
                 search_type="semantic"
             )
 
-        # Calculate similarity scores for each judgment
-        scored_results = []
-        for row in rows:
-            try:
-                # Unpickle the stored embedding
-                doc_embedding = pickle.loads(row['embedding'])
-
-                # Calculate cosine similarity
-                score = cosine_similarity(query_embedding, doc_embedding)
-                scored_results.append((row, score))
-            except Exception as e:
-                # Skip documents with corrupted embeddings
-                logging.getLogger(__name__).warning("Error processing embedding for judgment %s: %s", row['id'], e)
-                continue
-
-        # Sort by similarity score (highest first)
-        scored_results.sort(key=lambda x: x[1], reverse=True)
-
-        # Take top N results
-        top_results = scored_results[:request.limit]
-
-        # Convert to response format
-        results = [
-            JudgmentSummary(
-                id=row['id'],
-                title=row['title'],
-                citation=row['citation'],
-                summary=row['summary'],
-                pdf_url=row['pdf_url'],
-                judgment_date=row['judgment_date'],
-                created_at=row['created_at'],
-                relevance_score=round(score, 4)
-            )
-            for row, score in top_results
-        ]
-
-        return SearchResponse(
-            success=True,
-            query=request.query,
-            total_results=len(results),
-            results=results,
-            search_type="semantic"
+        finally:
+            conn.close()
+
+    return await run_db(rank)
+
+
+@router.post("/hybrid", response_model=HybridSearchResponse)
+async def hybrid_search(request: HybridSearchRequest):
+    """
+    Keyword (FTS5 BM25) and semantic (embedding) search in one call.
+
+    Both rankings are computed concurrently, each on its own connection,
+    and merged with weighted reciprocal rank fusion:
+    score = keyword_weight / (rrf_k + keyword_rank) + semantic_weight / (rrf_k + semantic_rank)
+
+    If semantic search is unavailable (backend not configured, numpy missing,
+    or the embedding call fails) the keyword ranking is returned on its own and
+    "sources" says so.
+
+    Request body:
+    - query: Search query (required)
+    - limit: Maximum results (default 10)
+    - keyword_weight / semantic_weight: Per-source RRF weights (default 1.0, 0 disables a source)
+    - rrf_k: RRF constant (default 60)
+    - candidates: Depth taken from each source before fusion (default 50)
+    - nprobe / exact: As for /semantic
+    - filters: Applied to both sources, as for /keyword and /semantic
+
+    Example:
+    ```json
+    {
+        "query": "489-F cheque dishonour bail",
+        "limit": 10,
+        "keyword_weight": 1.0,
+        "semantic_weight": 1.0
+    }
+    ```
+    """
+    depth = max(request.limit, request.candidates)
+    use_semantic = (
+        request.semantic_weight > 0
+        and NUMPY_AVAILABLE and get_backend().unavailable_reason() is None
+    )
+
+    def keyword_ranking() -> List[Tuple[int, Optional[float]]]:
+        if request.keyword_weight <= 0:
+            return []
+        conn = get_db_connection()
+        try:
+            check_filters_supported(conn, request.filters)
+            hits = run_keyword_query(conn.cursor(), request.query, depth, request.filters)
+            return [(row['id'], score) for row, score in hits]
+        finally:
+            conn.close()
+
+    def semantic_ranking(query_embedding) -> List[Tuple[int, float]]:
+        conn = get_db_connection()
+        try:
+            check_filters_supported(conn, request.filters)
+            return rank_semantic(conn, query_embedding, depth, request.nprobe, request.exact, request.filters)
+        finally:
+            conn.close()
+
+    async def semantic_hits_or_none() -> Optional[List[Tuple[int, float]]]:
+        if not use_semantic:
+            return None
+        # The embedding call may go over the network: keep it off the DB threads
+        query_embedding = await run_in_threadpool(generate_query_embedding, request.query)
+        if query_embedding is None:
+            logger.warning("Hybrid search: no query embedding, using keyword ranking only")
+            return None
+        return await run_db(semantic_ranking, query_embedding)
+
+    try:
+        keyword_hits, semantic_hits = await asyncio.gather(
+            run_db(keyword_ranking),
+            semantic_hits_or_none(),
         )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Hybrid search failed: %s", e)
+        raise HTTPException(status_code=500, detail="Search failed. Please try again.")
 
-    finally:
-        conn.close()
+    sources = []
+    rankings: Dict[str, List[int]] = {}
+    if request.keyword_weight > 0:
+        sources.append("keyword")
+        rankings["keyword"] = [judgment_id for judgment_id, _ in keyword_hits]
+    if semantic_hits is not None:
+        sources.append("semantic")
+        rankings["semantic"] = [judgment_id for judgment_id, _ in semantic_hits]
+
+    fused = reciprocal_rank_fusion(
+        rankings,
+        {"keyword": request.keyword_weight, "semantic": request.semantic_weight},
+        request.rrf_k,
+    )[:request.limit]
+
+    keyword_by_id = {jid: (rank, score) for rank, (jid, score) in enumerate(keyword_hits, start=1)}
+    semantic_by_id = {jid: (rank, score) for rank, (jid, score) in enumerate(semantic_hits or [], start=1)}
+
+    def fetch_rows():
+        conn = get_db_connection()
+        try:
+            return fetch_summary_rows(conn.cursor(), [judgment_id for judgment_id, _ in fused])
+        finally:
+            conn.close()
+
+    rows_by_id = await run_db(fetch_rows)
+
+    results = []
+    for judgment_id, fused_score in fused:
+        row = rows_by_id.get(judgment_id)
+        if row is None:
+            continue
+        summary = row_to_judgment_summary(row, score=round(fused_score, 6))
+        keyword_rank, keyword_score = keyword_by_id.get(judgment_id, (None, None))
+        semantic_rank, semantic_score = semantic_by_id.get(judgment_id, (None, None))
+        results.append(HybridJudgment(
+            **summary.model_dump(),
+            keyword_rank=keyword_rank,
+            keyword_score=keyword_score,
+            semantic_rank=semantic_rank,
+            semantic_score=round(semantic_score, 4) if semantic_score is not None else None,
+        ))
+
+    return HybridSearchResponse(
+        success=True,
+        query=request.query,
+        total_results=len(results),
+        results=results,
+        search_type="hybrid",
+        sources=sources
+    )
 
 
 @router.get("/citation/{citation}", response_model=SearchResponse)
@@ -541,7 +921,10 @@ async def citation_lookup(citation: str):
     """
     Look up judgment by legal citation.
 
-    Searches for exact or partial citation matches.
+    Searches for exact or partial citation matches. A recognisable citation
+    in any spelling ("PLD 2024 SC 1276", "pld2024 sc 1276", "2019 P.Cr.L.J. 300",
+    "2024 SCMR") is an indexed lookup in judgment_citations
+    (scripts/build_citation_index.py); anything else is a substring search.
 
     Parameters:
     - citation: Legal citation to search for (e.g., "PLD 2024 SC 1276")
@@ -550,31 +933,41 @@ async def citation_lookup(citation: str):
     - /api/search/citation/PLD%202024%20SC%201276
     - /api/search/citation/2024%20SCMR
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
+    def query():
+        conn = get_db_connection()
+        cur = conn.cursor()
 
-    try:
-        # Search for exact or partial match
-        cur.execute("""
-                    SELECT id, title, citation, summary, pdf_url, judgment_date, created_at
-                    FROM judgments
-                    WHERE citation = ?
-                       OR citation LIKE ? LIMIT 20
-                    """, (citation, f'%{citation}%'))
-
-        rows = cur.fetchall()
-        results = [row_to_judgment_summary(row) for row in rows]
-
-        return SearchResponse(
-            success=True,
-            query=citation,
-            total_results=len(results),
-            results=results,
-            search_type="citation"
-        )
+        try:
+            rows = []
+            parsed = normalize_citation(citation)
+            if parsed:
+                where, params = citation_where(parsed, alias="c")
+                try:
+                    rows = cur.execute(f"""
+                                       SELECT DISTINCT {SUMMARY_COLUMNS_J}
+                                       FROM judgment_citations AS c
+                                                JOIN judgments AS j ON j.id = c.judgment_id
+                                       WHERE {where} LIMIT 20
+                                       """, params).fetchall()
+                except sqlite3.OperationalError:
+                    logger.warning("judgment_citations missing; run scripts/build_citation_index.py")
+            if not rows:
+                # Exact or partial match (an exact match is also a substring)
+                rows = substring_search(cur, citation, ["citation"], 20)
+            results = [row_to_judgment_summary(row) for row in rows]
 
-    finally:
-        conn.close()
+            return SearchResponse(
+                success=True,
+                query=citation,
+                total_results=len(results),
+                results=results,
+                search_type="citation"
+            )
+
+        finally:
+            conn.close()
+
+    return await run_db(query)
 
 
 @router.get("/judgment/{judgment_id}")
@@ -590,25 +983,110 @@ async def get_judgment(judgment_id: int):
     Returns:
     - Full judgment object with all fields including full_text
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
+    def query():
+        conn = get_db_connection()
+        cur = conn.cursor()
 
-    try:
-        cur.execute("SELECT * FROM judgments WHERE id = ?", (judgment_id,))
-        row = cur.fetchone()
+        try:
+            cur.execute("SELECT * FROM judgments WHERE id = ?", (judgment_id,))
+            row = cur.fetchone()
 
-        if not row:
-            raise HTTPException(status_code=404, detail=f"Judgment with ID {judgment_id} not found")
+            if not row:
+                raise HTTPException(status_code=404, detail=f"Judgment with ID {judgment_id} not found")
 
-        judgment = row_to_judgment_full(row)
+            judgment = row_to_judgment_full(row)
 
-        return {
-            "success": True,
-            "judgment": judgment.model_dump()
-        }
+            return {
+                "success": True,
+                "judgment": judgment.model_dump()
+            }
 
-    finally:
-        conn.close()
+        finally:
+            conn.close()
+
+    return await run_db(query)
+
+
+@router.get("/judgment/{judgment_id}/cited-by", response_model=CitationGraphResponse)
+async def judgment_cited_by(judgment_id: int, limit: int = Query(50, ge=1, le=500)):
+    """
+    Judgments whose text cites this judgment, most authoritative first.
+
+    Built offline by scripts/build_citation_graph.py; empty until then.
+
+    Parameters:
+    - judgment_id: Unique identifier of the judgment
+    - limit: Maximum results (default 50)
+    """
+    def query():
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        try:
+            cur.execute("SELECT 1 FROM judgments WHERE id = ?", (judgment_id,))
+            if not cur.fetchone():
+                raise HTTPException(status_code=404, detail=f"Judgment with ID {judgment_id} not found")
+
+            ids = citing_judgments(conn, judgment_id, limit)
+            rows_by_id = fetch_summary_rows(cur, ids)
+            results = [row_to_judgment_summary(rows_by_id[i]) for i in ids if i in rows_by_id]
+            cited_by, authority = authority_stats(conn, judgment_id)
+
+            return CitationGraphResponse(
+                success=True,
+                judgment_id=judgment_id,
+                cited_by_count=cited_by,
+                authority=authority,
+                total_results=len(results),
+                results=results,
+            )
+
+        finally:
+            conn.close()
+
+    return await run_db(query)
+
+
+@router.get("/judgment/{judgment_id}/cites", response_model=CitationGraphResponse)
+async def judgment_cites(judgment_id: int):
+    """
+    Judgments cited in this judgment's text.
+
+    Citations that do not match a judgment in the database are listed
+    under `unresolved`.
+
+    Parameters:
+    - judgment_id: Unique identifier of the judgment
+    """
+    def query():
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        try:
+            cur.execute("SELECT 1 FROM judgments WHERE id = ?", (judgment_id,))
+            if not cur.fetchone():
+                raise HTTPException(status_code=404, detail=f"Judgment with ID {judgment_id} not found")
+
+            cited = cited_judgments(conn, judgment_id)
+            ids = list(dict.fromkeys(i for _, i in cited if i is not None))
+            rows_by_id = fetch_summary_rows(cur, ids)
+            results = [row_to_judgment_summary(rows_by_id[i]) for i in ids if i in rows_by_id]
+            cited_by, authority = authority_stats(conn, judgment_id)
+
+            return CitationGraphResponse(
+                success=True,
+                judgment_id=judgment_id,
+                cited_by_count=cited_by,
+                authority=authority,
+                total_results=len(results),
+                results=results,
+                unresolved=[citation for citation, i in cited if i is None],
+            )
+
+        finally:
+            conn.close()
+
+    return await run_db(query)
 
 
 @router.get("/health")
@@ -620,35 +1098,47 @@ async def health_check():
     - status: "healthy" if database is accessible
     - database: Connection status
     - features: Available features (FTS5, semantic search)
+    - query_cache: Query-embedding cache hit/miss counters
+    - db_pool: SQLite connections opened vs reused
+    - db_executor: DB thread pool size and queries running / queued
     """
     health = {
         "status": "healthy",
         "database": "unknown",
         "features": {
             "fts5": False,
-            "semantic_search": OPENAI_AVAILABLE and bool(OPENAI_API_KEY),
-            "numpy": NUMPY_AVAILABLE
-        }
+            "semantic_search": NUMPY_AVAILABLE and get_backend().unavailable_reason() is None,
+            "embedding_backend": EMBEDDING_BACKEND,
+            "numpy": NUMPY_AVAILABLE,
+            "ann_index": os.path.exists(ANN_INDEX_PATH)
+        },
+        "query_cache": None,
+        "db_pool": pool_stats(),
+        "db_executor": executor_stats()
     }
 
-    try:
+    def check_database():
         conn = get_db_connection()
-        cur = conn.cursor()
-
-        # Check database connection
-        cur.execute("SELECT COUNT(*) FROM judgments")
-        count = cur.fetchone()[0]
-        health["database"] = f"connected ({count} judgments)"
-
-        # Check FTS5
         try:
-            cur.execute("SELECT * FROM judgments_fts LIMIT 1")
-            health["features"]["fts5"] = True
-        except sqlite3.OperationalError:
-            health["features"]["fts5"] = False
+            cur = conn.cursor()
 
-        conn.close()
+            # Check database connection
+            cur.execute("SELECT COUNT(*) FROM judgments")
+            count = cur.fetchone()[0]
+            health["database"] = f"connected ({count} judgments)"
 
+            # Check FTS5
+            try:
+                cur.execute("SELECT * FROM judgments_fts LIMIT 1")
+                health["features"]["fts5"] = True
+            except sqlite3.OperationalError:
+                health["features"]["fts5"] = False
+        finally:
+            conn.close()
+
+    try:
+        await run_db(check_database)
+        health["query_cache"] = await run_db(query_cache_stats)
     except Exception as e:
         health["status"] = "unhealthy"
         health["database"] = f"error: {str(e)}"
@@ -2,11 +2,13 @@
 
 import os
 import re
-import sqlite3
-from typing import Dict, List, Optional
+from typing import Dict, List
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, Query
+from pydantic import BaseModel, Field
+
+from utils.legal_refs import scan_refs
+from utils.statute_index import LAW_CODES, canonical_law_code, get_statute_index
 
 router = APIRouter(prefix="/api/law", tags=["law"])
 
@@ -17,21 +19,10 @@ router = APIRouter(prefix="/api/law", tags=["law"])
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # backend/
 DB_PATH = os.path.join(BASE_DIR, "data", "legal_db.sqlite")
 
-CPC_LAW_NAMES = [
-    "Code of Civil Procedure 1908",
-]
-CRPC_LAW_NAMES = [
-    "Code of Criminal Procedure 1898",
-]
-PPC_LAW_NAMES = [
-    "Pakistan Penal Code 1860",
-]
-CONST_LAW_NAMES = [
-    "Constitution of Pakistan 1973",
-]
-QSO_LAW_NAMES = [
-    "Qanun-e-Shahadat Order 1984",
-]
+# Canonical law names per code live in utils/statute_index.LAW_CODES
+CPC_LAW_NAMES = list(LAW_CODES["CPC"][0])
+# Codes parse_simple_refs resolves as sections / articles
+SIMPLE_CODES = ("CRPC", "PPC", "CPC", "CONST")
 
 
 # -----------------------------
@@ -41,10 +32,8 @@ class ResolveRequest(BaseModel):
     text: str
 
 
-def _connect(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+class BatchResolveRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=1000)
 
 
 # -----------------------------
@@ -69,25 +58,6 @@ def normalize_section_number(raw: str) -> str:
     return s
 
 
-def roman_to_int(roman: str) -> Optional[int]:
-    roman = roman.upper().strip()
-    if not roman:
-        return None
-    roman_map = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
-    total = 0
-    prev = 0
-    for ch in reversed(roman):
-        if ch not in roman_map:
-            return None
-        val = roman_map[ch]
-        if val < prev:
-            total -= val
-        else:
-            total += val
-            prev = val
-    return total
-
-
 def parse_cpc_order_rule(text: str) -> List[Dict[str, str]]:
     """
     Extracts CPC Order/Rule patterns like:
@@ -96,34 +66,8 @@ def parse_cpc_order_rule(text: str) -> List[Dict[str, str]]:
     - O.21 R.26 CPC
     Returns list of {order_no, rule_no}
     """
-    t = text
-
-    out: List[Dict[str, str]] = []
-
-    patterns = [
-        r"order\s+([ivxlcdm]+|\d+)\s+rule\s+(\d+)\s+cpc",
-        r"o\.\s*([ivxlcdm]+|\d+)\s*r\.\s*(\d+)\s*cpc",
-        r"order\s+([ivxlcdm]+|\d+)\s*r(?:ule)?\s*(\d+)\s*cpc",
-    ]
-
-    for p in patterns:
-        for m in re.finditer(p, t, flags=re.IGNORECASE):
-            o_raw = m.group(1)
-            r_raw = m.group(2)
-
-            if re.fullmatch(r"\d+", o_raw):
-                order_no = int(o_raw)
-            else:
-                order_no = roman_to_int(o_raw) or 0
-
-            rule_no = int(r_raw)
-
-            if order_no > 0 and rule_no > 0:
-                out.append({"order_no": str(order_no), "rule_no": str(rule_no)})
-
-    # Deduplicate pairs
-    uniq = {(x["order_no"], x["rule_no"]) for x in out}
-    return [{"order_no": o, "rule_no": r} for (o, r) in sorted(uniq)]
+    uniq = {(ref.order_no, ref.rule_no) for ref in scan_refs(text) if ref.kind == "order_rule"}
+    return [{"order_no": str(o), "rule_no": str(r)} for (o, r) in sorted(uniq)]
 
 
 def parse_simple_refs(text: str) -> List[Dict[str, str]]:
@@ -135,66 +79,84 @@ def parse_simple_refs(text: str) -> List[Dict[str, str]]:
     - section 489-F PPC
     Returns list of {code, number}
     """
-    t = text
+    seen = set()
+    uniq: List[Dict[str, str]] = []
+    for ref in scan_refs(text):
+        if ref.law not in SIMPLE_CODES or ref.kind == "order_rule":
+            continue
+        key = (ref.law, normalize_section_number(ref.number))
+        if key not in seen:
+            seen.add(key)
+            uniq.append({"code": key[0], "number": key[1]})
+    return uniq
 
-    refs: List[Dict[str, str]] = []
 
-    # CrPC
-    for m in re.finditer(r"(?:u/s|under\s+section|section)\s+([0-9]+(?:\([0-9]+\))?(?:-[A-Za-z])?[A-Za-z]?)\s*(crpc)", t, flags=re.IGNORECASE):
-        refs.append({"code": "CRPC", "number": normalize_section_number(m.group(1))})
+# -----------------------------
+# Resolution
+# -----------------------------
+def _resolve_order_rule(index, order_no: str, rule_no: str) -> Dict[str, str]:
+    row = index.order_rule(int(order_no), int(rule_no))
+    return {
+        "key": f"CPC O{order_no} R{rule_no}",
+        "law_name": row.law_name if row else CPC_LAW_NAMES[0],
+        "kind": "order_rule",
+        "section_number": row.section_number if row else "",
+        "title": row.section_title if row else "",
+        "source_file": row.source_file if row else "",
+        "text": row.section_text if row else "",
+    }
+
+
+def _resolve_section(index, code: str, number: str) -> Dict[str, str]:
+    row = index.section(code, number)
+    return {
+        "key": f"{code} {number}",
+        "law_name": row.law_name if row else "",
+        "kind": "section",
+        "section_number": row.section_number if row else number,
+        "title": row.section_title if row else "",
+        "source_file": row.source_file if row else "",
+        "text": row.section_text if row else "",
+    }
+
+
+def _parse_refs(text: str) -> List[tuple]:
+    """
+    ('order_rule', order_no, rule_no) and ('section', code, number) refs
+    in one scan: what parse_cpc_order_rule then parse_simple_refs return.
+    """
+    order_rules, sections = set(), []
+    for ref in scan_refs(text):
+        if ref.kind == "order_rule":
+            order_rules.add((ref.order_no, ref.rule_no))
+        elif ref.law in SIMPLE_CODES:
+            section = ("section", ref.law, normalize_section_number(ref.number))
+            if section not in sections:
+                sections.append(section)
+    return [("order_rule", str(o), str(r)) for o, r in sorted(order_rules)] + sections
 
-    # PPC
-    for m in re.finditer(r"(?:u/s|under\s+section|section)\s+([0-9]+(?:\([0-9]+\))?(?:-[A-Za-z])?[A-Za-z]?)\s*(ppc)", t, flags=re.IGNORECASE):
-        refs.append({"code": "PPC", "number": normalize_section_number(m.group(1))})
 
-    # CPC (section-based, not order/rule)
-    for m in re.finditer(r"(?:u/s|under\s+section|section)\s+([0-9]+(?:\([0-9]+\))?)\s*(cpc)", t, flags=re.IGNORECASE):
-        refs.append({"code": "CPC", "number": normalize_section_number(m.group(1))})
+def _split_suggest_query(q: str) -> tuple:
+    """'48' -> (None, ['48']); 'PPC 489-' / '489 ppc' -> ('PPC', [...]); 'Section 48' drops the word."""
+    law, words = None, []
+    for token in q.split():
+        code = canonical_law_code(token)
+        if code:
+            law = code
+        elif token.lower().rstrip(".") not in ("section", "sec", "s", "u/s", "art", "article"):
+            words.append(token)
+    return law, words
 
-    # Constitution (Article)
-    for m in re.finditer(r"(?:article|art\.?)\s+([0-9]+[A-Za-z]?)\s*(?:of\s+the\s+)?(constitution)", t, flags=re.IGNORECASE):
-        refs.append({"code": "CONST", "number": normalize_section_number(m.group(1))})
 
-    # Deduplicate
-    seen = set()
-    uniq: List[Dict[str, str]] = []
-    for r in refs:
-        key = (r["code"], r["number"])
-        if key not in seen:
-            seen.add(key)
-            uniq.append(r)
-    return uniq
+def _resolve(index, ref: tuple) -> Dict[str, str]:
+    kind, a, b = ref
+    return _resolve_order_rule(index, a, b) if kind == "order_rule" else _resolve_section(index, a, b)
 
 
-def _fetch_exact_section(conn: sqlite3.Connection, law_names: List[str], section_number: str) -> Optional[sqlite3.Row]:
-    q = """
-    SELECT law_name, section_number, section_title, section_text, source_file
-    FROM law_sections
-    WHERE law_name IN ({})
-      AND section_number = ?
-    LIMIT 1
-    """.format(",".join(["?"] * len(law_names)))
-    args = list(law_names) + [section_number]
-    cur = conn.execute(q, args)
-    row = cur.fetchone()
-    return row
+def _has_text(result: Dict[str, str]) -> bool:
+    return bool((result.get("text") or "").strip())
 
 
-def _fetch_cpc_order_rule(conn: sqlite3.Connection, order_no: str, rule_no: str) -> Optional[sqlite3.Row]:
-    """
-    Fetch CPC Order/Rule using new structured columns.
-    """
-    q = """
-    SELECT law_name, section_number, section_title, section_text, source_file,
-           order_number, rule_number
-    FROM law_sections
-    WHERE law_name = ?
-      AND order_number = ?
-      AND rule_number = ?
-    LIMIT 1;
-    """
-    cur = conn.execute(q, (CPC_LAW_NAMES[0], int(order_no), int(rule_no)))
-    return cur.fetchone()
 # -----------------------------
 # API
 # -----------------------------
@@ -203,69 +165,73 @@ def resolve_law_refs(req: ResolveRequest):
     if not os.path.exists(DB_PATH):
         return {"db": DB_PATH, "hits": 0, "results": [], "error": "DB not found"}
 
-    results: List[Dict[str, str]] = []
-
-    with _connect(DB_PATH) as conn:
-        # 1) CPC Order/Rule (special)
-        order_rules = parse_cpc_order_rule(req.text)
-        for orx in order_rules:
-            row = _fetch_cpc_order_rule(conn, orx["order_no"], orx["rule_no"])
-            if row:
-                results.append({
-                    "key": f"CPC O{orx['order_no']} R{orx['rule_no']}",
-                    "law_name": row["law_name"],
-                    "kind": "order_rule",
-                    "section_number": row["section_number"],
-                    "title": row["section_title"] or "",
-                    "source_file": row["source_file"] or "",
-                    "text": row["section_text"] or "",
-                })
-            else:
-                results.append({
-                    "key": f"CPC O{orx['order_no']} R{orx['rule_no']}",
-                    "law_name": CPC_LAW_NAMES[0],
-                    "kind": "order_rule",
-                    "section_number": "",
-                    "title": "",
-                    "source_file": "",
-                    "text": "",
-                })
-
-        # 2) Normal section/article references
-        refs = parse_simple_refs(req.text)
-        for r in refs:
-            if r["code"] == "CRPC":
-                row = _fetch_exact_section(conn, CRPC_LAW_NAMES, r["number"])
-            elif r["code"] == "PPC":
-                row = _fetch_exact_section(conn, PPC_LAW_NAMES, r["number"])
-            elif r["code"] == "CPC":
-                row = _fetch_exact_section(conn, CPC_LAW_NAMES, r["number"])
-            elif r["code"] == "CONST":
-                row = _fetch_exact_section(conn, CONST_LAW_NAMES, r["number"])
-            else:
-                row = None
-
-            if row:
-                results.append({
-                    "key": f"{r['code']} {r['number']}",
-                    "law_name": row["law_name"],
-                    "kind": "section",
-                    "section_number": row["section_number"],
-                    "title": row["section_title"] or "",
-                    "source_file": row["source_file"] or "",
-                    "text": row["section_text"] or "",
-                })
-            else:
-                results.append({
-                    "key": f"{r['code']} {r['number']}",
-                    "law_name": "",
-                    "kind": "section",
-                    "section_number": r["number"],
-                    "title": "",
-                    "source_file": "",
-                    "text": "",
-                })
+    index = get_statute_index(DB_PATH)
+    results = [_resolve(index, ref) for ref in _parse_refs(req.text)]
 
     # hits: count of resolved items that have text
-    hits = sum(1 for x in results if (x.get("text") or "").strip())
+    hits = sum(1 for x in results if _has_text(x))
     return {"db": DB_PATH, "hits": hits, "results": results}
+
+
+@router.post("/resolve/batch")
+def resolve_law_refs_batch(req: BatchResolveRequest):
+    """
+    Resolve the references in many texts at once (e.g. a batch of
+    judgments). Each distinct reference is resolved once; `results[i]`
+    lists the keys found in texts[i] and `laws` holds each key's block.
+    """
+    if not os.path.exists(DB_PATH):
+        return {"db": DB_PATH, "hits": 0, "results": [], "laws": {}, "error": "DB not found"}
+
+    index = get_statute_index(DB_PATH)
+    laws: Dict[str, Dict[str, str]] = {}
+    keys_by_ref: Dict[tuple, str] = {}
+    results = []
+    for text in req.texts:
+        keys = []
+        for ref in _parse_refs(text):
+            key = keys_by_ref.get(ref)
+            if key is None:
+                result = _resolve(index, ref)
+                key = keys_by_ref[ref] = result["key"]
+                laws[key] = result
+            keys.append(key)
+        results.append({"keys": keys})
+
+    hits = sum(1 for x in laws.values() if _has_text(x))
+    return {"db": DB_PATH, "refs": len(laws), "hits": hits, "results": results, "laws": laws}
+
+
+@router.get("/suggest")
+def suggest_sections(
+    q: str = Query(..., min_length=1, max_length=40),
+    law: str = Query(None, description="Law code or alias (PPC, CrPC, Constitution); may also be given in q"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Section-number autocomplete: q="48" -> PPC 48, 480 ... 489, 489-A ... 489-F.
+    A bisect over the statute index's sorted section keys, so cheap
+    enough to call on every keystroke. Text without a digit is matched
+    against section titles instead ("cognizable information").
+    """
+    q_law, words = _split_suggest_query(q)
+    law = law or q_law
+    index = get_statute_index(DB_PATH)
+    if any(ch.isdigit() for word in words for ch in word):
+        rows = index.suggest("".join(words), law=law, limit=limit)
+    else:
+        rows = index.search_titles(" ".join(words), law=law, limit=limit)
+    return {
+        "query": q,
+        "law": canonical_law_code(law) if law else None,
+        "results": [
+            {
+                "law_code": row.law_code,
+                "law_name": row.law_name,
+                "section_number": row.section_number,
+                "key": row.key,
+                "title": row.section_title or f"Section {row.section_number}",
+            }
+            for row in rows
+        ],
+    }
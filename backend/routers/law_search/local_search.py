@@ -3,31 +3,24 @@ LAYER 1: Local Database Search
 Searches legal_db.sqlite for law sections and judgments
 """
 
-import sqlite3
 import re
 import os
+import sqlite3
 from typing import List, Dict, Optional
 
+from utils.db_pool import LEGAL_DB_PATH, acquire
+from utils.statute_index import get_statute_index
+
 # Database path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-DB_PATH = os.path.join(BASE_DIR, "data", "legal_db.sqlite")
+DB_PATH = LEGAL_DB_PATH
 
 
 def get_connection():
-    """Get database connection."""
+    """Get a pooled read-only database connection (close() returns it to the pool)."""
     if not os.path.exists(DB_PATH):
         return None
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-def normalize_section(section: str) -> str:
-    """Normalize section number: 007 → 7, 489-F → 489F"""
-    s = section.strip()
-    s = re.sub(r"^0+", "", s)  # Remove leading zeros
-    s = re.sub(r"(\d+)-([A-Za-z])$", r"\1\2", s)  # 489-F → 489F
-    return s
+    return acquire(DB_PATH)
 
 
 def search_by_section(law_code: str, section_number: str) -> Optional[Dict]:
@@ -39,67 +32,47 @@ def search_by_section(law_code: str, section_number: str) -> Optional[Dict]:
         search_by_section("CrPC", "497")
         search_by_section("Constitution", "199")
     """
-    conn = get_connection()
-    if not conn:
+    if not os.path.exists(DB_PATH):
         return None
 
-    # Map short codes to full names
-    law_map = {
-        "PPC": "Pakistan Penal Code",
-        "CRPC": "Criminal Procedure",
-        "CPC": "Civil Procedure",
-        "CONSTITUTION": "Constitution",
-        "QSO": "Qanun-e-Shahadat",
-        "MFLO": "Muslim Family Laws",
-    }
-
-    law_name_pattern = law_map.get(law_code.upper(), law_code)
-    section_norm = normalize_section(section_number)
-
-    try:
-        cursor = conn.cursor()
-
-        # Try exact match first
-        cursor.execute("""
-                       SELECT law_name, section_number, section_title, section_text
-                       FROM law_sections
-                       WHERE law_name LIKE ?
-                         AND (section_number = ? OR section_number = ? OR section_number LIKE ?) LIMIT 1
-                       """, (
-                           f"%{law_name_pattern}%",
-                           section_norm,
-                           section_number,
-                           f"%{section_norm}%"
-                       ))
-
-        row = cursor.fetchone()
-        if row:
-            return {
-                "found": True,
-                "source": "local_db",
-                "law_name": row["law_name"],
-                "section_number": row["section_number"],
-                "section_title": row["section_title"],
-                "section_text": row["section_text"],
-            }
+    # Codes (PPC, CrPC, Constitution, ...) hit the (law, section) index;
+    # anything else is matched as part of the law name.
+    row = get_statute_index(DB_PATH).section(law_code, section_number)
+    if row:
+        return {
+            "found": True,
+            "source": "local_db",
+            "law_name": row.law_name,
+            "section_number": row.section_number,
+            "section_title": row.section_title,
+            "section_text": row.section_text,
+        }
 
-        return {"found": False, "source": "local_db", "query": f"{law_code} {section_number}"}
+    return {"found": False, "source": "local_db", "query": f"{law_code} {section_number}"}
 
-    except Exception as e:
-        return {"found": False, "error": str(e)}
 
-    finally:
-        conn.close()
+def _fts_terms(words: List[str]) -> str:
+    """OR of quoted prefix terms: bail* OR "non-bailable"* (quoting keeps punctuation out of the syntax)."""
+    return " OR ".join('"' + w.replace('"', '""') + '"*' for w in words)
 
 
 def search_by_keywords(keywords: str, limit: int = 5) -> List[Dict]:
     """
     Search by keywords in section title and text.
 
+    One ranked query over law_sections_fts (bm25, title weighted 5x) that
+    returns the best sections matching any keyword, with a snippet. Falls
+    back to a LIKE scan if scripts/build_law_sections_fts.py has not run.
+
     Examples:
         search_by_keywords("bail non-bailable")
         search_by_keywords("divorce khula dissolution")
     """
+    # Split keywords (dedupe, keep order)
+    words = list(dict.fromkeys(w for w in keywords.lower().split() if len(w) >= 3))
+    if not words:
+        return []
+
     conn = get_connection()
     if not conn:
         return []
@@ -107,38 +80,50 @@ def search_by_keywords(keywords: str, limit: int = 5) -> List[Dict]:
     try:
         cursor = conn.cursor()
 
-        # Split keywords
-        words = keywords.lower().split()
-
-        results = []
+        try:
+            # Over-fetch: the same section can be stored more than once
+            cursor.execute("""
+                           SELECT s.law_name, s.section_number, s.section_title, s.section_text,
+                                  snippet(law_sections_fts, -1, '→', '←', '...', 24) AS snippet,
+                                  bm25(law_sections_fts, 5.0, 1.0) AS score
+                           FROM law_sections_fts
+                           JOIN law_sections s ON s.id = law_sections_fts.rowid
+                           WHERE law_sections_fts MATCH ?
+                           ORDER BY score LIMIT ?
+                           """, (_fts_terms(words), limit * 2))
+        except sqlite3.OperationalError:
+            conditions = " OR ".join(["section_title LIKE ? OR section_text LIKE ?"] * len(words))
+            params = [p for w in words for p in (f"%{w}%", f"%{w}%")]
+            cursor.execute(f"""
+                           SELECT law_name, section_number, section_title, section_text,
+                                  NULL AS snippet, NULL AS score
+                           FROM law_sections
+                           WHERE {conditions} LIMIT ?
+                           """, (*params, limit * 2))
 
-        for word in words:
-            if len(word) < 3:
+        results: Dict[str, Dict] = {}
+        for row in cursor.fetchall():
+            # Avoid duplicates
+            key = f"{row['law_name']}_{row['section_number']}"
+            if key in results:
                 continue
+            haystack = f"{row['section_title'] or ''} {row['section_text'] or ''}".lower()
+            results[key] = {
+                "found": True,
+                "source": "local_db",
+                "_key": key,
+                "law_name": row["law_name"],
+                "section_number": row["section_number"],
+                "section_title": row["section_title"],
+                "section_text": (row["section_text"] or "")[:500],  # Truncate
+                "snippet": row["snippet"],
+                "score": round(-row["score"], 4) if row["score"] is not None else None,
+                "matched_keyword": next((w for w in words if w in haystack), words[0]),
+            }
+            if len(results) >= limit:
+                break
 
-            cursor.execute("""
-                           SELECT law_name, section_number, section_title, section_text
-                           FROM law_sections
-                           WHERE section_title LIKE ?
-                              OR section_text LIKE ? LIMIT ?
-                           """, (f"%{word}%", f"%{word}%", limit))
-
-            for row in cursor.fetchall():
-                # Avoid duplicates
-                key = f"{row['law_name']}_{row['section_number']}"
-                if not any(r.get("_key") == key for r in results):
-                    results.append({
-                        "found": True,
-                        "source": "local_db",
-                        "_key": key,
-                        "law_name": row["law_name"],
-                        "section_number": row["section_number"],
-                        "section_title": row["section_title"],
-                        "section_text": row["section_text"][:500],  # Truncate
-                        "matched_keyword": word,
-                    })
-
-        return results[:limit]
+        return list(results.values())
 
     except Exception as e:
         return [{"found": False, "error": str(e)}]
@@ -196,41 +181,23 @@ def search_cpc_order_rule(order_num: int, rule_num: int) -> Optional[Dict]:
         search_cpc_order_rule(21, 26)  # Order XXI Rule 26
         search_cpc_order_rule(39, 1)   # Order XXXIX Rule 1
     """
-    conn = get_connection()
-    if not conn:
+    if not os.path.exists(DB_PATH):
         return None
 
-    try:
-        cursor = conn.cursor()
-
-        cursor.execute("""
-                       SELECT law_name, section_number, section_title, section_text, order_number, rule_number
-                       FROM law_sections
-                       WHERE law_name LIKE '%Civil Procedure%'
-                         AND order_number = ?
-                         AND rule_number = ? LIMIT 1
-                       """, (order_num, rule_num))
-
-        row = cursor.fetchone()
-        if row:
-            return {
-                "found": True,
-                "source": "local_db",
-                "law_name": row["law_name"],
-                "section_number": row["section_number"],
-                "section_title": row["section_title"],
-                "section_text": row["section_text"],
-                "order_number": row["order_number"],
-                "rule_number": row["rule_number"],
-            }
-
-        return {"found": False, "source": "local_db", "query": f"Order {order_num} Rule {rule_num}"}
-
-    except Exception as e:
-        return {"found": False, "error": str(e)}
+    row = get_statute_index(DB_PATH).order_rule(order_num, rule_num)
+    if row:
+        return {
+            "found": True,
+            "source": "local_db",
+            "law_name": row.law_name,
+            "section_number": row.section_number,
+            "section_title": row.section_title,
+            "section_text": row.section_text,
+            "order_number": row.order_number,
+            "rule_number": row.rule_number,
+        }
 
-    finally:
-        conn.close()
+    return {"found": False, "source": "local_db", "query": f"Order {order_num} Rule {rule_num}"}
 
 
 def search_judgments(query: str, limit: int = 5) -> List[Dict]:
@@ -4,9 +4,12 @@ from functools import lru_cache
 
 import pandas as pd
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from groq import Groq
 from dotenv import load_dotenv
 
+from utils.db_async import run_db
+
 load_dotenv()
 api_key = os.getenv("GROQ_API_KEY")
 client = Groq(api_key=api_key) if api_key else None
@@ -79,8 +82,7 @@ def smart_search(df: pd.DataFrame, query: str) -> pd.DataFrame:
     return results[results['score'] > 0].sort_values(by='score', ascending=False).head(3)
 
 
-@router.get("/api/search-engine")
-async def legal_search(query: str):
+def _gather_context(query: str) -> list:
     statutes_db = _load_statutes()
     judgments_db = _load_judgments()
     context_results = []
@@ -96,6 +98,14 @@ async def legal_search(query: str):
         summary_snippet = row['summary'][:300].replace("\n", " ")
         context_results.append(f"PRECEDENT: {row['title']} ({row['citation']})\nRuling: {summary_snippet}...")
 
+    return context_results
+
+
+@router.get("/api/search-engine")
+async def legal_search(query: str):
+    # CSV loading and DataFrame scans block; run them on the DB threads
+    context_results = await run_db(_gather_context, query)
+
     # --- LAYER 3: AI ANSWER ---
     if not context_results:
         return {"response": "No direct matches found. Try specific keywords like 'Murder', 'Bail', or 'Tax'.",
@@ -114,7 +124,8 @@ async def legal_search(query: str):
     """
 
     try:
-        completion = client.chat.completions.create(
+        completion = await run_in_threadpool(
+            client.chat.completions.create,
             model="llama-3.3-70b-versatile",
             messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": query}],
             temperature=0.1,
@@ -3,12 +3,20 @@
 import logging
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-import sqlite3
 import re
 import os
+import sqlite3
+from typing import Literal, Optional
 from openai import OpenAI
 
+from utils.citations import citation_where, normalize_citation
+from utils.db_async import run_db
+from utils.db_pool import LEGAL_DB_PATH, acquire
+from utils.statute_index import get_statute_index, law_code_for_name, section_key
+from utils.statute_refs import judgments_for_section
+
 router = APIRouter(prefix="/api/research", tags=["Smart Research"])
 logger = logging.getLogger(__name__)
 
@@ -17,6 +25,8 @@ client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 class SearchRequest(BaseModel):
     query: str = Field(..., min_length=2, max_length=500)
+    # Section lookups: judgments most cited by other judgments, or newest first
+    sort: Literal["authority", "recent"] = "authority"
 
 
 class SearchResponse(BaseModel):
@@ -28,11 +38,16 @@ class SearchResponse(BaseModel):
 
 
 def get_db():
-    return sqlite3.connect("data/legal_db.sqlite")
+    if not os.path.exists(LEGAL_DB_PATH):
+        raise HTTPException(status_code=500, detail="Database not found. Please run the scraper first.")
+    return acquire()
 
 
 def detect_query_type(query: str) -> str:
     query_lower = query.lower().strip()
+    citation = normalize_citation(query)
+    if citation and citation.page:
+        return "citation_lookup"
     section_patterns = [r'^\d+[-]?[a-zA-Z]?$', r'^section\s*\d+', r'^(ppc|crpc|cpc|pec)\s*\d+', r'^\d+[-]?[a-zA-Z]?\s+(ppc|crpc|cpc)']
     for pattern in section_patterns:
         if re.search(pattern, query_lower):
@@ -46,7 +61,7 @@ def detect_query_type(query: str) -> str:
 
 def extract_section_number(query: str) -> tuple:
     query_lower = query.lower().strip()
-    law_map = {'ppc': 'Pakistan Penal Code', 'crpc': 'Code of Criminal Procedure', 'cpc': 'Code of Civil Procedure', 'pec': 'Pakistan Penal Code', 'qso': 'Qanun-e-Shahadat'}
+    law_map = {'ppc': 'PPC', 'crpc': 'CRPC', 'cpc': 'CPC', 'pec': 'PPC', 'qso': 'QSO'}
     law_filter = None
     for abbr, full_name in law_map.items():
         if abbr in query_lower:
@@ -59,17 +74,8 @@ def extract_section_number(query: str) -> tuple:
 
 def lookup_sections(query: str) -> list:
     section_num, law_filter = extract_section_number(query)
-    conn = get_db()
-    try:
-        cursor = conn.cursor()
-        if law_filter:
-            cursor.execute("SELECT law_name, section_number, section_title, section_text FROM law_sections WHERE section_number LIKE ? AND law_name LIKE ? ORDER BY CASE WHEN section_number = ? THEN 0 ELSE 1 END, length(section_number) LIMIT 5", (f"%{section_num}%", f"%{law_filter}%", section_num))
-        else:
-            cursor.execute("SELECT law_name, section_number, section_title, section_text FROM law_sections WHERE section_number LIKE ? ORDER BY CASE WHEN section_number = ? THEN 0 ELSE 1 END, length(section_number) LIMIT 5", (f"%{section_num}%", section_num))
-        rows = cursor.fetchall()
-        return [{"law_name": row[0], "section_number": row[1], "title": row[2] if row[2] else f"Section {row[1]}", "content": row[3][:1000] + "..." if len(row[3]) > 1000 else row[3]} for row in rows]
-    finally:
-        conn.close()
+    rows = get_statute_index().sections_for(section_num, law=law_filter, limit=5)
+    return [{"law_name": row.law_name, "section_number": row.section_number, "title": row.section_title if row.section_title else f"Section {row.section_number}", "content": row.section_text[:1000] + "..." if len(row.section_text) > 1000 else row.section_text} for row in rows]
 
 
 def search_judgments(query: str) -> list:
@@ -91,6 +97,65 @@ def search_judgments(query: str) -> list:
     finally:
         conn.close()
 
+
+def lookup_citation(query: str) -> list:
+    where, params = citation_where(normalize_citation(query), alias="c")
+    conn = get_db()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"SELECT j.title, j.citation, j.judgment_date, j.summary FROM judgment_citations c JOIN judgments j ON j.id = c.judgment_id WHERE {where} LIMIT 10", params)
+        except sqlite3.OperationalError:
+            return []  # scripts/build_citation_index.py not run
+        rows = cursor.fetchall()
+        return [{"case_title": row[0], "court": "Court", "date": row[2], "citation": row[1], "summary": row[3][:500] + "..." if row[3] and len(row[3]) > 500 else row[3]} for row in rows]
+    finally:
+        conn.close()
+
+
+def section_judgments(section: dict, order: str, limit: int = 3) -> Optional[list]:
+    """Judgments referring to a law section, from statute_judgments; None if it is not built."""
+    law_code = law_code_for_name(section["law_name"])
+    if not law_code:
+        return None
+    conn = get_db()
+    try:
+        ids = judgments_for_section(conn, law_code, section_key(section["section_number"]), limit=limit, order=order)
+        if not ids:
+            return ids
+        placeholders = ",".join("?" * len(ids))
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT id, title, citation, judgment_date, summary FROM judgments WHERE id IN ({placeholders})", ids)
+        by_id = {row[0]: row[1:] for row in cursor.fetchall()}
+        rows = [by_id[i] for i in ids if i in by_id]
+        return [{"case_title": row[0], "court": "Court", "date": row[2], "citation": row[1], "summary": row[3][:500] + "..." if row[3] and len(row[3]) > 500 else row[3]} for row in rows]
+    finally:
+        conn.close()
+
+
+def find_sections_and_judgments(query: str, query_type: str, order: str = "authority") -> tuple:
+    sections, judgments = [], []
+    if query_type == "citation_lookup":
+        judgments = lookup_citation(query) or search_judgments(query)
+    elif query_type == "section_lookup":
+        sections = lookup_sections(query)
+        if sections:
+            judgments = section_judgments(sections[0], order)
+            if judgments is None:  # scripts/build_statute_postings.py not run
+                judgments = search_judgments(sections[0]["section_number"])[:3]
+    elif query_type == "case_search":
+        judgments = search_judgments(query)
+        sec_match = re.search(r'(\d+[-]?[a-zA-Z]?)', query)
+        if sec_match:
+            sections = lookup_sections(sec_match.group(1))[:2]
+    else:
+        judgments = search_judgments(query)[:5]
+        sec_match = re.search(r'(\d+[-]?[a-zA-Z]?)', query)
+        if sec_match:
+            sections = lookup_sections(sec_match.group(1))[:3]
+    return sections, judgments
+
+
 def get_ai_explanation(query: str, sections: list, judgments: list) -> str:
     context_parts = []
     if sections:
@@ -125,6 +190,8 @@ def get_suggestions(query: str, query_type: str) -> list:
         return ["Try: 'PPC 302'", "Try: 'CrPC 154'"]
     elif query_type == "case_search":
         return ["Try: 'bail 2023'", "Try: 'Supreme Court murder'"]
+    elif query_type == "citation_lookup":
+        return ["Try: 'PLD 2024 SC 1276'", "Try: '2023 SCMR 45'"]
     return ["Try: 'punishment for theft'", "Try: 'how to file FIR'"]
 
 
@@ -134,37 +201,26 @@ async def smart_search(request: SearchRequest):
     if not query or len(query) < 2:
         raise HTTPException(status_code=400, detail="Query too short")
     query_type = detect_query_type(query)
-    sections, judgments = [], []
-    if query_type == "section_lookup":
-        sections = lookup_sections(query)
-        if sections:
-            judgments = search_judgments(sections[0]["section_number"])[:3]
-    elif query_type == "case_search":
-        judgments = search_judgments(query)
-        sec_match = re.search(r'(\d+[-]?[a-zA-Z]?)', query)
-        if sec_match:
-            sections = lookup_sections(sec_match.group(1))[:2]
-    else:
-        judgments = search_judgments(query)[:5]
-        sec_match = re.search(r'(\d+[-]?[a-zA-Z]?)', query)
-        if sec_match:
-            sections = lookup_sections(sec_match.group(1))[:3]
-    ai_explanation = get_ai_explanation(query, sections, judgments)
+    sections, judgments = await run_db(find_sections_and_judgments, query, query_type, request.sort)
+    ai_explanation = await run_in_threadpool(get_ai_explanation, query, sections, judgments)
     suggestions = get_suggestions(query, query_type)
     return SearchResponse(query_type=query_type, sections=sections, judgments=judgments, ai_explanation=ai_explanation, suggestions=suggestions)
 
 
 @router.get("/stats")
 async def get_stats():
-    conn = get_db()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM law_sections")
-        total_sections = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM judgments")
-        total_judgments = cursor.fetchone()[0]
-        cursor.execute("SELECT DISTINCT law_name FROM law_sections")
-        laws = [row[0] for row in cursor.fetchall()]
-        return {"total_sections": total_sections, "total_judgments": total_judgments, "laws_covered": laws}
-    finally:
-        conn.close()
+    def query():
+        conn = get_db()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM law_sections")
+            total_sections = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM judgments")
+            total_judgments = cursor.fetchone()[0]
+            cursor.execute("SELECT DISTINCT law_name FROM law_sections")
+            laws = [row[0] for row in cursor.fetchall()]
+            return {"total_sections": total_sections, "total_judgments": total_judgments, "laws_covered": laws}
+        finally:
+            conn.close()
+
+    return await run_db(query)
@@ -0,0 +1,87 @@
+"""
+Judgment Court Column Migration
+Adds judgments.court (short court code, see utils/courts.py), backfills it
+from pdf_url / citation, and creates the indexes used by search filters.
+Run: python backend/scripts/add_court_column.py
+
+Safe to re-run: rows that already have a court are left alone. Scrapers
+set court with detect_court on insert; an insert trigger tags rows left
+NULL by other writers from the source domain.
+"""
+
+import os
+import sqlite3
+import sys
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+BATCH_SIZE = 1000
+
+# backend/ on sys.path for shared storage helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from utils.courts import add_court_column, court_url_case_sql, detect_court
+
+
+def backfill(conn: sqlite3.Connection) -> Counter:
+    counts: Counter = Counter()
+    updates = []
+    rows = conn.execute("SELECT id, pdf_url, citation FROM judgments WHERE court IS NULL").fetchall()
+    for judgment_id, pdf_url, citation in rows:
+        code = detect_court(pdf_url, citation)
+        counts[code or "unknown"] += 1
+        if code:
+            updates.append((code, judgment_id))
+        if len(updates) >= BATCH_SIZE:
+            conn.executemany("UPDATE judgments SET court = ? WHERE id = ?", updates)
+            updates.clear()
+    if updates:
+        conn.executemany("UPDATE judgments SET court = ? WHERE id = ?", updates)
+    return counts
+
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_judgments_court_date ON judgments(court, judgment_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_judgments_date ON judgments(judgment_date)")
+    conn.execute("DROP TRIGGER IF EXISTS judgments_court_ai")
+    conn.execute(f"""
+        CREATE TRIGGER judgments_court_ai AFTER INSERT ON judgments
+        WHEN NEW.court IS NULL
+        BEGIN
+            UPDATE judgments SET court = {court_url_case_sql('NEW.pdf_url')} WHERE id = NEW.id;
+        END
+    """)
+
+
+def main():
+    print("=" * 50)
+    print("JUDGMENT COURT COLUMN")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        if add_court_column(conn):
+            print("✓ Added judgments.court")
+        else:
+            print("✓ judgments.court already present")
+
+        counts = backfill(conn)
+        create_indexes(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    print("✓ Indexes and insert trigger in place")
+    if counts:
+        for code, n in counts.most_common():
+            print(f"  {code:<8} {n}")
+    else:
+        print("  Nothing to backfill")
+
+
+if __name__ == "__main__":
+    main()
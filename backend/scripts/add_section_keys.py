@@ -0,0 +1,204 @@
+"""
+Law Section Key Migration
+Adds law_sections.law_code (PPC, CRPC, CPC, CONST, QSO, MFLO) and
+law_sections.section_key (canonical section number, see
+utils/statute_index.section_key), backfills them and creates a unique
+index on (law_code, section_key) plus triggers that keep both current.
+Run: python backend/scripts/add_section_keys.py
+
+Safe to re-run: keys are recomputed for every row. CPC Order/Rule rows get
+keys like 'O21R26' so they never collide with sections. When a law has
+the same section more than once, the canonical edition with the longest
+text keeps the key and the others get NULL (the same row the API's
+in-memory index serves). Rows inserted later go through the triggers,
+where the first row to claim a key keeps it.
+"""
+
+import os
+import sqlite3
+import sys
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+BATCH_SIZE = 1000
+
+# backend/ on sys.path for shared statute helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from utils.statute_index import (
+    LAW_CODES,
+    fetch_section,
+    law_code_for_name,
+    law_code_sql,
+    order_rule_key,
+    section_key,
+    section_key_sql_steps,
+)
+
+
+def columns(conn: sqlite3.Connection) -> set:
+    return {row[1] for row in conn.execute("PRAGMA table_info(law_sections)")}
+
+
+def add_columns(conn: sqlite3.Connection) -> list:
+    present = columns(conn)
+    added = []
+    for name in ("law_code", "section_key"):
+        if name not in present:
+            conn.execute(f"ALTER TABLE law_sections ADD COLUMN {name} TEXT")
+            added.append(name)
+    return added
+
+
+def compute_keys(conn: sqlite3.Connection, has_order_rule: bool) -> tuple:
+    """[(law_code, section_key, id)] with duplicate keys set to None, plus per-code counts."""
+    order_cols = "order_number, rule_number" if has_order_rule else "NULL, NULL"
+    rows = conn.execute(
+        f"SELECT id, law_name, section_number, length(section_text), {order_cols} FROM law_sections"
+    ).fetchall()
+
+    best = {}
+    keyed = []
+    for row_id, law_name, number, text_len, order_no, rule_no in rows:
+        code = law_code_for_name(law_name or "")
+        if order_no is not None and rule_no is not None:
+            key = order_rule_key(order_no, rule_no)
+        else:
+            key = section_key(number or "") or None
+        canonical = 1 if law_name in (LAW_CODES[code][0] if code else ()) else 0
+        rank = (canonical, text_len or 0, -row_id)
+        keyed.append((code, key, row_id))
+        if code and key:
+            current = best.get((code, key))
+            if current is None or rank > current[0]:
+                best[(code, key)] = (rank, row_id)
+
+    winners = {row_id for _, row_id in best.values()}
+    updates = []
+    counts: Counter = Counter()
+    for code, key, row_id in keyed:
+        if code and key and row_id not in winners:
+            key = None
+            counts["duplicate"] += 1
+        counts[code or "other"] += 1
+        updates.append((code, key, row_id))
+    return updates, counts
+
+
+def backfill(conn: sqlite3.Connection, updates: list) -> None:
+    # Rebuilt afterwards; keys may move between rows on a re-run
+    conn.execute("DROP INDEX IF EXISTS idx_law_sections_code_key")
+    for start in range(0, len(updates), BATCH_SIZE):
+        conn.executemany(
+            "UPDATE law_sections SET law_code = ?, section_key = ? WHERE id = ?",
+            updates[start:start + BATCH_SIZE],
+        )
+
+
+def create_index_and_triggers(conn: sqlite3.Connection, has_order_rule: bool) -> None:
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_law_sections_code_key ON law_sections(law_code, section_key)"
+    )
+
+    steps = section_key_sql_steps("NEW.section_number")
+    code = law_code_sql("NEW.law_name")
+    body = [f"UPDATE law_sections SET law_code = NULL, section_key = {steps[0]} WHERE id = NEW.id;"]
+    body += [f"UPDATE law_sections SET section_key = {step} WHERE id = NEW.id;" for step in steps[1:]]
+    if has_order_rule:
+        body.append(
+            "UPDATE law_sections SET section_key = 'O' || NEW.order_number || 'R' || NEW.rule_number"
+            " WHERE id = NEW.id AND NEW.order_number IS NOT NULL AND NEW.rule_number IS NOT NULL;"
+        )
+    # Claim (law_code, section_key) unless another row already holds it;
+    # a duplicate keeps its law_code but no key.
+    body.append(f"""
+        UPDATE law_sections SET law_code = {code}
+        WHERE id = NEW.id AND NOT EXISTS (
+            SELECT 1 FROM law_sections AS other
+            WHERE other.law_code = {code}
+              AND other.section_key = law_sections.section_key
+              AND other.id != NEW.id
+        );""")
+    body.append(f"""
+        UPDATE law_sections SET law_code = {code}, section_key = NULL
+        WHERE id = NEW.id AND law_code IS NULL AND {code} IS NOT NULL;""")
+    body_sql = "\n".join(body)
+
+    watched = "law_name, section_number" + (", order_number, rule_number" if has_order_rule else "")
+    conn.execute("DROP TRIGGER IF EXISTS law_sections_key_ai")
+    conn.execute("DROP TRIGGER IF EXISTS law_sections_key_au")
+    conn.execute(f"CREATE TRIGGER law_sections_key_ai AFTER INSERT ON law_sections BEGIN\n{body_sql}\nEND")
+    conn.execute(
+        f"CREATE TRIGGER law_sections_key_au AFTER UPDATE OF {watched} ON law_sections BEGIN\n{body_sql}\nEND"
+    )
+
+
+def check_sql_matches_python(conn: sqlite3.Connection) -> int:
+    """Rows whose trigger-computed key would differ from section_key()."""
+    steps = section_key_sql_steps("section_number")
+    conn.execute("CREATE TEMP TABLE key_check (section_number TEXT, section_key TEXT)")
+    try:
+        conn.execute("INSERT INTO key_check (section_number) SELECT DISTINCT section_number FROM law_sections")
+        conn.execute(f"UPDATE key_check SET section_key = {steps[0]}")
+        for step in steps[1:]:
+            conn.execute(f"UPDATE key_check SET section_key = {step}")
+        mismatches = 0
+        for number, sql_key in conn.execute("SELECT section_number, section_key FROM key_check"):
+            if (sql_key or "") != section_key(number or ""):
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  ! {number!r}: SQL {sql_key!r} vs Python {section_key(number or '')!r}")
+        return mismatches
+    finally:
+        conn.execute("DROP TABLE key_check")
+
+
+def main():
+    print("=" * 50)
+    print("LAW SECTION KEYS")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        # Persisted in the file: the API's read-only pooled connections
+        # (utils/db_pool.py) then read alongside writers without blocking.
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        print(f"✓ Journal mode: {mode}")
+
+        if not columns(conn):
+            print("✗ law_sections table not found")
+            return
+
+        added = add_columns(conn)
+        print(f"✓ Added {', '.join(added)}" if added else "✓ law_code / section_key already present")
+
+        has_order_rule = {"order_number", "rule_number"} <= columns(conn)
+        updates, counts = compute_keys(conn, has_order_rule)
+        backfill(conn, updates)
+        create_index_and_triggers(conn, has_order_rule)
+        conn.commit()
+
+        mismatches = check_sql_matches_python(conn)
+        row = fetch_section(conn, "PPC", "302")
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM law_sections WHERE law_code = 'PPC' AND section_key = '302'"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    print(f"✓ Keyed {len(updates)} rows; unique index and triggers in place")
+    for code, n in counts.most_common():
+        print(f"  {code:<10} {n}")
+    if mismatches:
+        print(f"✗ {mismatches} section numbers get a different key from the triggers")
+    else:
+        print("✓ Trigger keys match section_key() for every section number")
+    print(f"✓ PPC 302 lookup: {'found' if row else 'not found'} | plan: {plan[0][-1] if plan else '?'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+ANN Recall vs Latency Benchmark
+Compares IVF search at several nprobe values against exact search.
+Run: python backend/scripts/bench_ann_index.py            (uses legal_db.sqlite)
+     python backend/scripts/bench_ann_index.py 500000     (synthetic vectors)
+
+Reports recall@10 (fraction of the exact top-10 found) and mean / p99
+query latency. Queries are perturbed copies of stored vectors, which is
+close to how real queries land near relevant judgments.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+
+# backend/ on sys.path for shared search helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from services.ann_index import IVFIndex
+from services.embedding_store import EmbeddingMatrix, load_embedding_matrix
+
+DIM = 1536
+K = 10
+N_QUERIES = 200
+NPROBES = [1, 4, 8, 16, 32, 64]
+
+
+def synthetic_matrix(n: int, dim: int = DIM, n_topics: int = 2000, seed: int = 0) -> EmbeddingMatrix:
+    """Clustered unit vectors: real judgment embeddings group by subject matter."""
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 50000):
+        end = min(n, start + 50000)
+        vectors[start:end] = topics[rng.integers(0, n_topics, end - start)]
+        vectors[start:end] += 1.5 * rng.standard_normal((end - start, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return EmbeddingMatrix(np.arange(1, n + 1, dtype=np.int64), vectors, n)
+
+
+def timed(fn, queries):
+    latencies, results = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        results.append(fn(q))
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return results, np.array(latencies)
+
+
+def main():
+    if len(sys.argv) > 1:
+        matrix = synthetic_matrix(int(sys.argv[1]))
+        print(f"Synthetic corpus: {matrix.size} vectors")
+    else:
+        if not os.path.exists(DB_PATH):
+            print(f"✗ Database not found: {DB_PATH}")
+            return
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            matrix = load_embedding_matrix(conn)
+        finally:
+            conn.close()
+        print(f"legal_db.sqlite corpus: {matrix.size} vectors")
+
+    if matrix.size < K:
+        print("✗ Not enough vectors to benchmark")
+        return
+
+    t0 = time.perf_counter()
+    index = IVFIndex.build(matrix)
+    print(f"Built {index.nlist} lists in {time.perf_counter() - t0:.1f}s\n")
+
+    rng = np.random.default_rng(1)
+    picks = rng.choice(matrix.size, size=min(N_QUERIES, matrix.size), replace=False)
+    queries = matrix.vectors[picks] + 0.04 * rng.standard_normal((picks.size, matrix.dim)).astype(np.float32)
+
+    exact, exact_ms = timed(lambda q: matrix.search(q, K), queries)
+    truth = [{i for i, _ in r} for r in exact]
+
+    print(f"{'method':<14}{'recall@10':>10}{'mean ms':>10}{'p99 ms':>10}")
+    print(f"{'exact':<14}{1.0:>10.3f}{exact_ms.mean():>10.2f}{np.percentile(exact_ms, 99):>10.2f}")
+
+    for nprobe in NPROBES:
+        if nprobe > index.nlist:
+            break
+        approx, ms = timed(lambda q: index.search(q, K, nprobe), queries)
+        recall = np.mean([len(t & {i for i, _ in r}) / K for t, r in zip(truth, approx)])
+        print(f"{'ivf nprobe=' + str(nprobe):<14}{recall:>10.3f}{ms.mean():>10.2f}{np.percentile(ms, 99):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
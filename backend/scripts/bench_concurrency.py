@@ -0,0 +1,159 @@
+"""
+Search API Concurrency Benchmark
+Drives the judgment search router with many concurrent clients issuing a
+mix of slow queries (citation LIKE scans, keyword FTS, recent judgments
+sorted without an index) and fast lookups by id (70% of requests), and
+reports per-endpoint p50 / p99 latency and throughput.
+Run: python backend/scripts/bench_concurrency.py [--clients 32] [--seconds 10] [--inline]
+
+--inline runs every query directly on the event loop (how the routes
+behaved before utils/db_async.py) so the two can be compared: there a
+single slow scan holds up every fast request queued behind it.
+The API runs under uvicorn in a background thread and is driven over
+localhost HTTP, so the load generator does not share the server's loop.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+
+# backend/ on sys.path for shared search helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+import routers.judgment_search as judgment_search
+from utils.db_async import DB_THREADS
+
+KEYWORDS = ["bail", "murder", "tax", "contract", "appeal", "property", "custody", "fraud", "evidence", "service"]
+CITATION_PARTS = ["SCMR", "PLD", "YLR", "MLD", "CLC", "PCrLJ", "2019", "2021", "2023"]
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def sample_ids(db_path: str, n: int = 500) -> list:
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT id FROM judgments ORDER BY RANDOM() LIMIT ?", (n,))]
+    finally:
+        conn.close()
+
+
+def next_request(rng: random.Random, ids: list):
+    """(label, method, path, json) drawn from the mixed workload."""
+    roll = rng.random()
+    if roll < 0.10:
+        return "citation", "GET", f"/api/search/citation/{rng.choice(CITATION_PARTS)}", None
+    if roll < 0.25:
+        query = " ".join(rng.sample(KEYWORDS, 2))
+        return "keyword", "POST", "/api/search/keyword", {"query": query, "limit": 20}
+    if roll < 0.30:
+        return "recent", "GET", "/api/search/recent?limit=10", None
+    return "judgment", "GET", f"/api/search/judgment/{rng.choice(ids)}", None
+
+
+async def client_loop(client: httpx.AsyncClient, deadline: float, seed: int, ids: list, latencies: dict, errors: dict):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        label, method, path, body = next_request(rng, ids)
+        t0 = time.perf_counter()
+        response = await client.request(method, path, json=body)
+        latencies[label].append((time.perf_counter() - t0) * 1000)
+        if response.status_code >= 500:
+            errors[label] += 1
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    """The search router under uvicorn in a background thread (its own event loop)."""
+    app = FastAPI()
+    app.include_router(judgment_search.router)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run(base_url: str, clients: int, seconds: float, ids: list) -> tuple:
+    latencies, errors = defaultdict(list), defaultdict(int)
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(client_loop(client, deadline, i, ids, latencies, errors) for i in range(clients)))
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed-load latency benchmark for the search router")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of the run")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database to query")
+    parser.add_argument("--inline", action="store_true", help="Run queries on the event loop (old behaviour)")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("SEARCH CONCURRENCY BENCHMARK")
+    print("=" * 50)
+
+    if not os.path.exists(args.db):
+        print(f"✗ Database not found: {args.db}")
+        return
+
+    judgment_search.DB_PATH = args.db
+    if args.inline:
+        async def run_inline(fn, *fn_args, **fn_kwargs):
+            return fn(*fn_args, **fn_kwargs)
+
+        judgment_search.run_db = run_inline
+
+    ids = sample_ids(args.db)
+    if not ids:
+        print("✗ No judgments in database")
+        return
+
+    mode = "inline (event loop)" if args.inline else f"DB thread pool ({DB_THREADS} threads)"
+    print(f"✓ {args.clients} clients for {args.seconds:.0f}s, queries {mode}")
+
+    port = free_port()
+    server = start_server(port)
+    try:
+        latencies, errors = asyncio.run(run(f"http://127.0.0.1:{port}", args.clients, args.seconds, ids))
+    finally:
+        server.should_exit = True
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n{'endpoint':<10} {'requests':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for label in ("judgment", "recent", "keyword", "citation"):
+        values = latencies.get(label, [])
+        print(f"{label:<10} {len(values):>9} {percentile(values, 50):>9.1f} "
+              f"{percentile(values, 99):>9.1f} {errors.get(label, 0):>7}")
+    every = [v for values in latencies.values() for v in values]
+    print(f"{'all':<10} {total:>9} {percentile(every, 50):>9.1f} {percentile(every, 99):>9.1f} "
+          f"{sum(errors.values()):>7}")
+    print(f"\n✓ Throughput: {total / args.seconds:.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
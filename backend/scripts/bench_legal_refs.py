@@ -0,0 +1,120 @@
+"""
+Legal Reference Scanner Benchmark
+Times utils.legal_refs.scan_refs over judgment text and reports MB/s and
+references found per MB. Uses judgments.full_text from legal_db.sqlite
+when it exists, otherwise a synthetic corpus of judgment-like paragraphs.
+Run: python backend/scripts/bench_legal_refs.py [--mb 20] [--synthetic]
+
+Also times the five parsers that sit on the scanner (law_lookup,
+law_index, law_resolve, search_orchestrator, SectionValidator) run one
+after another on the same text, as a request that used them all would.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+CHUNK_CHARS = 50_000
+
+# backend/ on sys.path for shared reference helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from utils.legal_refs import scan_refs
+
+FILLER = (
+    "the learned counsel for the petitioner contended that the impugned order was passed without "
+    "lawful authority and the trial court failed to appreciate the evidence on record the prosecution "
+    "witnesses were cross examined at length and no material contradiction was brought on record "
+    "it is settled law that bail cannot be withheld as punishment and the accused is entitled to "
+    "the benefit of doubt in the circumstances the petition is accepted"
+).split()
+REFERENCES = [
+    "section 302(b) P.P.C.", "u/s 497 Cr.P.C.", "Section 22-A CrPC", "489-F PPC", "Order XXI Rule 26 CPC",
+    "O.39 R.1 and 2 C.P.C.", "Article 199 of the Constitution", "Art. 10A", "section 12(2) CPC",
+    "Section 561-A Cr.P.C.", "PPC 324", "section 34", "PLD 2019 SC 12", "2023 SCMR 45",
+]
+
+
+def synthetic_text(mb: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out, size = [], 0
+    while size < mb * 1e6:
+        word = rng.choice(REFERENCES) if rng.random() < 0.02 else rng.choice(FILLER)
+        out.append(word)
+        size += len(word) + 1
+    return " ".join(out)
+
+
+def judgment_text(mb: float) -> str:
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        parts, size = [], 0
+        for (text,) in conn.execute("SELECT full_text FROM judgments WHERE full_text IS NOT NULL"):
+            parts.append(text)
+            size += len(text)
+            if size >= mb * 1e6:
+                break
+        return "\n".join(parts)
+    finally:
+        conn.close()
+
+
+def all_parsers(text: str) -> int:
+    from routers.law_resolve import parse_cpc_order_rule, parse_simple_refs
+    from services.search_orchestrator import extract_references_from_text
+    from services.section_validator import SectionValidator
+    from utils.law_index import _parse_refs_from_text
+    from utils.law_lookup import parse_procedural_refs
+
+    found = len(parse_procedural_refs(text)) + len(_parse_refs_from_text(text))
+    found += len(parse_simple_refs(text)) + len(parse_cpc_order_rule(text))
+    refs = extract_references_from_text(text)
+    found += len(refs["sections"]) + len(refs["articles"]) + len(refs["orders"])
+    return found + len(SectionValidator()._extract_cited_sections(text))
+
+
+def throughput(fn, chunks, repeat: int):
+    best = float("inf")
+    found = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        found = sum(fn(chunk) for chunk in chunks)
+        best = min(best, time.perf_counter() - t0)
+    return best, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legal reference scanner throughput")
+    parser.add_argument("--mb", type=float, default=20, help="Megabytes of text to scan")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes; the fastest is reported")
+    parser.add_argument("--synthetic", action="store_true", help="Ignore legal_db.sqlite")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("LEGAL REFERENCE SCANNER")
+    print("=" * 50)
+
+    use_db = os.path.exists(DB_PATH) and not args.synthetic
+    text = judgment_text(args.mb) if use_db else synthetic_text(args.mb)
+    if not text:
+        print("✗ No judgment text to scan")
+        return
+    # Judgment-sized chunks, as the scrapers and API pass them
+    chunks = [text[i:i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)]
+    mb = len(text.encode("utf-8")) / 1e6
+    print(f"✓ {mb:.1f} MB of {'judgment' if use_db else 'synthetic'} text in {len(chunks)} chunks")
+
+    def scan(chunk):
+        return len(scan_refs(chunk))
+
+    for name, fn in (("scan_refs", scan), ("all five parsers", all_parsers)):
+        seconds, found = throughput(fn, chunks, args.repeat)
+        print(f"  {name:<18} {mb / seconds:>7.1f} MB/s  {found / mb:>8.0f} refs/MB")
+
+
+if __name__ == "__main__":
+    main()
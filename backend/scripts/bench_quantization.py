@@ -0,0 +1,74 @@
+"""
+int8 Quantization Benchmark
+Compares the float32 scan with the int8 coarse scan + float32 re-rank.
+Run: python backend/scripts/bench_quantization.py            (uses legal_db.sqlite)
+     python backend/scripts/bench_quantization.py 200000     (synthetic vectors)
+
+Reports the memory scanned per query, recall@10 against the exact
+float32 ranking, and mean / p99 latency for several re-rank depths.
+"""
+
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+
+# backend/ on sys.path for shared search helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from services.embedding_store import QuantizedMatrix, load_embedding_matrix, quantize_int8
+from bench_ann_index import synthetic_matrix, timed
+
+K = 10
+N_QUERIES = 100
+RERANK_DEPTHS = [10, 50, 100, 300, 1000]
+
+
+def main():
+    if len(sys.argv) > 1:
+        matrix = synthetic_matrix(int(sys.argv[1]))
+        print(f"Synthetic corpus: {matrix.size} vectors")
+    else:
+        if not os.path.exists(DB_PATH):
+            print(f"✗ Database not found: {DB_PATH}")
+            return
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            matrix = load_embedding_matrix(conn)
+        finally:
+            conn.close()
+        print(f"legal_db.sqlite corpus: {matrix.size} vectors")
+
+    if matrix.size < K:
+        print("✗ Not enough vectors to benchmark")
+        return
+
+    codes, scale = quantize_int8(matrix.vectors)
+    float_mb = matrix.vectors.nbytes / (1024 * 1024)
+    int8_mb = (codes.nbytes + scale.nbytes) / (1024 * 1024)
+    print(f"float32 matrix: {float_mb:.1f} MB | int8 codes: {int8_mb:.1f} MB "
+          f"({float_mb / int8_mb:.1f}x smaller)\n")
+
+    rng = np.random.default_rng(1)
+    picks = rng.choice(matrix.size, size=min(N_QUERIES, matrix.size), replace=False)
+    queries = matrix.vectors[picks] + 0.04 * rng.standard_normal((picks.size, matrix.dim)).astype(np.float32)
+
+    exact, exact_ms = timed(lambda q: matrix.search(q, K), queries)
+    truth = [{i for i, _ in r} for r in exact]
+
+    print(f"{'method':<20}{'recall@10':>10}{'mean ms':>10}{'p99 ms':>10}")
+    print(f"{'float32':<20}{1.0:>10.3f}{exact_ms.mean():>10.2f}{np.percentile(exact_ms, 99):>10.2f}")
+
+    for depth in RERANK_DEPTHS:
+        quantized = QuantizedMatrix(matrix.ids, codes, scale, matrix.vectors, matrix.max_id, rerank=depth)
+        approx, ms = timed(lambda q: quantized.search(q, K), queries)
+        recall = np.mean([len(t & {i for i, _ in r}) / K for t, r in zip(truth, approx)])
+        label = f"int8 rerank={depth}"
+        print(f"{label:<20}{recall:>10.3f}{ms.mean():>10.2f}{np.percentile(ms, 99):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
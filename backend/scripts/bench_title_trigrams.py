@@ -0,0 +1,150 @@
+"""
+Title Search Benchmark: LIKE vs Trigram Fuzzy Search
+Builds a synthetic law_blocks table (default 100k blocks) in a temp file
+and times the old title LIKE '%query%' lookup against
+LawIndex.search_by_title (utils/title_trigrams.py) on three query sets:
+exact titles, titles with their words reordered, and titles with a typo.
+Run: python backend/scripts/bench_title_trigrams.py [--blocks 100000]
+
+"found" is the share of queries whose source block is in the top 5.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# backend/ on sys.path for shared law helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from utils.law_index import LawIndex
+
+LAWS = ["PPC", "CRPC", "CPC", "QSO", "FCA", "GWA", "MFLO"]
+WORDS = (
+    "information cognizable cases offence punishment murder hurt theft robbery dacoity cheating "
+    "cheque dishonestly issuing bail bailable non-bailable arrest warrant summons search seizure "
+    "property possession injunction decree execution appeal revision review limitation suit "
+    "plaint written statement evidence witness examination confession admission document "
+    "presumption burden proof guardian ward custody maintenance dower divorce khula marriage "
+    "procedure magistrate sessions court jurisdiction transfer complaint investigation police "
+    "report charge trial judgment sentence fine imprisonment forfeiture compensation attachment "
+    "sale receiver commission costs interest security surety bond abetment conspiracy attempt "
+    "criminal trespass mischief forgery counterfeit public servant contempt defamation"
+).split()
+LIMIT = 5
+
+
+def synthetic_db(path: str, blocks: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE law_blocks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, law_code TEXT NOT NULL, kind TEXT NOT NULL,
+            number TEXT NOT NULL, title TEXT NOT NULL, text TEXT NOT NULL, source_file TEXT NOT NULL
+        )
+    """)
+    rows = []
+    for i in range(1, blocks + 1):
+        words = rng.sample(WORDS, rng.randint(3, 7))
+        title = " ".join(words).capitalize()
+        rows.append((i, LAWS[i % len(LAWS)], "section", str(i), title, f"Text of {title}.", "synthetic.pdf"))
+    conn.executemany("INSERT INTO law_blocks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return rows
+
+
+def queries(rows: list, n: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    picked = rng.sample(rows, n)
+
+    def reorder(title):
+        words = title.lower().split()
+        rng.shuffle(words)
+        return " ".join(words)
+
+    def typo(title):
+        words = title.lower().split()
+        i = max(range(len(words)), key=lambda k: len(words[k]))
+        w = words[i]
+        j = rng.randrange(1, len(w) - 1)
+        words[i] = w[:j] + w[j + 1:]  # drop one letter from the longest word
+        return " ".join(words)
+
+    return {
+        "exact": [(row, row[4]) for row in picked],
+        "reordered": [(row, reorder(row[4])) for row in picked],
+        "typo": [(row, typo(row[4])) for row in picked],
+    }
+
+
+def like_search(conn, law_code, query):
+    return conn.execute(
+        "SELECT id FROM law_blocks WHERE law_code=? AND kind=? AND title LIKE ? LIMIT ?",
+        (law_code, "section", f"%{query.strip()}%", LIMIT),
+    ).fetchall()
+
+
+def run(fn, cases):
+    latencies, found = [], 0
+    for row, query in cases:
+        t0 = time.perf_counter()
+        hit_ids = fn(row[1], query)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        found += row[0] in hit_ids
+    return np.array(latencies), found / len(cases)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE vs trigram fuzzy title search")
+    parser.add_argument("--blocks", type=int, default=100_000, help="Synthetic law_blocks rows")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per set")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("LIKE vs TRIGRAM TITLE SEARCH")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "law_index.sqlite")
+        rows = synthetic_db(path, args.blocks)
+        print(f"✓ {args.blocks} synthetic law blocks")
+
+        index = LawIndex(Path(path))
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        index.search_by_title(LAWS[0], "section", "warm up")
+        build_s = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"✓ Trigram index built in {build_s:.1f}s (peak {peak / 1e6:.0f} MB while building)")
+
+        conn = sqlite3.connect(path)
+        try:
+            def like(law_code, query):
+                return {r[0] for r in like_search(conn, law_code, query)}
+
+            def trigram(law_code, query):
+                numbers = {h.number for h in index.search_by_title(law_code, "section", query, limit=LIMIT)}
+                return {int(n) for n in numbers}
+
+            print(f"\n{args.queries} queries per set, top {LIMIT}")
+            print(f"  {'':<10} {'':<8} {'mean ms':>9} {'p99 ms':>9} {'found':>7}")
+            for name, cases in queries(rows, args.queries).items():
+                for label, fn in (("LIKE", like), ("trigram", trigram)):
+                    ms, found = run(fn, cases)
+                    print(f"  {name:<10} {label:<8} {ms.mean():>9.2f} {np.percentile(ms, 99):>9.2f} {found:>7.0%}")
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Substring Search Benchmark: LIKE vs Trigram FTS5
+Builds a synthetic judgments table (default 100k rows) in a temp file,
+adds the trigram indexes from build_trigram_index.py and times a plain
+LIKE scan against the router's substring_search (short LIKE scan, then
+the trigram index) for citation lookup and for the keyword fallback
+across title / citation / summary / full_text.
+Run: python backend/scripts/bench_trigram.py [--rows 100000] [--text-chars 600]
+
+Every query is checked to return the same judgments on both paths.
+Needles are a mix of common fragments (LIKE stops early at LIMIT) and rare
+or absent ones (LIKE has to scan the whole table).
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# backend/ on sys.path for shared search helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from build_trigram_index import build
+from routers.judgment_search import substring_match, substring_search
+
+REPORTERS = ["SCMR", "PLD", "YLR", "MLD", "CLC", "PCrLJ", "PLC", "PTD"]
+COURTS = ["SC", "Lahore", "Karachi", "Peshawar", "Islamabad", "Quetta"]
+WORDS = (
+    "bail murder appeal petition accused complainant evidence prosecution witness "
+    "contract property possession tenancy custody maintenance dower khula divorce "
+    "tax assessment customs service promotion pension constitution fundamental "
+    "rights jurisdiction revision writ injunction decree execution limitation"
+).split()
+SECTIONS = ["302", "324", "489-F", "497", "22-A", "561-A", "12(2)", "199", "O.XXI R.26"]
+LIMIT = 20
+
+
+def synthetic_db(path: str, rows: int, text_chars: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE judgments (
+            id INTEGER PRIMARY KEY, title TEXT, citation TEXT, summary TEXT,
+            full_text TEXT, pdf_url TEXT, judgment_date TEXT, created_at TEXT
+        )
+    """)
+
+    def text(n_chars: int) -> str:
+        out, size = [], 0
+        while size < n_chars:
+            word = rng.choice(WORDS) if rng.random() > 0.05 else f"section {rng.choice(SECTIONS)}"
+            out.append(word)
+            size += len(word) + 1
+        return " ".join(out)
+
+    batch = []
+    for i in range(1, rows + 1):
+        year = rng.randint(1990, 2024)
+        citation = f"{year} {rng.choice(REPORTERS)} {rng.randint(1, 2500)}"
+        title = f"{rng.choice(WORDS).title()} Khan v. The State ({rng.choice(COURTS)})"
+        batch.append((i, title, citation, text(200), text(text_chars), f"https://example.pk/{i}.pdf",
+                      f"{year}-01-01", f"{year}-01-01"))
+        if len(batch) == 10000:
+            conn.executemany("INSERT INTO judgments VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+            batch.clear()
+    if batch:
+        conn.executemany("INSERT INTO judgments VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.close()
+
+
+def citation_like(conn, needle):
+    return conn.execute(
+        "SELECT id FROM judgments WHERE citation = ? OR citation LIKE ? LIMIT ?", (needle, f"%{needle}%", LIMIT)
+    ).fetchall()
+
+
+def citation_trigram(conn, needle):
+    return substring_search(conn.cursor(), needle, ["citation"], LIMIT)
+
+
+def keyword_like(conn, needle):
+    pattern = f"%{needle}%"
+    return conn.execute(
+        "SELECT id FROM judgments WHERE title LIKE ? OR full_text LIKE ? OR citation LIKE ? OR summary LIKE ? LIMIT ?",
+        (pattern, pattern, pattern, pattern, LIMIT),
+    ).fetchall()
+
+
+def keyword_trigram(conn, needle):
+    return substring_search(conn.cursor(), needle, ["title", "full_text", "citation", "summary"], LIMIT)
+
+
+def same_matches(conn, needle, columns) -> bool:
+    """Full result sets (no LIMIT) agree between LIKE and trigram."""
+    pattern = f"%{needle}%"
+    like = " OR ".join(f"{c} LIKE ?" for c in columns)
+    expected = {r[0] for r in conn.execute(f"SELECT id FROM judgments WHERE {like}", (pattern,) * len(columns))}
+    sql, params = substring_match(conn, needle, columns)
+    got = {r[0] for r in conn.execute(sql, params)}
+    return expected == got
+
+
+def timed(fn, conn, needles, repeat: int):
+    latencies = []
+    for _ in range(repeat):
+        for needle in needles:
+            t0 = time.perf_counter()
+            fn(conn, needle)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    return np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE vs trigram substring search")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic judgments")
+    parser.add_argument("--text-chars", type=int, default=600, help="full_text length per judgment")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the query set")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("LIKE vs TRIGRAM SUBSTRING SEARCH")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite")
+        t0 = time.perf_counter()
+        synthetic_db(path, args.rows, args.text_chars)
+        base_mb = os.path.getsize(path) / 1e6
+        print(f"✓ {args.rows} synthetic judgments ({base_mb:.0f} MB) in {time.perf_counter() - t0:.1f}s")
+
+        conn = sqlite3.connect(path)
+        try:
+            t0 = time.perf_counter()
+            build(conn)
+            print(f"✓ Trigram indexes built in {time.perf_counter() - t0:.1f}s "
+                  f"(+{os.path.getsize(path) / 1e6 - base_mb:.0f} MB)")
+
+            suites = [
+                ("citation", citation_like, citation_trigram, ["citation"],
+                 ["2019 SCMR 1", "PLD 2021", "PCrLJ 24", "1999 PTD 7", "2024 YLR 2499", "CLC 1"]),
+                ("keyword fallback", keyword_like, keyword_trigram, ["title", "full_text", "citation", "summary"],
+                 ["489-F", "22-A", "O.XXI R.26", "Khan v. The", "Quetta)", "zzq-none"]),
+            ]
+            for name, like_fn, trigram_fn, columns, needles in suites:
+                ok = all(same_matches(conn, n, columns) for n in needles)
+                like_ms = timed(like_fn, conn, needles, args.repeat)
+                tri_ms = timed(trigram_fn, conn, needles, args.repeat)
+                print(f"\n{name} ({len(needles)} queries x {args.repeat}, LIMIT {LIMIT})")
+                print(f"  {'':<8} {'mean ms':>9} {'p99 ms':>9}")
+                print(f"  {'LIKE':<8} {like_ms.mean():>9.2f} {np.percentile(like_ms, 99):>9.2f}")
+                print(f"  {'trigram':<8} {tri_ms.mean():>9.2f} {np.percentile(tri_ms, 99):>9.2f}")
+                print(f"  {'✓' if ok else '✗'} same judgments on both paths; "
+                      f"{like_ms.mean() / max(tri_ms.mean(), 1e-9):.0f}x faster mean")
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+ANN Index Builder
+Trains the IVF coarse quantizer over judgments.embedding and writes
+data/judgments_ivf.npy (list-ordered ids, plus the .centroids.npy and
+.offsets.npy sidecars) next to legal_db.sqlite.
+Run: python backend/scripts/build_ann_index.py [nlist]
+
+The index holds no vectors: searches read them from the embedding store
+(the memory-mapped export from export_embeddings.py when present).
+Re-run after large ingestion batches. Judgments embedded after a build are
+still searched (exactly) until the next build folds them in.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+
+# backend/ on sys.path for shared search helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from services.ann_index import INDEX_PATH, IVFIndex
+from services.embedding_store import load_embedding_matrix
+
+
+def main():
+    print("=" * 50)
+    print("ANN INDEX BUILD")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    nlist = int(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        t0 = time.perf_counter()
+        matrix = load_embedding_matrix(conn)
+        print(f"✓ Loaded {matrix.size} embeddings (dim={matrix.dim}) in {time.perf_counter() - t0:.1f}s")
+    finally:
+        conn.close()
+
+    if matrix.size == 0:
+        print("✗ No embeddings to index")
+        return
+
+    t0 = time.perf_counter()
+    index = IVFIndex.build(matrix, nlist=nlist)
+    print(f"✓ Trained {index.nlist} lists in {time.perf_counter() - t0:.1f}s")
+
+    index.save(INDEX_PATH)
+    size_mb = os.path.getsize(INDEX_PATH) / (1024 * 1024)
+    print(f"✓ Wrote {INDEX_PATH} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Judgment Citation Index
+Parses judgments.citation into judgment_citations (reporter, year, court,
+page; see utils/citations.py) with a composite index, so citation lookup
+is an equality seek instead of LIKE '%...%'.
+Run: python backend/scripts/build_citation_index.py
+
+Safe to re-run: the table is rebuilt from judgments.citation. Scrapers
+index each new judgment as they insert it (utils.citations.index_citations);
+rerun this after bulk imports that bypass them. Case numbers such as
+'W.P. No. 123/2020' and 'Unreported' are not law-report citations and are
+left out.
+"""
+
+import os
+import sqlite3
+import sys
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+BATCH_SIZE = 1000
+
+# backend/ on sys.path for shared citation helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from utils.citations import citation_where, create_citation_table, find_citations, normalize_citation
+
+
+def rebuild(conn: sqlite3.Connection) -> Counter:
+    create_citation_table(conn)
+    conn.execute("DELETE FROM judgment_citations")
+    counts: Counter = Counter()
+    rows = []
+    for judgment_id, citation in conn.execute("SELECT id, citation FROM judgments").fetchall():
+        found = find_citations(citation or "")
+        counts["unparsed" if not found else "judgments"] += 1
+        for c in found:
+            counts[c.reporter] += 1
+            rows.append((judgment_id, c.reporter, c.year, c.court, c.page))
+        if len(rows) >= BATCH_SIZE:
+            conn.executemany("INSERT OR IGNORE INTO judgment_citations VALUES (?, ?, ?, ?, ?)", rows)
+            rows.clear()
+    if rows:
+        conn.executemany("INSERT OR IGNORE INTO judgment_citations VALUES (?, ?, ?, ?, ?)", rows)
+    return counts
+
+
+def main():
+    print("=" * 50)
+    print("JUDGMENT CITATION INDEX")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        counts = rebuild(conn)
+        conn.commit()
+        where, params = citation_where(normalize_citation("PLD 2024 SC 1276"))
+        plan = conn.execute(f"EXPLAIN QUERY PLAN SELECT judgment_id FROM judgment_citations AS c WHERE {where}",
+                            params).fetchall()
+    finally:
+        conn.close()
+
+    print(f"✓ {counts.pop('judgments', 0)} judgments with a law-report citation "
+          f"({counts.pop('unparsed', 0)} without)")
+    for reporter, n in counts.most_common():
+        print(f"  {reporter:<8} {n}")
+    print(f"✓ Lookup plan: {plan[0][-1] if plan else '?'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+CPC Order/Rule Table
+Walks every Code of Civil Procedure edition in law_sections in row order,
+reads Order headings ("ORDER XXI", "Order 39", "Order XXI Rule 26 ...")
+at the start of a title or text, and writes law_sections.order_number /
+rule_number plus cpc_order_rules: one (order, rule) -> row entry per pair,
+so Order XXI Rule 26 is a primary-key seek and never a substring match
+on "order 21" (which "order 2" also hits).
+Run: python backend/scripts/build_cpc_order_rules.py
+
+Safe to re-run: both are recomputed from the headings. Rows before the
+first Order heading are the Code's sections and get no Order/Rule. When
+a pair appears in several editions, the canonical edition with the
+longest text serves it (as in scripts/add_section_keys.py). The API
+reads the table when its statute index is built; restart it afterwards.
+Supersedes step 2 of fix_cpc_structure.py, which took the first
+"ORDER x" anywhere in a rule's text, cross-references included.
+"""
+
+import os
+import re
+import sqlite3
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+BATCH_SIZE = 1000
+CPC_ORDERS = 51
+
+# backend/ on sys.path for shared statute helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from utils.law_lookup import roman_to_int
+from utils.statute_index import LAW_CODES, create_order_rule_table, fetch_order_rule, law_code_for_name
+
+_ORDER_HEADING = re.compile(r"^\s*order\s+([0-9]+|[ivxlcdm]+)\b", re.IGNORECASE)
+_ORDER_RULE_HEADING = re.compile(
+    r"^\s*order\s+([0-9]+|[ivxlcdm]+)\s*,?\s*rule\s+([0-9]+|[ivxlcdm]+)\b", re.IGNORECASE
+)
+_RULE_NUMBER = re.compile(r"\s*(\d+)")
+
+
+def _number(raw: str) -> Optional[int]:
+    return int(raw) if raw.isdigit() else roman_to_int(raw)
+
+
+def order_heading(title: str, text: str) -> Tuple[Optional[int], Optional[int]]:
+    """(order, rule) named by a heading at the start of the title or text; rule may be None."""
+    for part in (title or "", text or ""):
+        m = _ORDER_RULE_HEADING.match(part)
+        if m:
+            return _number(m.group(1)), _number(m.group(2))
+        m = _ORDER_HEADING.match(part)
+        if m:
+            return _number(m.group(1)), None
+    return None, None
+
+
+def assign(rows: List[tuple]) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+    """row id -> (order, rule) for one edition's rows, in id order."""
+    current = None
+    out = {}
+    for row_id, number, title, text in rows:
+        order_no, rule_no = order_heading(title, text)
+        if order_no:
+            current = order_no
+        if current and rule_no is None:
+            m = _RULE_NUMBER.match(number or "")
+            rule_no = int(m.group(1)) if m else None
+        out[row_id] = (current, rule_no) if current and rule_no else (None, None)
+    return out
+
+
+def add_columns(conn: sqlite3.Connection) -> list:
+    present = {row[1] for row in conn.execute("PRAGMA table_info(law_sections)")}
+    added = []
+    for name in ("order_number", "rule_number"):
+        if name not in present:
+            conn.execute(f"ALTER TABLE law_sections ADD COLUMN {name} INTEGER")
+            added.append(name)
+    return added
+
+
+def rebuild(conn: sqlite3.Connection) -> Counter:
+    editions: Dict[str, List[tuple]] = {}
+    for row_id, law_name, number, title, text in conn.execute(
+        "SELECT id, law_name, section_number, section_title, section_text FROM law_sections ORDER BY id"
+    ):
+        if law_code_for_name(law_name or "") == "CPC":
+            editions.setdefault(law_name, []).append((row_id, number, title, text))
+
+    counts: Counter = Counter()
+    updates = []
+    best: Dict[Tuple[int, int], tuple] = {}
+    for law_name, rows in editions.items():
+        canonical = 1 if law_name in LAW_CODES["CPC"][0] else 0
+        lengths = {row_id: len(text or "") for row_id, _, _, text in rows}
+        for row_id, (order_no, rule_no) in assign(rows).items():
+            updates.append((order_no, rule_no, row_id))
+            if order_no is None:
+                counts["sections"] += 1
+                continue
+            counts["rules"] += 1
+            rank = (canonical, lengths[row_id], -row_id)
+            current = best.get((order_no, rule_no))
+            if current is None or rank > current[0]:
+                best[(order_no, rule_no)] = (rank, row_id)
+
+    for start in range(0, len(updates), BATCH_SIZE):
+        conn.executemany(
+            "UPDATE law_sections SET order_number = ?, rule_number = ? WHERE id = ?",
+            updates[start:start + BATCH_SIZE],
+        )
+    create_order_rule_table(conn)
+    conn.execute("DELETE FROM cpc_order_rules")
+    conn.executemany(
+        "INSERT INTO cpc_order_rules VALUES (?, ?, ?)",
+        [(order_no, rule_no, row_id) for (order_no, rule_no), (_, row_id) in sorted(best.items())],
+    )
+    counts["pairs"] = len(best)
+    counts["orders"] = len({order_no for order_no, _ in best})
+    counts["missing"] = len(set(range(1, CPC_ORDERS + 1)) - {order_no for order_no, _ in best})
+    return counts
+
+
+def main():
+    print("=" * 50)
+    print("CPC ORDER/RULE TABLE")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        added = add_columns(conn)
+        if added:
+            print(f"✓ Added {', '.join(added)}")
+        counts = rebuild(conn)
+        conn.commit()
+        row = fetch_order_rule(conn, 21, 26)
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT section_id FROM cpc_order_rules WHERE order_number = 21 AND rule_number = 26"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    print(f"✓ {counts['rules']} rule rows, {counts['sections']} section rows")
+    print(f"✓ {counts['pairs']} Order/Rule pairs across {counts['orders']} Orders")
+    if counts["missing"]:
+        print(f"⚠ {counts['missing']} of Orders I-LI have no rules; check their headings")
+    print(f"✓ Order XXI Rule 26: {'found' if row else 'not found'} | plan: {plan[0][-1] if plan else '?'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Law Sections FTS Index
+Creates law_sections_fts (FTS5 over section_title / section_text, external
+content = law_sections), the triggers that keep it in sync, and fills it.
+Run: python backend/scripts/build_law_sections_fts.py
+
+Safe to re-run: the index is rebuilt from law_sections each time.
+local_search.search_by_keywords ranks matches with bm25 and falls back
+to LIKE until this has been run.
+"""
+
+import os
+import sqlite3
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+
+COLUMNS = "section_title, section_text"
+
+
+def create_table_and_triggers(conn: sqlite3.Connection) -> None:
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS law_sections_fts USING fts5(
+            {COLUMNS},
+            content='law_sections',
+            content_rowid='id'
+        )
+    """)
+    conn.execute("DROP TRIGGER IF EXISTS law_sections_fts_ai")
+    conn.execute("DROP TRIGGER IF EXISTS law_sections_fts_ad")
+    conn.execute("DROP TRIGGER IF EXISTS law_sections_fts_au")
+    conn.execute(f"""
+        CREATE TRIGGER law_sections_fts_ai AFTER INSERT ON law_sections BEGIN
+            INSERT INTO law_sections_fts(rowid, {COLUMNS})
+            VALUES (new.id, new.section_title, new.section_text);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER law_sections_fts_ad AFTER DELETE ON law_sections BEGIN
+            INSERT INTO law_sections_fts(law_sections_fts, rowid, {COLUMNS})
+            VALUES ('delete', old.id, old.section_title, old.section_text);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER law_sections_fts_au AFTER UPDATE OF {COLUMNS} ON law_sections BEGIN
+            INSERT INTO law_sections_fts(law_sections_fts, rowid, {COLUMNS})
+            VALUES ('delete', old.id, old.section_title, old.section_text);
+            INSERT INTO law_sections_fts(rowid, {COLUMNS})
+            VALUES (new.id, new.section_title, new.section_text);
+        END
+    """)
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    conn.execute("INSERT INTO law_sections_fts(law_sections_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO law_sections_fts(law_sections_fts) VALUES ('optimize')")
+
+
+def main():
+    print("=" * 50)
+    print("LAW SECTIONS FTS INDEX")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        t0 = time.perf_counter()
+        create_table_and_triggers(conn)
+        rebuild(conn)
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM law_sections").fetchone()[0]
+    except sqlite3.OperationalError as e:
+        print(f"✗ FTS5 setup failed: {e}")
+        return
+    finally:
+        conn.close()
+
+    print(f"✓ Indexed {count} sections in {time.perf_counter() - t0:.1f}s")
+    print("✓ Insert / update / delete triggers in place")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Local Embedding Model Builder
+Trains the offline hashed TF-IDF + SVD model on judgments.full_text,
+stores it in the embedding_models table and writes every judgment's
+vector to judgments.local_embedding.
+Run: python backend/scripts/build_local_embeddings.py [--encode-only] [--sample N] [--dim D]
+
+Serve it with EMBEDDING_BACKEND=local. --encode-only keeps the stored
+model and only encodes judgments that have no local vector yet (run it
+after ingestion). After a full retrain, re-run export_embeddings.py /
+build_ann_index.py with EMBEDDING_BACKEND=local if you use them, and
+restart the API so it reloads the vectors.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+BATCH_SIZE = 500
+
+# backend/ on sys.path for shared search helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from services.embedding_backends import BACKEND_COLUMNS, LOCAL_MODEL_NAME
+from services.local_embeddings import DEFAULT_DIM, HashedLsaModel
+from utils.embedding_codec import encode_embedding
+
+COLUMN = BACKEND_COLUMNS["local"]
+
+
+def document_text(title, summary, full_text) -> str:
+    return "\n".join(part for part in (title, summary, full_text) if part)
+
+
+def train(conn: sqlite3.Connection, sample: int, dim: int) -> HashedLsaModel:
+    rows = conn.execute(
+        "SELECT title, summary, full_text FROM judgments ORDER BY RANDOM() LIMIT ?", (sample,)
+    ).fetchall()
+    return HashedLsaModel.train((document_text(*row) for row in rows), dim=dim, name=LOCAL_MODEL_NAME)
+
+
+def ensure_column(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(judgments)")}
+    if COLUMN not in columns:
+        conn.execute(f"ALTER TABLE judgments ADD COLUMN {COLUMN} BLOB")
+        conn.commit()
+
+
+def encode_all(conn: sqlite3.Connection, model: HashedLsaModel, only_missing: bool) -> int:
+    missing = f"AND {COLUMN} IS NULL" if only_missing else ""
+    last_id = 0
+    encoded = 0
+    while True:
+        rows = conn.execute(
+            f"""
+            SELECT id, title, summary, full_text FROM judgments
+            WHERE id > ? {missing}
+            ORDER BY id LIMIT ?
+            """,
+            (last_id, BATCH_SIZE),
+        ).fetchall()
+        if not rows:
+            return encoded
+
+        vectors = model.encode([document_text(*row[1:]) for row in rows])
+        conn.executemany(
+            f"UPDATE judgments SET {COLUMN} = ? WHERE id = ?",
+            [(encode_embedding(vec), row[0]) for row, vec in zip(rows, vectors)],
+        )
+        conn.commit()
+        encoded += len(rows)
+        last_id = rows[-1][0]
+        print(f"  encoded {encoded} judgments...", end="\r")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline embedding model")
+    parser.add_argument("--encode-only", action="store_true", help="Reuse the stored model, encode new rows only")
+    parser.add_argument("--sample", type=int, default=20000, help="Judgments sampled for training")
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help="Embedding dimension")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("LOCAL EMBEDDING MODEL")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        if args.encode_only:
+            model = HashedLsaModel.load(conn, LOCAL_MODEL_NAME)
+            if model is None:
+                print("✗ No stored model. Run without --encode-only first.")
+                return
+            print(f"✓ Loaded model {model.model_id} (dim={model.dim})")
+        else:
+            t0 = time.perf_counter()
+            model = train(conn, args.sample, args.dim)
+            model.save(conn)
+            print(f"✓ Trained {model.model_id} on {model.trained_docs} judgments "
+                  f"(dim={model.dim}) in {time.perf_counter() - t0:.1f}s")
+
+        ensure_column(conn)
+        t0 = time.perf_counter()
+        encoded = encode_all(conn, model, only_missing=args.encode_only)
+        print(f"\n✓ Encoded {encoded} judgments into judgments.{COLUMN} in {time.perf_counter() - t0:.1f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
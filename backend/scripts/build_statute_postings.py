@@ -0,0 +1,92 @@
+"""
+Statute -> Judgment Postings
+Parses every judgment's full_text for section references (Section 302
+PPC, u/s 497 Cr.P.C., Order XXI Rule 26 CPC, Article 199 Constitution;
+see utils/law_lookup.parse_procedural_refs) into statute_judgments keyed
+by (law_code, section_key), so "judgments on PPC 302" is an index seek
+instead of LIKE '%302%' over titles and summaries.
+Run: python backend/scripts/build_statute_postings.py
+
+Safe to re-run: the table is rebuilt from judgments.full_text. Scrapers
+index each new judgment as they insert it (utils.statute_refs.index_statute_refs);
+rerun this after bulk imports that bypass them. References without a law
+("section 302" alone) are left out.
+"""
+
+import os
+import sqlite3
+import sys
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+PAGE_SIZE = 500
+
+# backend/ on sys.path for shared statute helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from utils.statute_refs import create_postings_table, judgments_for_section, statute_refs
+
+
+def rebuild(conn: sqlite3.Connection) -> Counter:
+    """
+    Re-parse judgments a page at a time (id > last id, PAGE_SIZE rows) so
+    only one page of full_text is in memory, committing after each page.
+    """
+    create_postings_table(conn)
+    conn.execute("DELETE FROM statute_judgments")
+    conn.commit()
+    counts: Counter = Counter()
+    last_id = 0
+    while True:
+        page = conn.execute(
+            "SELECT id, full_text FROM judgments WHERE id > ? ORDER BY id LIMIT ?", (last_id, PAGE_SIZE)
+        ).fetchall()
+        if not page:
+            break
+        rows = []
+        for judgment_id, full_text in page:
+            keys = statute_refs(full_text)
+            counts["judgments" if keys else "unreferenced"] += 1
+            for code, key in keys:
+                counts[code] += 1
+                rows.append((code, key, judgment_id))
+        conn.executemany("INSERT OR IGNORE INTO statute_judgments VALUES (?, ?, ?)", rows)
+        conn.commit()
+        last_id = page[-1][0]
+    return counts
+
+
+def main():
+    print("=" * 50)
+    print("STATUTE -> JUDGMENT POSTINGS")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        counts = rebuild(conn)
+        conn.commit()
+        top = conn.execute("""
+            SELECT law_code, section_key, COUNT(*) AS n FROM statute_judgments
+            GROUP BY law_code, section_key ORDER BY n DESC LIMIT 10
+        """).fetchall()
+        sample = judgments_for_section(conn, top[0][0], top[0][1], limit=3) if top else []
+    finally:
+        conn.close()
+
+    print(f"✓ {counts.pop('judgments', 0)} judgments refer to a statute "
+          f"({counts.pop('unreferenced', 0)} without)")
+    for code, n in counts.most_common():
+        print(f"  {code:<6} {n}")
+    print("✓ Most referred provisions:")
+    for code, key, n in top:
+        print(f"  {code} {key:<8} {n}")
+    if top:
+        print(f"✓ {top[0][0]} {top[0][1]}: judgments {sample}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Judgment Trigram Index
+Creates trigram-tokenized FTS5 tables so substring searches on judgments
+(citation lookup, keyword fallback for input such as "489-F") are index
+lookups instead of LIKE '%...%' scans:
+  judgments_trigram       title, citation
+  judgments_text_trigram  summary, full_text  (skip with --skip-full-text)
+Run: python backend/scripts/build_trigram_index.py [--skip-full-text]
+
+Both are external-content tables over judgments with sync triggers; safe
+to re-run (rebuilds from judgments). The text table costs roughly three
+times the size of the text it covers. Without it, the keyword fallback
+still scans summary / full_text.
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+
+TABLES = {
+    "judgments_trigram": ("title", "citation"),
+    "judgments_text_trigram": ("summary", "full_text"),
+}
+
+
+def create_table(conn: sqlite3.Connection, table: str, columns: tuple) -> None:
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            {cols},
+            content='judgments',
+            content_rowid='id',
+            tokenize='trigram'
+        )
+    """)
+    for suffix in ("ai", "ad", "au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {table}_{suffix}")
+    conn.execute(f"""
+        CREATE TRIGGER {table}_ai AFTER INSERT ON judgments BEGIN
+            INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {table}_ad AFTER DELETE ON judgments BEGIN
+            INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {table}_au AFTER UPDATE OF {cols} ON judgments BEGIN
+            INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new_values});
+        END
+    """)
+    conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    conn.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+
+
+def build(conn: sqlite3.Connection, full_text: bool = True) -> list:
+    built = []
+    for table, columns in TABLES.items():
+        if table == "judgments_text_trigram" and not full_text:
+            continue
+        create_table(conn, table, columns)
+        conn.commit()
+        built.append(table)
+    return built
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build trigram FTS5 indexes over judgments")
+    parser.add_argument("--skip-full-text", action="store_true", help="Index title / citation only")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("JUDGMENT TRIGRAM INDEX")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        t0 = time.perf_counter()
+        built = build(conn, full_text=not args.skip_full_text)
+    except sqlite3.OperationalError as e:
+        print(f"✗ Trigram index failed (needs SQLite 3.34+): {e}")
+        return
+    finally:
+        conn.close()
+
+    for table in built:
+        print(f"✓ {table}: {', '.join(TABLES[table])}")
+    print(f"✓ Built in {time.perf_counter() - t0:.1f}s; sync triggers in place")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,6 @@ import os
 import sys
 import hashlib
 import logging
-import pickle
 import time
 import re
 import sqlite3
@@ -68,6 +67,13 @@ os.makedirs(DATA_DIR, exist_ok=True)
 DB_PATH = os.path.join(DATA_DIR, 'legal_db.sqlite')
 LOG_PATH = os.path.join(DATA_DIR, 'comprehensive_scraper.log')
 
+# backend/ on sys.path for shared storage helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+from utils.citations import index_citations
+from utils.courts import add_court_column, detect_court
+from utils.statute_refs import index_statute_refs
+from utils.embedding_codec import encode_embedding
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # All working sources
@@ -219,6 +225,7 @@ def init_database() -> sqlite3.Connection:
         except:
             pass
 
+    add_court_column(conn)
     conn.commit()
     logger.info(f"Database ready: {DB_PATH}")
     return conn
@@ -337,7 +344,7 @@ def generate_embedding(text: str) -> Optional[bytes]:
             model="text-embedding-3-small"
         )
 
-        return pickle.dumps(response.data[0].embedding)
+        return encode_embedding(response.data[0].embedding)
     except Exception as e:
         logger.debug(f"Embedding failed: {e}")
         return None
@@ -483,8 +490,8 @@ def scrape_lhc_direct(conn: sqlite3.Connection) -> Tuple[int, int, int]:
                 cur.execute('''
                             INSERT INTO judgments
                             (title, citation, judgment_date, pdf_url, pdf_hash, full_text, summary, embedding,
-                             created_at, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                             created_at, updated_at, court)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                             ''', (
                                 f"LHC Judgment {year} - {num}",
                                 citation,
@@ -494,9 +501,12 @@ def scrape_lhc_direct(conn: sqlite3.Connection) -> Tuple[int, int, int]:
                                 full_text,
                                 summary,
                                 embedding,
-                                now, now
+                                now, now,
+                                detect_court(url, citation)
                             ))
 
+                index_citations(conn, cur.lastrowid, citation)
+                index_statute_refs(conn, cur.lastrowid, full_text)
                 conn.commit()
                 added += 1
                 logger.info(f"    Added: {year}LHC{num}")
@@ -614,8 +624,8 @@ def scrape_source(conn: sqlite3.Connection, browser: webdriver.Chrome,
             cur.execute('''
                         INSERT INTO judgments
                         (title, citation, judgment_date, pdf_url, pdf_hash, full_text, summary, embedding, created_at,
-                         updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                         updated_at, court)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                         ''', (
                             pdf_info['title'],
                             citation,
@@ -625,9 +635,12 @@ def scrape_source(conn: sqlite3.Connection, browser: webdriver.Chrome,
                             full_text,
                             summary,
                             embedding,
-                            now, now
+                            now, now,
+                            detect_court(pdf_info['url'], citation)
                         ))
 
+            index_citations(conn, cur.lastrowid, citation)
+            index_statute_refs(conn, cur.lastrowid, full_text)
             conn.commit()
             added += 1
 
@@ -0,0 +1,54 @@
+"""
+Embedding Export
+Writes every judgment embedding to data/judgment_embeddings.npy (plus the
+.ids.npy, .int8.npy and .scale.npy sidecars) for memory-mapped semantic
+search. Set EMBEDDING_QUANTIZATION=int8 to scan the int8 copy.
+Run: python backend/scripts/export_embeddings.py
+
+All uvicorn/gunicorn workers map the same file, so the vectors sit in
+the OS page cache once instead of once per worker. Running workers pick
+up a new export automatically (within EMBEDDING_REFRESH_SECONDS). Re-run
+after ingestion; judgments added since the last export are searched from
+a small in-memory delta until then.
+
+Windows: a mapped file cannot be replaced while workers hold it open.
+Stop the API before re-exporting there.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+
+# backend/ on sys.path for shared search helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from services.embedding_store import EXPORT_PATH, export_embedding_matrix, export_ids_path
+
+
+def main():
+    print("=" * 50)
+    print("EMBEDDING EXPORT")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        t0 = time.perf_counter()
+        matrix = export_embedding_matrix(conn, EXPORT_PATH)
+    finally:
+        conn.close()
+
+    size_mb = os.path.getsize(EXPORT_PATH) / (1024 * 1024)
+    print(f"✓ Exported {matrix.size} embeddings (dim={matrix.dim}) in {time.perf_counter() - t0:.1f}s")
+    print(f"✓ {EXPORT_PATH} ({size_mb:.1f} MB)")
+    print(f"✓ {export_ids_path(EXPORT_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -104,16 +104,15 @@ def detect_order_from_text(text: str, title: str) -> Optional[int]:
     if not text:
         return None
 
-    combined = f"{title or ''} {text}"
-
-    # Pattern: "ORDER XXI" or "ORDER 21"
+    # Pattern: "ORDER XXI" or "ORDER 21" heading at the start of the title
+    # or text; "under Order XXI" in a rule's body is a cross-reference
     patterns = [
-        r"ORDER\s+([IVXLC]+)\b",  # Roman numerals
-        r"ORDER\s+(\d+)\b",  # Arabic numerals
+        r"\s*ORDER\s+([IVXLC]+)\b",  # Roman numerals
+        r"\s*ORDER\s+(\d+)\b",  # Arabic numerals
     ]
 
     for pattern in patterns:
-        match = re.search(pattern, combined, re.IGNORECASE)
+        match = re.match(pattern, title or "", re.IGNORECASE) or re.match(pattern, text, re.IGNORECASE)
         if match:
             val = match.group(1).upper()
             if val in ROMAN_TO_INT:
@@ -14,7 +14,6 @@ import os
 import sys
 import hashlib
 import logging
-import pickle
 import time
 import re
 import sqlite3
@@ -64,6 +63,13 @@ os.makedirs(DATA_DIR, exist_ok=True)
 DB_PATH = os.path.join(DATA_DIR, 'legal_db.sqlite')
 LOG_PATH = os.path.join(DATA_DIR, 'lhc_scraper.log')
 
+# backend/ on sys.path for shared storage helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+from utils.citations import index_citations
+from utils.courts import add_court_column, detect_court
+from utils.statute_refs import index_statute_refs
+from utils.embedding_codec import encode_embedding
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # LHC Sources from sitemap
@@ -173,6 +179,7 @@ def init_database() -> sqlite3.Connection:
                 )
                 ''')
 
+    add_court_column(conn)
     conn.commit()
     logger.info(f"Database ready: {DB_PATH}")
     return conn
@@ -283,7 +290,7 @@ def generate_embedding(text: str) -> Optional[bytes]:
             model="text-embedding-3-small"
         )
 
-        return pickle.dumps(response.data[0].embedding)
+        return encode_embedding(response.data[0].embedding)
     except Exception as e:
         logger.debug(f"Embedding failed: {e}")
         return None
@@ -374,8 +381,9 @@ def scrape_lhc_page(browser: webdriver.Chrome, source: Dict, conn: sqlite3.Conne
                 now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 cur.execute('''
                             INSERT INTO judgments
-                            (title, citation, pdf_url, pdf_hash, full_text, summary, embedding, created_at, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            (title, citation, pdf_url, pdf_hash, full_text, summary, embedding, created_at, updated_at,
+                             court)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                             ''', (
                                 pdf_info['title'][:200],
                                 citation,
@@ -384,9 +392,12 @@ def scrape_lhc_page(browser: webdriver.Chrome, source: Dict, conn: sqlite3.Conne
                                 full_text,
                                 summary,
                                 embedding,
-                                now, now
+                                now, now,
+                                detect_court(pdf_info['url'], citation)
                             ))
 
+                index_citations(conn, cur.lastrowid, citation)
+                index_statute_refs(conn, cur.lastrowid, full_text)
                 conn.commit()
                 added += 1
                 logger.info(f"      Added!")
@@ -466,8 +477,9 @@ def scrape_lhc_direct(conn: sqlite3.Connection) -> tuple:
                 now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 cur.execute('''
                             INSERT INTO judgments
-                            (title, citation, pdf_url, pdf_hash, full_text, summary, embedding, created_at, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            (title, citation, pdf_url, pdf_hash, full_text, summary, embedding, created_at, updated_at,
+                             court)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                             ''', (
                                 f"LHC Judgment {year} - {num}",
                                 citation,
@@ -476,9 +488,12 @@ def scrape_lhc_direct(conn: sqlite3.Connection) -> tuple:
                                 full_text,
                                 summary,
                                 embedding,
-                                now, now
+                                now, now,
+                                detect_court(url, citation)
                             ))
 
+                index_citations(conn, cur.lastrowid, citation)
+                index_statute_refs(conn, cur.lastrowid, full_text)
                 conn.commit()
                 added += 1
                 found_in_year += 1
@@ -0,0 +1,95 @@
+"""
+Embedding Storage Migration
+Rewrites legacy pickled judgments.embedding rows into the binary
+float32 format from utils/embedding_codec.py.
+Run: python backend/scripts/migrate_embeddings.py
+
+Safe to re-run: rows already in the binary format are skipped.
+Run VACUUM afterwards to hand the freed pages back to the filesystem.
+"""
+
+import os
+import sqlite3
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "..", "data", "legal_db.sqlite")
+BATCH_SIZE = 500
+
+# backend/ on sys.path for shared storage helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+from utils.embedding_codec import decode_embedding, encode_embedding, is_binary_embedding
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    # Updates run while the SELECT is still stepping; a row seen twice is
+    # already binary on the second visit and is simply skipped.
+    read_cur = conn.cursor()
+    write_cur = conn.cursor()
+
+    read_cur.execute("SELECT id, embedding FROM judgments WHERE embedding IS NOT NULL ORDER BY id")
+
+    converted = skipped = failed = 0
+    bytes_before = bytes_after = 0
+    updates = []
+
+    for judgment_id, blob in read_cur:
+        if is_binary_embedding(blob):
+            skipped += 1
+            continue
+
+        try:
+            new_blob = encode_embedding(decode_embedding(blob))
+        except Exception as e:
+            print(f"  ✗ judgment {judgment_id}: {e}")
+            failed += 1
+            continue
+
+        bytes_before += len(blob)
+        bytes_after += len(new_blob)
+        updates.append((new_blob, judgment_id))
+
+        if len(updates) >= BATCH_SIZE:
+            write_cur.executemany("UPDATE judgments SET embedding = ? WHERE id = ?", updates)
+            converted += len(updates)
+            updates = []
+            print(f"  … {converted} rows converted")
+
+    if updates:
+        write_cur.executemany("UPDATE judgments SET embedding = ? WHERE id = ?", updates)
+        converted += len(updates)
+
+    conn.commit()
+
+    print(f"\n✓ Converted: {converted}")
+    print(f"✓ Already binary: {skipped}")
+    if failed:
+        print(f"⚠ Failed to decode: {failed}")
+    if converted:
+        print(f"✓ Vector bytes: {bytes_before:,} → {bytes_after:,} "
+              f"({100 * bytes_after / max(bytes_before, 1):.0f}%)")
+
+
+def main():
+    print("=" * 50)
+    print("EMBEDDING STORAGE MIGRATION")
+    print("=" * 50)
+
+    if not os.path.exists(DB_PATH):
+        print(f"✗ Database not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        # Persisted in the file: the API's read-only pooled connections
+        # (utils/db_pool.py) then read alongside writers without blocking.
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        print(f"✓ Journal mode: {mode}")
+
+        migrate(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,6 @@ import os
 import sys
 import hashlib
 import logging
-import pickle
 import time
 import re
 import sqlite3
@@ -68,6 +67,13 @@ os.makedirs(DATA_DIR, exist_ok=True)
 DB_PATH = os.path.join(DATA_DIR, 'legal_db.sqlite')
 LOG_PATH = os.path.join(DATA_DIR, 'multi_court_scraper.log')
 
+# backend/ on sys.path for shared storage helpers
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+from utils.citations import index_citations
+from utils.courts import add_court_column, detect_court
+from utils.statute_refs import index_statute_refs
+from utils.embedding_codec import encode_embedding
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # Court configurations
@@ -227,6 +233,7 @@ def init_database() -> sqlite3.Connection:
         except Exception as e:
             logger.warning(f"FTS5 setup skipped: {e}")
 
+    add_court_column(conn)
     conn.commit()
     logger.info(f"Database ready: {DB_PATH}")
     return conn
@@ -364,7 +371,7 @@ def generate_embedding(text: str) -> Optional[bytes]:
         )
 
         vector = response.data[0].embedding
-        return pickle.dumps(vector)
+        return encode_embedding(vector)
 
     except Exception as e:
         logger.debug(f"Embedding generation failed: {e}")
@@ -571,8 +578,8 @@ def scrape_court(conn: sqlite3.Connection, browser: webdriver.Chrome, court_id:
             cur.execute('''
                         INSERT INTO judgments
                         (title, citation, judgment_date, pdf_url, pdf_hash, full_text, summary,
-                         embedding, created_at, updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                         embedding, created_at, updated_at, court)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                         ''', (
                             pdf_info['title'],
                             citation,
@@ -583,9 +590,12 @@ def scrape_court(conn: sqlite3.Connection, browser: webdriver.Chrome, court_id:
                             summary,
                             embedding,
                             now,
-                            now
+                            now,
+                            detect_court(pdf_info['url'], citation)
                         ))
 
+            index_citations(conn, cur.lastrowid, citation)
+            index_statute_refs(conn, cur.lastrowid, full_text)
             conn.commit()
             added += 1
 
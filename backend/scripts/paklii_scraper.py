@@ -10,11 +10,9 @@ import os
 import sys
 import hashlib
 import logging
-import pickle
 import time
 import re
 import sqlite3
-import numpy as np
 from typing import List, Dict, Optional
 from urllib.parse import urljoin
 
@@ -31,6 +29,10 @@ DATA_DIR = os.path.join(current_dir, "../data")
 DB_PATH = os.path.join(DATA_DIR, "legal_db.sqlite")
 ENV_PATH = os.path.join(current_dir, "../.env")
 
+# backend/ on sys.path for shared storage helpers
+sys.path.insert(0, os.path.join(current_dir, ".."))
+from utils.embedding_codec import encode_embedding
+
 load_dotenv(ENV_PATH)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
@@ -275,7 +277,7 @@ def generate_embeddings_batch(texts: List[str]) -> List[Optional[bytes]]:
     try:
         clean = [t[:30000] for t in texts]
         res = openai_client.embeddings.create(input=clean, model="text-embedding-3-small")
-        return [pickle.dumps(np.array(d.embedding, dtype=np.float32)) for d in res.data]
+        return [encode_embedding(d.embedding) for d in res.data]
     except Exception as e:
         logger.error(f"Embedding error: {e}")
         return [None] * len(texts)
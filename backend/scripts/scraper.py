@@ -10,11 +10,9 @@ import sys
 import time
 import hashlib
 import logging
-import pickle
 import re
 import io
 import sqlite3
-import numpy as np
 from typing import List, Dict, Optional
 from urllib.parse import urljoin
 
@@ -42,6 +40,13 @@ DATA_DIR = os.path.join(current_dir, "../data")
 DB_PATH = os.path.join(DATA_DIR, "legal_db.sqlite")
 ENV_PATH = os.path.join(current_dir, "../.env")
 
+# backend/ on sys.path for shared storage helpers
+sys.path.insert(0, os.path.join(current_dir, ".."))
+from utils.citations import index_citations
+from utils.courts import add_court_column, detect_court
+from utils.statute_refs import index_statute_refs
+from utils.embedding_codec import encode_embedding
+
 # Environment
 load_dotenv(ENV_PATH)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -119,6 +124,7 @@ def init_database():
 
     cur.execute("CREATE INDEX IF NOT EXISTS idx_pdf_hash ON judgments(pdf_hash);")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_pdf_url ON judgments(pdf_url);")
+    add_court_column(conn)
 
     conn.commit()
     return conn
@@ -263,7 +269,7 @@ def generate_embeddings_batch(texts: List[str]) -> List[Optional[bytes]]:
     try:
         clean = [t[:30000] for t in texts]
         res = openai_client.embeddings.create(input=clean, model="text-embedding-3-small")
-        return [pickle.dumps(np.array(d.embedding, dtype=np.float32)) for d in res.data]
+        return [encode_embedding(d.embedding) for d in res.data]
     except Exception as e:
         logger.error(f"Embedding error: {e}")
         return [None] * len(texts)
@@ -353,10 +359,13 @@ def save_batch(conn, batch: List[Dict]):
     for item, emb in zip(batch, embeddings):
         try:
             cur.execute("""
-                        INSERT INTO judgments (title, citation, pdf_url, pdf_hash, full_text, summary, embedding)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        INSERT INTO judgments (title, citation, pdf_url, pdf_hash, full_text, summary, embedding, court)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                         """, (item['title'], item['citation'], item['pdf_url'], item['pdf_hash'],
-                              item['full_text'], item['summary'], emb))
+                              item['full_text'], item['summary'], emb,
+                              detect_court(item['pdf_url'], item['citation'])))
+            index_citations(conn, cur.lastrowid, item['citation'])
+            index_statute_refs(conn, cur.lastrowid, item['full_text'])
         except:
             pass
 
@@ -6,7 +6,6 @@ Run this after scraping to try different search methods
 import os
 import sys
 import sqlite3
-import pickle
 import numpy as np
 from typing import List, Dict
 from openai import OpenAI
@@ -18,6 +17,10 @@ DATA_DIR = os.path.join(current_dir, "../data")
 DB_PATH = os.path.join(DATA_DIR, "legal_db.sqlite")
 ENV_PATH = os.path.join(current_dir, "../.env")
 
+# backend/ on sys.path for shared storage helpers
+sys.path.insert(0, os.path.join(current_dir, ".."))
+from utils.embedding_codec import decode_embedding
+
 load_dotenv(ENV_PATH)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
@@ -79,7 +82,7 @@ def search_semantic(query: str, limit: int = 5) -> List[Dict]:
         similarities = []
         for row in cur.fetchall():
             doc_id, title, citation, summary, emb_blob = row
-            doc_vector = pickle.loads(emb_blob)
+            doc_vector = decode_embedding(emb_blob)
 
             # Cosine similarity
             dot_product = np.dot(query_vector, doc_vector)
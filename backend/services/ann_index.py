@@ -0,0 +1,397 @@
+# backend/services/ann_index.py
+# Inverted-file (IVF) approximate nearest-neighbour index for judgment embeddings
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from services.embedding_backends import EMBEDDING_BACKEND
+from services.embedding_store import (
+    EmbeddingMatrix,
+    get_embedding_matrix,
+    id_mask,
+    merge_results,
+    save_array_atomic,
+    scan_rows,
+    top_k_indices,
+)
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Configuration (env overridable)
+# -----------------------------
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+_INDEX_NAME = "judgments_ivf.npy" if EMBEDDING_BACKEND == "openai" else f"judgments_ivf_{EMBEDDING_BACKEND}.npy"
+INDEX_PATH = os.getenv("ANN_INDEX_PATH", os.path.join(_DATA_DIR, _INDEX_NAME))
+
+# Lists scanned per query when the request does not say otherwise.
+DEFAULT_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+
+# How often (seconds) the loaded index checks for a rebuilt file.
+REFRESH_INTERVAL_SECONDS = float(os.getenv("ANN_REFRESH_SECONDS", "300"))
+
+_ASSIGN_CHUNK = 65536
+
+
+# -----------------------------
+# k-means (spherical, on unit vectors)
+# -----------------------------
+def _assign(vectors: "np.ndarray", centroids: "np.ndarray") -> "np.ndarray":
+    """Index of the most similar centroid for every row, computed in chunks."""
+    out = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], _ASSIGN_CHUNK):
+        block = vectors[start:start + _ASSIGN_CHUNK]
+        out[start:start + block.shape[0]] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def _normalize_rows(x: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def train_kmeans(vectors: "np.ndarray", k: int, iters: int = 20, seed: int = 0) -> "np.ndarray":
+    """
+    Spherical k-means: centroids are re-normalised every iteration so the
+    coarse quantizer ranks lists by cosine similarity, like the documents.
+    """
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    centroids = vectors[rng.choice(n, size=k, replace=False)].copy()
+
+    for _ in range(iters):
+        assign = _assign(vectors, centroids)
+        counts = np.bincount(assign, minlength=k)
+
+        order = np.argsort(assign, kind="stable")
+        nonempty = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+        sums = np.add.reduceat(vectors[order], starts, axis=0)
+
+        new_centroids = centroids.copy()
+        new_centroids[nonempty] = sums
+
+        # Re-seed empty lists from random points so k stays meaningful
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            new_centroids[empty] = vectors[rng.choice(n, size=empty.size, replace=False)]
+
+        centroids = _normalize_rows(new_centroids).astype(np.float32)
+
+    return centroids
+
+
+# -----------------------------
+# Index
+# -----------------------------
+class IVFIndex:
+    """
+    IVF index over L2-normalised vectors. Only the coarse quantizer and the
+    list order (judgment ids grouped by list) are stored; the vectors are read
+    from the embedding store the index is attached to, so a memory-mapped
+    (and optionally int8-quantized) export stays shared between workers.
+    """
+
+    def __init__(
+        self,
+        centroids: "np.ndarray",
+        offsets: "np.ndarray",
+        ids: "np.ndarray",
+        base=None,
+    ) -> None:
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.base = base
+        if base is not None:
+            self._bind(base)
+
+    @property
+    def size(self) -> int:
+        return int(self.ids.shape[0])
+
+    @property
+    def nlist(self) -> int:
+        return int(self.centroids.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.centroids.shape[1])
+
+    def attach(self, base) -> "IVFIndex":
+        """A copy of this index that searches the vectors of base (EmbeddingMatrix or QuantizedMatrix)."""
+        return type(self)(self.centroids, self.offsets, self.ids, base)
+
+    def _bind(self, base) -> None:
+        """
+        Map the indexed ids onto rows of base (whose ids are sorted). Indexed
+        ids missing from base are dropped; rows of base that the index does
+        not know about are kept in extra_rows and always scanned exactly.
+        """
+        if base.dim and base.dim != self.dim:
+            raise ValueError(f"Index dim {self.dim} does not match store dim {base.dim}")
+
+        ids = np.asarray(self.ids)
+        if base.size:
+            pos = np.minimum(np.searchsorted(base.ids, ids), base.size - 1)
+            found = base.ids[pos] == ids
+        else:
+            pos = np.zeros(ids.shape[0], dtype=np.int64)
+            found = np.zeros(ids.shape[0], dtype=bool)
+        lists = np.repeat(np.arange(self.nlist), np.diff(self.offsets))
+
+        self.rows = pos[found]
+        self.row_ids = ids[found]
+        self.row_offsets = np.concatenate(([0], np.cumsum(np.bincount(lists[found], minlength=self.nlist))))
+
+        indexed = np.zeros(base.size, dtype=bool)
+        indexed[self.rows] = True
+        self.extra_rows = np.flatnonzero(~indexed)
+
+    @classmethod
+    def build(
+        cls,
+        matrix: EmbeddingMatrix,
+        nlist: Optional[int] = None,
+        iters: int = 15,
+        train_size: Optional[int] = None,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Train the coarse quantizer on a sample of the matrix and bucket every
+        vector into its nearest list. nlist defaults to ~4·sqrt(N); the
+        quantizer trains on at most 64 points per list. The returned index
+        is attached to matrix.
+        """
+        n = matrix.size
+        if n == 0:
+            raise ValueError("Cannot build an index from an empty embedding matrix")
+
+        if nlist is None:
+            nlist = max(1, int(4 * np.sqrt(n)))
+        nlist = min(nlist, n)
+
+        if train_size is None:
+            train_size = min(n, 64 * nlist)
+        rng = np.random.default_rng(seed)
+        sample = matrix.vectors if train_size >= n else matrix.vectors[np.sort(rng.choice(n, size=train_size, replace=False))]
+
+        centroids = train_kmeans(np.asarray(sample), nlist, iters=iters, seed=seed)
+        assign = _assign(matrix.vectors, centroids)
+
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=nlist)
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+        return cls(centroids=centroids, offsets=offsets, ids=matrix.ids[order].copy(), base=matrix)
+
+    def _score_rows(self, rows: "np.ndarray", q: "np.ndarray", k: int) -> List[Tuple[int, float]]:
+        """
+        Exact top-k over the given rows of base. With an int8 base the codes
+        pick the re-rank candidates first, so only those float32 rows are read.
+        """
+        if rows.shape[0] == 0:
+            return []
+        base = self.base
+        rows = np.sort(rows)
+        if getattr(base, "codes", None) is not None:
+            coarse = base.coarse_scores(q, rows)
+            rows = np.sort(rows[top_k_indices(coarse, max(k, base.rerank))])
+        scores = scan_rows(base.vectors, rows, q)
+        return [(int(base.ids[rows[i]]), float(scores[i])) for i in top_k_indices(scores, k)]
+
+    def search(
+        self,
+        query: List[float],
+        k: int,
+        nprobe: Optional[int] = None,
+        allowed: Optional["np.ndarray"] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Return approximately the top-k (judgment_id, cosine_score) pairs by
+        scanning the nprobe lists whose centroids are closest to the query,
+        plus any rows of the store that were added after the build.
+        If allowed (sorted judgment ids) is given, only those rows are scored;
+        when it is smaller than the probed lists they are all scanned exactly.
+        """
+        if self.base is None:
+            raise ValueError("IVFIndex must be attached to an embedding store before searching")
+        if self.base.size == 0 or k <= 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32).ravel()
+        if q.shape[0] != self.dim:
+            logger.warning("Query embedding dim %d does not match index dim %d", q.shape[0], self.dim)
+            return []
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0:
+            return []
+        q = q / norm
+
+        nprobe = min(max(1, nprobe or DEFAULT_NPROBE), self.nlist)
+
+        extra = self.extra_rows
+        mask = None
+        if allowed is not None:
+            mask = id_mask(self.row_ids, allowed)
+            extra = extra[id_mask(self.base.ids[extra], allowed)]
+            eligible = np.flatnonzero(mask)
+            if eligible.shape[0] <= self.rows.shape[0] * nprobe / self.nlist:
+                return self._score_rows(np.concatenate((self.rows[eligible], extra)), q, k)
+
+        centroid_scores = self.centroids @ q
+        if nprobe < self.nlist:
+            probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            probe = np.arange(self.nlist)
+
+        parts = [extra]
+        for lst in probe:
+            start, end = self.row_offsets[lst], self.row_offsets[lst + 1]
+            if start == end:
+                continue
+            if mask is None:
+                parts.append(self.rows[start:end])
+            else:
+                parts.append(self.rows[start:end][mask[start:end]])
+
+        return self._score_rows(np.concatenate(parts), q, k)
+
+    def save(self, path: str) -> None:
+        """
+        Write the quantizer and list order as .npy files next to the DB.
+        Sidecars are swapped in first and the id file (path) last; each file
+        is replaced atomically with os.replace.
+        """
+        centroids_path, offsets_path = index_sidecar_paths(path)
+        save_array_atomic(centroids_path, np.asarray(self.centroids))
+        save_array_atomic(offsets_path, np.asarray(self.offsets, dtype=np.int64))
+        save_array_atomic(path, np.asarray(self.ids, dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        """Open a saved index; the id list is memory-mapped, not copied."""
+        centroids_path, offsets_path = index_sidecar_paths(path)
+        ids_mtime = os.stat(path).st_mtime_ns
+        if os.stat(centroids_path).st_mtime_ns > ids_mtime or os.stat(offsets_path).st_mtime_ns > ids_mtime:
+            raise ValueError("index rebuild in progress")
+        return cls(
+            centroids=np.load(centroids_path),
+            offsets=np.load(offsets_path),
+            ids=np.load(path, mmap_mode="r"),
+        )
+
+
+def index_sidecar_paths(path: str) -> Tuple[str, str]:
+    """Centroid and list-offset sidecars: foo.npy -> foo.centroids.npy, foo.offsets.npy"""
+    root, _ = os.path.splitext(path)
+    return f"{root}.centroids.npy", f"{root}.offsets.npy"
+
+
+# -----------------------------
+# Process-wide cache
+# -----------------------------
+class _LoadedIndex:
+    """
+    The on-disk index attached to the process's embedding store. Judgments
+    the store holds outside its main matrix (its delta) are scanned exactly.
+    """
+
+    def __init__(self, index: IVFIndex, stamp: Tuple[int, ...]) -> None:
+        self.index = index
+        self.stamp = stamp
+        self.attached: Optional[IVFIndex] = None
+        self.store = None
+        # Store the index could not be attached to; not retried until it changes
+        self.failed_base: Optional[weakref.ref] = None
+
+    def search(
+        self,
+        query: List[float],
+        k: int,
+        nprobe: Optional[int] = None,
+        allowed: Optional["np.ndarray"] = None,
+    ) -> List[Tuple[int, float]]:
+        results = self.attached.search(query, k, nprobe, allowed)
+        delta = getattr(self.store, "delta", None)
+        if delta is not None and delta.size:
+            results = merge_results(results, delta.search(query, k, allowed), k)
+        return results
+
+
+_loaded: Optional[_LoadedIndex] = None
+_failed_stamp: Optional[Tuple[int, ...]] = None
+_checked_at: Optional[float] = None
+_lock = threading.Lock()
+
+
+def _index_stamp() -> Optional[Tuple[int, ...]]:
+    """mtimes of the id file and its sidecars, or None if any is missing."""
+    try:
+        return tuple(os.stat(path).st_mtime_ns for path in (INDEX_PATH, *index_sidecar_paths(INDEX_PATH)))
+    except OSError:
+        return None
+
+
+def get_ann_index(conn: sqlite3.Connection) -> Optional[_LoadedIndex]:
+    """
+    Return the persisted IVF index, or None if it has not been built or
+    cannot be used. At most every REFRESH_INTERVAL_SECONDS the files are
+    checked and re-read if they were replaced; a load that failed is only
+    retried once the files change. The index is re-attached whenever the
+    embedding store is reloaded, so judgments embedded after the build are
+    still searched.
+    """
+    global _loaded, _failed_stamp, _checked_at
+
+    store = get_embedding_matrix(conn)
+    base = getattr(store, "matrix", store)
+
+    with _lock:
+        now = time.monotonic()
+        if _checked_at is None or now - _checked_at >= REFRESH_INTERVAL_SECONDS:
+            _checked_at = now
+            stamp = _index_stamp()
+            if stamp is None:
+                _loaded = None
+            elif (_loaded is None or _loaded.stamp != stamp) and stamp != _failed_stamp:
+                try:
+                    _loaded = _LoadedIndex(IVFIndex.load(INDEX_PATH), stamp)
+                    _failed_stamp = None
+                    logger.info("Loaded IVF index: %d vectors in %d lists", _loaded.index.size, _loaded.index.nlist)
+                except Exception as e:
+                    logger.error("Failed to load IVF index %s: %s", INDEX_PATH, e)
+                    _loaded = None
+                    _failed_stamp = stamp
+
+        if _loaded is None:
+            return None
+
+        if _loaded.attached is None or _loaded.attached.base is not base:
+            if _loaded.failed_base is not None and _loaded.failed_base() is base:
+                return None
+            try:
+                _loaded.attached = _loaded.index.attach(base)
+            except ValueError as e:
+                logger.error("Cannot use IVF index %s: %s", INDEX_PATH, e)
+                _loaded.attached = None
+                _loaded.failed_base = weakref.ref(base)
+                return None
+        _loaded.store = store
+
+        return _loaded
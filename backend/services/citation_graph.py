@@ -0,0 +1,257 @@
+# backend/services/citation_graph.py
+# Judgment citation graph: who cites whom, cited-by counts, authority score
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from utils.citations import Citation, create_citation_table, find_citations
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Configuration (env overridable)
+# -----------------------------
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-10
+# Ranking boost: score * (1 + AUTHORITY_WEIGHT * log1p(authority)); 0 disables
+AUTHORITY_WEIGHT = float(os.getenv("AUTHORITY_WEIGHT", "0.1"))
+REFRESH_INTERVAL_SECONDS = float(os.getenv("AUTHORITY_REFRESH_SECONDS", "300"))
+BATCH_SIZE = 1000
+
+SCHEMA = (
+    # One row per law-report citation found in a judgment's full_text;
+    # cited_id is the judgment it resolves to (NULL if not in the DB)
+    """
+    CREATE TABLE IF NOT EXISTS judgment_citation_edges (
+        citing_id INTEGER NOT NULL,
+        reporter TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        court TEXT,
+        page INTEGER NOT NULL,
+        cited_id INTEGER,
+        PRIMARY KEY (citing_id, reporter, year, page)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_citation_edges_cited ON judgment_citation_edges(cited_id, citing_id)",
+    """
+    CREATE TABLE IF NOT EXISTS judgment_authority (
+        judgment_id INTEGER PRIMARY KEY,
+        cited_by INTEGER NOT NULL,
+        authority REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS judgment_citation_edges_ad AFTER DELETE ON judgments BEGIN
+        DELETE FROM judgment_citation_edges WHERE citing_id = OLD.id;
+        UPDATE judgment_citation_edges SET cited_id = NULL WHERE cited_id = OLD.id;
+        DELETE FROM judgment_authority WHERE judgment_id = OLD.id;
+    END
+    """,
+)
+
+
+# -----------------------------
+# Build (scripts/build_citation_graph.py)
+# -----------------------------
+def create_tables(conn: sqlite3.Connection) -> None:
+    create_citation_table(conn)
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+def extract_edges(conn: sqlite3.Connection) -> int:
+    """Re-extract every judgment's outgoing citations from full_text. Returns the edge count."""
+    conn.execute("DELETE FROM judgment_citation_edges")
+    total = 0
+    rows = []
+    for citing_id, full_text in conn.execute("SELECT id, full_text FROM judgments WHERE full_text IS NOT NULL"):
+        for c in find_citations(full_text):
+            rows.append((citing_id, c.reporter, c.year, c.court, c.page))
+        if len(rows) >= BATCH_SIZE:
+            conn.executemany("INSERT OR IGNORE INTO judgment_citation_edges VALUES (?, ?, ?, ?, ?, NULL)", rows)
+            total += len(rows)
+            rows.clear()
+    if rows:
+        conn.executemany("INSERT OR IGNORE INTO judgment_citation_edges VALUES (?, ?, ?, ?, ?, NULL)", rows)
+        total += len(rows)
+    return total
+
+
+def resolve_edges(conn: sqlite3.Connection) -> int:
+    """
+    Point edges at the judgment whose own citation matches (judgment_citations,
+    see scripts/build_citation_index.py). A judgment quoting its own citation
+    is not an edge. Returns the number resolved.
+    """
+    conn.execute("""
+        UPDATE judgment_citation_edges AS e SET cited_id = (
+            SELECT MIN(c.judgment_id) FROM judgment_citations AS c
+            WHERE c.reporter = e.reporter AND c.year = e.year AND c.page = e.page
+              AND (c.court = e.court OR c.court IS NULL OR e.court IS NULL)
+        )
+    """)
+    conn.execute("DELETE FROM judgment_citation_edges WHERE cited_id = citing_id")
+    return conn.execute("SELECT COUNT(*) FROM judgment_citation_edges WHERE cited_id IS NOT NULL").fetchone()[0]
+
+
+def pagerank(n: int, src: "np.ndarray", dst: "np.ndarray") -> Tuple["np.ndarray", int]:
+    """
+    PageRank over n nodes with edges src -> dst (node indices), by power
+    iteration. Dangling nodes spread their rank evenly. Returns the scores
+    (summing to 1) and the iterations used.
+    """
+    out_degree = np.bincount(src, minlength=n).astype(np.float64)
+    dangling = out_degree == 0
+    rank = np.full(n, 1.0 / n)
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        share = np.divide(rank, out_degree, out=np.zeros(n), where=~dangling)
+        new = np.bincount(dst, weights=share[src], minlength=n)
+        new = DAMPING * (new + rank[dangling].sum() / n) + (1.0 - DAMPING) / n
+        delta = np.abs(new - rank).sum()
+        rank = new
+        if delta < TOLERANCE:
+            break
+    return rank, iteration
+
+
+def build_authority(conn: sqlite3.Connection) -> Dict[str, float]:
+    """
+    Rewrite judgment_authority from the resolved edges: cited_by (distinct
+    citing judgments) and authority = PageRank scaled so the average
+    judgment scores 1.0.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required to compute authority scores")
+    ids = np.fromiter((row[0] for row in conn.execute("SELECT id FROM judgments ORDER BY id")), dtype=np.int64)
+    edges = np.array(
+        conn.execute(
+            "SELECT DISTINCT citing_id, cited_id FROM judgment_citation_edges WHERE cited_id IS NOT NULL"
+        ).fetchall(),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    n = len(ids)
+    conn.execute("DELETE FROM judgment_authority")
+    if n == 0:
+        return {"judgments": 0, "edges": 0, "iterations": 0}
+
+    src = np.searchsorted(ids, edges[:, 0])
+    dst = np.searchsorted(ids, edges[:, 1])
+    rank, iterations = pagerank(n, src, dst)
+    cited_by = np.bincount(dst, minlength=n)
+    conn.executemany(
+        "INSERT INTO judgment_authority VALUES (?, ?, ?)",
+        zip(ids.tolist(), cited_by.tolist(), (rank * n).tolist()),
+    )
+    return {"judgments": n, "edges": len(edges), "iterations": iterations}
+
+
+# -----------------------------
+# Queries (API)
+# -----------------------------
+_authority: Optional[Dict[int, float]] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_authority(conn: sqlite3.Connection) -> Optional[Dict[int, float]]:
+    """
+    judgment id -> authority for this process, or None before the graph is
+    built or without numpy (the boost is then skipped). Reloaded at most
+    every REFRESH_INTERVAL_SECONDS.
+    """
+    global _authority, _checked_at
+
+    if not NUMPY_AVAILABLE:
+        return None
+
+    with _lock:
+        now = time.monotonic()
+        if now - _checked_at < REFRESH_INTERVAL_SECONDS:
+            return _authority
+        _checked_at = now
+        try:
+            rows = conn.execute("SELECT judgment_id, authority FROM judgment_authority").fetchall()
+        except sqlite3.OperationalError:
+            _authority = None
+        else:
+            _authority = {row[0]: row[1] for row in rows} or None
+            if _authority:
+                logger.info("Loaded authority scores for %d judgments", len(_authority))
+        return _authority
+
+
+def boost_by_authority(
+    conn: sqlite3.Connection,
+    scored: List[Tuple[int, float]],
+    limit: int,
+) -> List[Tuple[int, float]]:
+    """
+    Re-order (judgment_id, score) pairs, higher is better, by
+    score * (1 + AUTHORITY_WEIGHT * log1p(authority)) and keep `limit`.
+    Unchanged when the graph is not built or the weight is 0.
+    """
+    authority = get_authority(conn) if AUTHORITY_WEIGHT > 0 else None
+    if not authority:
+        return scored[:limit]
+    boosted = [
+        (judgment_id, score * (1.0 + AUTHORITY_WEIGHT * math.log1p(authority.get(judgment_id, 0.0))))
+        for judgment_id, score in scored
+    ]
+    boosted.sort(key=lambda item: item[1], reverse=True)
+    return boosted[:limit]
+
+
+def citing_judgments(conn: sqlite3.Connection, judgment_id: int, limit: int) -> List[int]:
+    """Ids of judgments citing `judgment_id`, most authoritative first."""
+    try:
+        rows = conn.execute("""
+            SELECT DISTINCT e.citing_id
+            FROM judgment_citation_edges AS e
+            LEFT JOIN judgment_authority AS a ON a.judgment_id = e.citing_id
+            WHERE e.cited_id = ?
+            ORDER BY a.authority DESC, e.citing_id DESC
+            LIMIT ?
+        """, (judgment_id, limit)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [row[0] for row in rows]
+
+
+def cited_judgments(conn: sqlite3.Connection, judgment_id: int) -> List[Tuple[str, Optional[int]]]:
+    """(citation, cited judgment id or None) for every citation in a judgment's text."""
+    try:
+        rows = conn.execute("""
+            SELECT reporter, year, court, page, cited_id
+            FROM judgment_citation_edges
+            WHERE citing_id = ?
+            ORDER BY cited_id IS NULL, year DESC, reporter, page
+        """, (judgment_id,)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [(str(Citation(*row[:4])), row[4]) for row in rows]
+
+
+def authority_stats(conn: sqlite3.Connection, judgment_id: int) -> Tuple[int, Optional[float]]:
+    """(cited_by, authority) for a judgment; (0, None) if the graph is not built."""
+    try:
+        row = conn.execute(
+            "SELECT cited_by, authority FROM judgment_authority WHERE judgment_id = ?", (judgment_id,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return 0, None
+    return (row[0], row[1]) if row else (0, None)
@@ -0,0 +1,159 @@
+# backend/services/embedding_backends.py
+# Pluggable embedding backends for semantic search: OpenAI (remote) or the
+# offline hashed TF-IDF + SVD model (services/local_embeddings.py)
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from openai import OpenAI
+
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from dotenv import load_dotenv
+
+from utils.db_pool import LEGAL_DB_PATH, connection
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Configuration (env overridable)
+# -----------------------------
+# "openai" (default) or "local". Query and document vectors must come from
+# the same backend, so this also selects the judgments column that is searched.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai").lower()
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+EMBEDDING_MODEL = os.getenv("QUERY_EMBEDDING_MODEL", "text-embedding-3-small")
+
+LOCAL_MODEL_NAME = os.getenv("LOCAL_EMBEDDING_MODEL", "default")
+LOCAL_MODEL_DB_PATH = os.getenv("LOCAL_EMBEDDING_DB_PATH", LEGAL_DB_PATH)
+
+# judgments column holding document vectors for each backend
+BACKEND_COLUMNS = {"openai": "embedding", "local": "local_embedding"}
+EMBEDDING_COLUMN = BACKEND_COLUMNS.get(EMBEDDING_BACKEND, "embedding")
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class EmbeddingBackend(ABC):
+    """Turns query texts into vectors comparable with EMBEDDING_COLUMN."""
+
+    name = ""
+    # Remote backends get the SQLite query cache and micro-batching
+    remote = False
+
+    @abstractmethod
+    def model_id(self) -> str:
+        """Cache namespace: changes whenever the vectors would."""
+
+    @abstractmethod
+    def unavailable_reason(self) -> Optional[str]:
+        """None when the backend can embed, otherwise a message for a 503."""
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List["np.ndarray"]:
+        """One vector per text. Raises on failure."""
+
+
+class OpenAIBackend(EmbeddingBackend):
+    name = "openai"
+    remote = True
+
+    def __init__(self) -> None:
+        self._client: Optional["OpenAI"] = None
+        self._lock = threading.Lock()
+
+    def _get_client(self) -> "OpenAI":
+        """One OpenAI client per process (it keeps its HTTP connection pool)."""
+        with self._lock:
+            if self._client is None:
+                self._client = OpenAI(api_key=OPENAI_API_KEY)
+            return self._client
+
+    def model_id(self) -> str:
+        return EMBEDDING_MODEL
+
+    def unavailable_reason(self) -> Optional[str]:
+        if not OPENAI_AVAILABLE:
+            return "Semantic search requires OpenAI library. Install with: pip install openai"
+        if not OPENAI_API_KEY:
+            return "Semantic search requires OpenAI API key. Set OPENAI_API_KEY in your .env file"
+        return None
+
+    def embed(self, texts: List[str]) -> List["np.ndarray"]:
+        response = self._get_client().embeddings.create(input=texts, model=EMBEDDING_MODEL)
+        vectors: List[Optional["np.ndarray"]] = [None] * len(texts)
+        for item in response.data:
+            vectors[item.index] = np.asarray(item.embedding, dtype=np.float32)
+        return vectors
+
+
+class LocalBackend(EmbeddingBackend):
+    """CPU-only encoder using the model stored in embedding_models."""
+
+    name = "local"
+
+    def __init__(self, db_path: str = LOCAL_MODEL_DB_PATH, model_name: str = LOCAL_MODEL_NAME) -> None:
+        self.db_path = db_path
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None and NUMPY_AVAILABLE and os.path.exists(self.db_path):
+                from services.local_embeddings import HashedLsaModel
+
+                with connection(self.db_path) as conn:
+                    self._model = HashedLsaModel.load(conn, self.model_name)
+                if self._model is not None:
+                    logger.info("Loaded local embedding model %s (dim=%d)", self._model.model_id, self._model.dim)
+            return self._model
+
+    def model_id(self) -> str:
+        model = self._get_model()
+        return model.model_id if model is not None else f"local:{self.model_name}"
+
+    def unavailable_reason(self) -> Optional[str]:
+        if not NUMPY_AVAILABLE:
+            return "Semantic search requires numpy. Install with: pip install numpy"
+        if self._get_model() is None:
+            return "Local embedding model not found. Run: python backend/scripts/build_local_embeddings.py"
+        return None
+
+    def embed(self, texts: List[str]) -> List["np.ndarray"]:
+        return list(self._get_model().encode(texts))
+
+
+_BACKENDS = {"openai": OpenAIBackend, "local": LocalBackend}
+_backend: Optional[EmbeddingBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> EmbeddingBackend:
+    """The configured backend (one instance per process)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if EMBEDDING_BACKEND not in _BACKENDS:
+                logger.warning("Unknown EMBEDDING_BACKEND %r, using openai", EMBEDDING_BACKEND)
+            _backend = _BACKENDS.get(EMBEDDING_BACKEND, OpenAIBackend)()
+        return _backend
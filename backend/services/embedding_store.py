@@ -0,0 +1,493 @@
+# backend/services/embedding_store.py
+# Judgment embedding matrix for semantic search (in-memory or memory-mapped)
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from services.embedding_backends import EMBEDDING_BACKEND, EMBEDDING_COLUMN
+from utils.embedding_codec import decode_embedding
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Configuration (env overridable)
+# -----------------------------
+# How often (seconds) a cached matrix checks the DB for newly ingested rows.
+REFRESH_INTERVAL_SECONDS = float(os.getenv("EMBEDDING_REFRESH_SECONDS", "300"))
+
+# Optional memory-mapped export written by scripts/export_embeddings.py
+# (one file per embedding backend, since their vectors are not comparable).
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+_EXPORT_NAME = "judgment_embeddings.npy" if EMBEDDING_BACKEND == "openai" else f"judgment_embeddings_{EMBEDDING_BACKEND}.npy"
+EXPORT_PATH = os.getenv("EMBEDDING_EXPORT_PATH", os.path.join(_DATA_DIR, _EXPORT_NAME))
+
+# "int8" scans a scalar-quantized copy of the export and re-ranks the best
+# RERANK_CANDIDATES rows with the float32 vectors; "none" scans float32.
+QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION", "none").lower()
+RERANK_CANDIDATES = int(os.getenv("EMBEDDING_RERANK_CANDIDATES", "300"))
+
+_SCAN_CHUNK = 256
+_GATHER_CHUNK = 4096
+_FETCH_CHUNK = 500
+
+
+# -----------------------------
+# Matrix
+# -----------------------------
+class EmbeddingMatrix:
+    """
+    Contiguous, L2-normalised float32 matrix of judgment embeddings with a
+    parallel id array. Cosine similarity for every document is then a single
+    matrix-vector product.
+    """
+
+    def __init__(self, ids: "np.ndarray", vectors: "np.ndarray", max_id: int = 0) -> None:
+        self.ids = ids
+        self.vectors = vectors
+        self.max_id = max_id
+        self.loaded_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return int(self.ids.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1]) if self.vectors.ndim == 2 else 0
+
+    def search(
+        self, query: List[float], k: int, allowed: Optional["np.ndarray"] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the top-k (judgment_id, cosine_score) pairs, best first.
+        If allowed (sorted judgment ids) is given, only those rows are scored.
+        """
+        if self.size == 0 or k <= 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32).ravel()
+        if q.shape[0] != self.dim:
+            logger.warning("Query embedding dim %d does not match store dim %d", q.shape[0], self.dim)
+            return []
+
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0:
+            return []
+        q = q / norm
+
+        if allowed is None:
+            scores = self.vectors @ q
+            top = top_k_indices(scores, k)
+            return [(int(self.ids[i]), float(scores[i])) for i in top]
+
+        rows = np.flatnonzero(id_mask(self.ids, allowed))
+        scores = scan_rows(self.vectors, rows, q)
+        top = top_k_indices(scores, k)
+        return [(int(self.ids[rows[i]]), float(scores[i])) for i in top]
+
+
+def top_k_indices(scores: "np.ndarray", k: int) -> "np.ndarray":
+    """Indices of the k highest scores, best first."""
+    k = min(k, scores.shape[0])
+    if k < scores.shape[0]:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(scores.shape[0])
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def id_mask(ids: "np.ndarray", allowed: "np.ndarray") -> "np.ndarray":
+    """Boolean mask over ids: True where the id is in the sorted array allowed."""
+    if allowed.shape[0] == 0:
+        return np.zeros(ids.shape[0], dtype=bool)
+    pos = np.searchsorted(allowed, ids)
+    np.minimum(pos, allowed.shape[0] - 1, out=pos)
+    return allowed[pos] == ids
+
+
+def scan_rows(vectors: "np.ndarray", rows: "np.ndarray", q: "np.ndarray") -> "np.ndarray":
+    """Scores of the selected rows only, gathered in blocks to bound the copy."""
+    scores = np.empty(rows.shape[0], dtype=np.float32)
+    for start in range(0, rows.shape[0], _GATHER_CHUNK):
+        block = rows[start:start + _GATHER_CHUNK]
+        scores[start:start + block.shape[0]] = np.asarray(vectors[block]) @ q
+    return scores
+
+
+def quantize_int8(vectors: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Symmetric per-dimension int8 quantization: code = round(x / scale) with
+    scale = max|x| / 127 for that dimension. Returns (codes, scale).
+    """
+    scale = np.abs(vectors).max(axis=0).astype(np.float32) / 127.0
+    scale[scale == 0] = 1.0
+    codes = np.empty(vectors.shape, dtype=np.int8)
+    for start in range(0, vectors.shape[0], 65536):
+        block = vectors[start:start + 65536] / scale
+        codes[start:start + block.shape[0]] = np.clip(np.rint(block), -127, 127)
+    return codes, scale
+
+
+class QuantizedMatrix:
+    """
+    int8 copy of an EmbeddingMatrix for the coarse scan. The best
+    `rerank` candidates are re-scored exactly against the float32 vectors,
+    which are only touched for those rows (they stay memory-mapped on disk).
+    """
+
+    def __init__(
+        self,
+        ids: "np.ndarray",
+        codes: "np.ndarray",
+        scale: "np.ndarray",
+        vectors: "np.ndarray",
+        max_id: int = 0,
+        rerank: int = RERANK_CANDIDATES,
+    ) -> None:
+        self.ids = ids
+        self.codes = codes
+        self.scale = scale
+        self.vectors = vectors
+        self.max_id = max_id
+        self.rerank = rerank
+
+    @property
+    def size(self) -> int:
+        return int(self.ids.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.codes.shape[1]) if self.codes.ndim == 2 else 0
+
+    def coarse_scores(self, q: "np.ndarray", rows: Optional["np.ndarray"] = None) -> "np.ndarray":
+        """Approximate cosine scores for every row (or only `rows`) from the int8 codes."""
+        qs = (q * self.scale).astype(np.float32)
+        n = self.size if rows is None else rows.shape[0]
+        scores = np.empty(n, dtype=np.float32)
+        # Widen a cache-sized block of codes at a time and hand it to BLAS
+        buf = np.empty((_SCAN_CHUNK, self.dim), dtype=np.float32)
+        for start in range(0, n, _SCAN_CHUNK):
+            end = min(n, start + _SCAN_CHUNK)
+            block = buf[:end - start]
+            codes = self.codes[start:end] if rows is None else self.codes[rows[start:end]]
+            np.copyto(block, codes, casting="unsafe")
+            np.matmul(block, qs, out=scores[start:end])
+        return scores
+
+    def search(
+        self, query: List[float], k: int, allowed: Optional["np.ndarray"] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the top-k (judgment_id, cosine_score) pairs, best first.
+        Scores are exact float32 cosine scores after re-ranking. If allowed
+        (sorted judgment ids) is given, only those rows are scanned.
+        """
+        if self.size == 0 or k <= 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32).ravel()
+        if q.shape[0] != self.dim:
+            logger.warning("Query embedding dim %d does not match store dim %d", q.shape[0], self.dim)
+            return []
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0:
+            return []
+        q = q / norm
+
+        rows = None if allowed is None else np.flatnonzero(id_mask(self.ids, allowed))
+        candidates = np.sort(top_k_indices(self.coarse_scores(q, rows), max(k, self.rerank)))
+        if rows is not None:
+            candidates = rows[candidates]
+        exact = np.asarray(self.vectors[candidates]) @ q
+        top = top_k_indices(exact, k)
+
+        return [(int(self.ids[candidates[i]]), float(exact[i])) for i in top]
+
+
+def load_embedding_matrix(conn: sqlite3.Connection, min_id: int = 0, column: Optional[str] = None) -> EmbeddingMatrix:
+    """
+    Read every judgment embedding (with id > min_id) once and pack it into an
+    EmbeddingMatrix. column defaults to the configured backend's column
+    (judgments.embedding for OpenAI). Rows that fail to decode or have a
+    different dimension are skipped.
+    """
+    column = column or EMBEDDING_COLUMN
+    total = conn.execute(
+        f"SELECT COUNT(*) FROM judgments WHERE {column} IS NOT NULL AND id > ?", (min_id,)
+    ).fetchone()[0]
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM judgments").fetchone()[0]
+
+    cur = conn.execute(
+        f"SELECT id, {column} FROM judgments WHERE {column} IS NOT NULL AND id > ? ORDER BY id", (min_id,)
+    )
+    return _pack_embeddings(cur, total, max_id)
+
+
+def load_missing_embeddings(
+    conn: sqlite3.Connection, present_ids: "np.ndarray", column: Optional[str] = None
+) -> EmbeddingMatrix:
+    """
+    Embeddings of judgments whose id is not in present_ids (sorted). Used for
+    the delta next to an export or index: this also catches judgments that
+    existed at export time but were only embedded afterwards.
+    """
+    column = column or EMBEDDING_COLUMN
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM judgments").fetchone()[0]
+    embedded = np.fromiter(
+        (row[0] for row in conn.execute(f"SELECT id FROM judgments WHERE {column} IS NOT NULL ORDER BY id")),
+        dtype=np.int64,
+    )
+    missing = embedded[~id_mask(embedded, np.asarray(present_ids))]
+
+    def rows():
+        for start in range(0, missing.shape[0], _FETCH_CHUNK):
+            chunk = missing[start:start + _FETCH_CHUNK].tolist()
+            yield from conn.execute(
+                f"SELECT id, {column} FROM judgments WHERE id IN ({','.join('?' * len(chunk))}) ORDER BY id",
+                chunk,
+            )
+
+    return _pack_embeddings(rows(), missing.shape[0], max_id)
+
+
+def embedding_count(conn: sqlite3.Connection, column: Optional[str] = None) -> int:
+    """Number of judgments with an embedding; a change means a delta is stale."""
+    column = column or EMBEDDING_COLUMN
+    return conn.execute(f"SELECT COUNT(*) FROM judgments WHERE {column} IS NOT NULL").fetchone()[0]
+
+
+def _pack_embeddings(rows, total: int, max_id: int) -> EmbeddingMatrix:
+    """Decode (id, blob) rows, in id order, into a normalised EmbeddingMatrix."""
+    ids = np.empty(total, dtype=np.int64)
+    vectors: Optional[np.ndarray] = None
+    n = 0
+
+    for judgment_id, blob in rows:
+        if n >= total:
+            break
+        try:
+            vec = decode_embedding(blob)
+        except Exception as e:
+            logger.warning("Error decoding embedding for judgment %s: %s", judgment_id, e)
+            continue
+
+        if vectors is None:
+            vectors = np.empty((total, vec.shape[0]), dtype=np.float32)
+        if vec.shape[0] != vectors.shape[1]:
+            logger.warning("Skipping judgment %s: embedding dim %d != %d", judgment_id, vec.shape[0], vectors.shape[1])
+            continue
+
+        ids[n] = judgment_id
+        vectors[n] = vec
+        n += 1
+
+    if vectors is None:
+        return EmbeddingMatrix(np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32), max_id)
+
+    ids = ids[:n]
+    vectors = np.ascontiguousarray(vectors[:n])
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors /= norms
+
+    logger.info("Loaded %d judgment embeddings (dim=%d)", n, vectors.shape[1])
+    return EmbeddingMatrix(ids, vectors, max_id)
+
+
+# -----------------------------
+# Memory-mapped export
+# -----------------------------
+def export_ids_path(path: str) -> str:
+    """Id sidecar for an exported vector file: foo.npy -> foo.ids.npy"""
+    root, _ = os.path.splitext(path)
+    return f"{root}.ids.npy"
+
+
+def export_int8_paths(path: str) -> Tuple[str, str]:
+    """int8 codes and per-dimension scale sidecars: foo.int8.npy, foo.scale.npy"""
+    root, _ = os.path.splitext(path)
+    return f"{root}.int8.npy", f"{root}.scale.npy"
+
+
+def save_array_atomic(path: str, array: "np.ndarray") -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def export_embedding_matrix(conn: sqlite3.Connection, path: Optional[str] = None) -> EmbeddingMatrix:
+    """
+    Write the normalised matrix to a .npy file plus an id sidecar and the
+    int8-quantized sidecars, so API workers can memory-map it instead of
+    each building a private copy. Sidecars are swapped in first and the
+    vector file last; each file is replaced atomically with os.replace.
+    """
+    path = path or EXPORT_PATH
+    matrix = load_embedding_matrix(conn)
+    codes, scale = quantize_int8(matrix.vectors)
+    codes_path, scale_path = export_int8_paths(path)
+    save_array_atomic(export_ids_path(path), matrix.ids)
+    save_array_atomic(codes_path, codes)
+    save_array_atomic(scale_path, scale)
+    save_array_atomic(path, matrix.vectors)
+    return matrix
+
+
+def _export_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def open_mapped_matrix(path: Optional[str] = None, quantization: Optional[str] = None):
+    """
+    Open an exported matrix read-only with np.memmap. Pages live in the OS
+    page cache and are shared by every worker process mapping the file.
+    With quantization="int8" the int8 sidecar drives the scan and the
+    float32 file is only read for re-ranking.
+    Returns None if the export is missing or a re-export is half-way done.
+    """
+    path = path or EXPORT_PATH
+    quantization = quantization or QUANTIZATION
+    ids_path = export_ids_path(path)
+    codes_path, scale_path = export_int8_paths(path)
+    try:
+        vectors_mtime = os.stat(path).st_mtime_ns
+        if os.stat(ids_path).st_mtime_ns > vectors_mtime:
+            return None
+        ids = np.load(ids_path)
+        vectors = np.load(path, mmap_mode="r")
+
+        codes = scale = None
+        if quantization == "int8":
+            if os.stat(codes_path).st_mtime_ns > vectors_mtime or os.stat(scale_path).st_mtime_ns > vectors_mtime:
+                return None
+            codes = np.load(codes_path, mmap_mode="r")
+            scale = np.load(scale_path)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not open embedding export %s: %s", path, e)
+        return None
+
+    if vectors.ndim != 2 or ids.shape[0] != vectors.shape[0]:
+        return None
+
+    max_id = int(ids[-1]) if ids.shape[0] else 0
+    if codes is not None:
+        if codes.shape != vectors.shape:
+            return None
+        return QuantizedMatrix(ids, codes, scale, vectors, max_id)
+    return EmbeddingMatrix(ids, vectors, max_id)
+
+
+def merge_results(a: List[Tuple[int, float]], b: List[Tuple[int, float]], k: int) -> List[Tuple[int, float]]:
+    """Merge two best-first (id, score) lists into one top-k list."""
+    if not b:
+        return a
+    return sorted(a + b, key=lambda x: x[1], reverse=True)[:k]
+
+
+class _MappedStore:
+    """An exported, memory-mapped matrix plus an in-memory delta of newer judgments."""
+
+    def __init__(self, matrix, stamp: Tuple[int, int]) -> None:
+        self.matrix = matrix
+        self.stamp = stamp
+        self.delta: Optional[EmbeddingMatrix] = None
+        self.embedding_count = matrix.size
+
+    @property
+    def size(self) -> int:
+        return self.matrix.size + (self.delta.size if self.delta is not None else 0)
+
+    def search(
+        self, query: List[float], k: int, allowed: Optional["np.ndarray"] = None
+    ) -> List[Tuple[int, float]]:
+        results = self.matrix.search(query, k, allowed)
+        if self.delta is not None and self.delta.size:
+            results = merge_results(results, self.delta.search(query, k, allowed), k)
+        return results
+
+
+# -----------------------------
+# Process-wide cache
+# -----------------------------
+_matrix: Optional[EmbeddingMatrix] = None
+_matrix_count = 0
+_mapped: Optional[_MappedStore] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_embedding_matrix(conn: sqlite3.Connection):
+    """
+    Return the searchable embedding store for this process.
+
+    If an export exists (scripts/export_embeddings.py) it is memory-mapped,
+    re-opened when the file is replaced, and judgments added after the
+    export (or embedded after it) are scanned from a small in-memory delta.
+    Otherwise the matrix is loaded from the DB on first use and rebuilt when
+    the number of embedded judgments changes.
+    Checks happen at most every REFRESH_INTERVAL_SECONDS.
+    """
+    global _matrix, _matrix_count, _mapped, _checked_at
+
+    with _lock:
+        now = time.monotonic()
+        current = _mapped or _matrix
+        if current is not None and now - _checked_at < REFRESH_INTERVAL_SECONDS:
+            return current
+        _checked_at = now
+
+        stamp = _export_stamp(EXPORT_PATH)
+        if stamp is not None:
+            if _mapped is None or _mapped.stamp != stamp:
+                matrix = open_mapped_matrix(EXPORT_PATH)
+                if matrix is not None:
+                    _mapped = _MappedStore(matrix, stamp)
+                    _matrix = None
+                    logger.info("Mapped %d judgment embeddings from %s", matrix.size, EXPORT_PATH)
+                elif _mapped is not None:
+                    # Re-export in progress: keep serving the old mapping
+                    _checked_at = 0.0
+
+            if _mapped is not None:
+                count = embedding_count(conn)
+                if count != _mapped.embedding_count:
+                    _mapped.delta = load_missing_embeddings(conn, _mapped.matrix.ids)
+                    _mapped.embedding_count = count
+                return _mapped
+        else:
+            _mapped = None
+
+        count = embedding_count(conn)
+        if _matrix is not None and count == _matrix_count:
+            return _matrix
+
+        _matrix = load_embedding_matrix(conn)
+        _matrix_count = count
+        return _matrix
+
+
+def invalidate_embedding_matrix() -> None:
+    """Drop the cached store so the next query reloads it."""
+    global _matrix, _mapped
+    with _lock:
+        _matrix = None
+        _mapped = None
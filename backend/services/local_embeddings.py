@@ -0,0 +1,238 @@
+# backend/services/local_embeddings.py
+# Offline embedding model: hashed TF-IDF projected with a truncated SVD (LSA)
+
+from __future__ import annotations
+
+import io
+import logging
+import re
+import sqlite3
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Defaults
+# -----------------------------
+DEFAULT_FEATURES = 2 ** 16
+DEFAULT_DIM = 256
+MAX_DOC_CHARS = 200_000
+
+# Words plus section-style tokens such as 489-f, 22-a, 1/2
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-/][a-z0-9]+)*")
+
+_MODELS_TABLE = """
+CREATE TABLE IF NOT EXISTS embedding_models (
+    name TEXT PRIMARY KEY,
+    n_features INTEGER NOT NULL,
+    dim INTEGER NOT NULL,
+    idf BLOB NOT NULL,
+    components BLOB NOT NULL,
+    trained_docs INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+)
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall((text or "")[:MAX_DOC_CHARS].lower())
+
+
+def _to_blob(array: "np.ndarray") -> bytes:
+    buf = io.BytesIO()
+    np.save(buf, array, allow_pickle=False)
+    return buf.getvalue()
+
+
+def _from_blob(blob: bytes) -> "np.ndarray":
+    return np.load(io.BytesIO(blob), allow_pickle=False)
+
+
+# -----------------------------
+# Model
+# -----------------------------
+class HashedLsaModel:
+    """
+    Tokens are hashed (crc32) into n_features buckets, weighted with
+    sublinear TF-IDF and L2-normalised; the sparse vector is then projected
+    onto `dim` latent components learned by a randomized truncated SVD.
+    Encoding a query is a gather of a few component rows and a sum.
+    """
+
+    def __init__(
+        self,
+        idf: "np.ndarray",
+        components: "np.ndarray",
+        name: str = "default",
+        version: str = "",
+        trained_docs: int = 0,
+    ) -> None:
+        self.idf = idf
+        self.components = components
+        self.name = name
+        self.version = version
+        self.trained_docs = trained_docs
+        self._buckets: Dict[str, int] = {}
+
+    @property
+    def n_features(self) -> int:
+        return int(self.idf.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def model_id(self) -> str:
+        """Identifies this exact trained model (used in query cache keys)."""
+        return f"local:{self.name}:{self.version}"
+
+    def _bucket(self, token: str) -> int:
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            bucket = zlib.crc32(token.encode("utf-8")) % self.n_features
+            if len(self._buckets) < 1_000_000:
+                self._buckets[token] = bucket
+        return bucket
+
+    def term_counts(self, text: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Sparse (bucket indices, counts) for one text."""
+        tokens = tokenize(text)
+        if not tokens:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        buckets = np.fromiter((self._bucket(t) for t in tokens), dtype=np.int64, count=len(tokens))
+        idx, counts = np.unique(buckets, return_counts=True)
+        return idx, counts.astype(np.float32)
+
+    def tfidf(self, text: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Sparse L2-normalised TF-IDF vector (indices, weights)."""
+        idx, counts = self.term_counts(text)
+        if idx.shape[0] == 0:
+            return idx, counts
+        return self._weight(idx, counts)
+
+    def encode(self, texts: Sequence[str]) -> "np.ndarray":
+        """Dense (len(texts), dim) float32 embeddings; empty texts give zero rows."""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            idx, weights = self.tfidf(text)
+            if idx.shape[0]:
+                out[row] = weights @ self.components[idx]
+        return out
+
+    # -----------------------------
+    # Training
+    # -----------------------------
+    @classmethod
+    def train(
+        cls,
+        texts: Iterable[str],
+        n_features: int = DEFAULT_FEATURES,
+        dim: int = DEFAULT_DIM,
+        n_iter: int = 2,
+        oversample: int = 16,
+        seed: int = 0,
+        name: str = "default",
+    ) -> "HashedLsaModel":
+        """
+        Fit IDF weights and the SVD projection on a corpus sample.
+        The SVD is randomized (range finder + power iterations) and runs on
+        the sparse rows directly, so memory is O(n_features · (dim + oversample)).
+        """
+        model = cls(np.ones(n_features, dtype=np.float32), np.zeros((n_features, dim), dtype=np.float32), name)
+
+        rows = [model.term_counts(t) for t in texts]
+        rows = [r for r in rows if r[0].shape[0]]
+        n_docs = len(rows)
+        if n_docs == 0:
+            raise ValueError("No text to train the local embedding model on")
+
+        df = np.zeros(n_features, dtype=np.float64)
+        for idx, _ in rows:
+            df[idx] += 1
+        model.idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+        rows = [model._weight(idx, counts) for idx, counts in rows]
+
+        width = min(dim + oversample, n_docs, n_features)
+        rng = np.random.default_rng(seed)
+
+        # Range finder over the feature space: Y = X^T Ω, then power iterations
+        y = _xt_dot(rows, rng.standard_normal((n_docs, width)).astype(np.float32), n_features)
+        for _ in range(n_iter):
+            q, _ = np.linalg.qr(y)
+            y = _xt_dot(rows, _x_dot(rows, q), n_features)
+        q, _ = np.linalg.qr(y)
+
+        # SVD of the small projected matrix B = X Q (n_docs x width)
+        _, _, vt = np.linalg.svd(_x_dot(rows, q), full_matrices=False)
+        components = np.zeros((n_features, dim), dtype=np.float32)
+        k = min(dim, vt.shape[0])
+        components[:, :k] = q @ vt[:k].T
+
+        model.components = components
+        model.trained_docs = n_docs
+        model.version = datetime.now().strftime("%Y%m%d%H%M%S")
+        logger.info("Trained local embedding model on %d docs (features=%d, dim=%d)", n_docs, n_features, dim)
+        return model
+
+    def _weight(self, idx: "np.ndarray", counts: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        weights = (1.0 + np.log(counts)) * self.idf[idx]
+        weights /= float(np.linalg.norm(weights)) or 1.0
+        return idx, weights.astype(np.float32)
+
+    # -----------------------------
+    # Persistence (embedding_models table)
+    # -----------------------------
+    def save(self, conn: sqlite3.Connection) -> None:
+        conn.execute(_MODELS_TABLE)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO embedding_models
+                (name, n_features, dim, idf, components, trained_docs, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                self.name, self.n_features, self.dim,
+                _to_blob(self.idf), _to_blob(self.components),
+                self.trained_docs, self.version,
+            ),
+        )
+        conn.commit()
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, name: str = "default") -> Optional["HashedLsaModel"]:
+        """The stored model, or None if it has not been trained."""
+        try:
+            row = conn.execute(
+                "SELECT idf, components, created_at, trained_docs FROM embedding_models WHERE name = ?", (name,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if row is None:
+            return None
+        return cls(_from_blob(row[0]), _from_blob(row[1]), name, row[2], row[3])
+
+
+def _x_dot(rows: List[Tuple["np.ndarray", "np.ndarray"]], m: "np.ndarray") -> "np.ndarray":
+    """X @ m for sparse rows X (n_docs x n_features) and dense m (n_features x w)."""
+    out = np.empty((len(rows), m.shape[1]), dtype=np.float32)
+    for i, (idx, weights) in enumerate(rows):
+        out[i] = weights @ m[idx]
+    return out
+
+
+def _xt_dot(rows: List[Tuple["np.ndarray", "np.ndarray"]], m: "np.ndarray", n_features: int) -> "np.ndarray":
+    """X^T @ m for sparse rows X and dense m (n_docs x w)."""
+    out = np.zeros((n_features, m.shape[1]), dtype=np.float32)
+    for i, (idx, weights) in enumerate(rows):
+        out[idx] += weights[:, None] * m[i]
+    return out
@@ -0,0 +1,352 @@
+# backend/services/query_embeddings.py
+# Query embedding generation with a two-tier (memory + SQLite) cache and
+# micro-batching of concurrent cache misses into one embeddings call.
+# The encoder itself comes from services/embedding_backends.py.
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from services.embedding_backends import get_backend
+from utils.embedding_codec import decode_embedding, encode_embedding
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Configuration (env overridable)
+# -----------------------------
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+CACHE_DB_PATH = os.getenv("QUERY_CACHE_DB_PATH", os.path.join(_DATA_DIR, "query_cache.sqlite"))
+
+MEMORY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_MEMORY_SIZE", "2048"))
+DISK_CACHE_SIZE = int(os.getenv("QUERY_CACHE_DISK_SIZE", "100000"))
+# A disk hit only rewrites last_used_at (for LRU eviction) once it is this stale.
+DISK_TOUCH_INTERVAL_SECONDS = float(os.getenv("QUERY_CACHE_TOUCH_SECONDS", "3600"))
+
+# Cache misses arriving within this window (ms) share one embeddings call;
+# a batch is sent early once it holds BATCH_MAX_SIZE queries. 0 disables batching.
+BATCH_WINDOW_MS = float(os.getenv("QUERY_EMBEDDING_BATCH_WINDOW_MS", "8"))
+BATCH_MAX_SIZE = int(os.getenv("QUERY_EMBEDDING_BATCH_SIZE", "64"))
+# Longest a request thread waits for its batched embedding before giving up.
+EMBED_TIMEOUT_SECONDS = float(os.getenv("QUERY_EMBEDDING_TIMEOUT_SECONDS", "30"))
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: case-folded with whitespace collapsed."""
+    return re.sub(r"\s+", " ", (query or "").strip()).casefold()
+
+
+# -----------------------------
+# Tier 1: in-process LRU
+# -----------------------------
+class _LRUCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._data: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional["np.ndarray"]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: "np.ndarray") -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# -----------------------------
+# Tier 2: SQLite table
+# -----------------------------
+class _DiskCache:
+    """
+    query_embeddings table in its own SQLite file (the legal DB is opened
+    read-only by the API). Each thread keeps one connection open. Reads only
+    write back last_used_at when the stored value is older than
+    touch_interval, and least-recently-used rows are evicted once the table
+    grows past max_rows.
+    """
+
+    def __init__(self, path: str, max_rows: int, touch_interval: float) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self.touch_interval = touch_interval
+        self._ready = False
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS query_embeddings (
+                query_key TEXT NOT NULL,
+                model TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                PRIMARY KEY (query_key, model)
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_query_embeddings_last_used ON query_embeddings(last_used_at)"
+        )
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            with self._lock:
+                if not self._ready:
+                    self._init_schema(conn)
+                    self._ready = True
+            self._local.conn = conn
+        return conn
+
+    def get(self, query_key: str, model: str) -> Optional["np.ndarray"]:
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT embedding, last_used_at FROM query_embeddings WHERE query_key = ? AND model = ?",
+                (query_key, model),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] >= self.touch_interval:
+                conn.execute(
+                    "UPDATE query_embeddings SET last_used_at = ? WHERE query_key = ? AND model = ?",
+                    (now, query_key, model),
+                )
+                conn.commit()
+            return decode_embedding(row[0])
+        except Exception as e:
+            logger.warning("Query cache read failed: %s", e)
+            return None
+
+    def put(self, query_key: str, model: str, vector: "np.ndarray") -> None:
+        now = time.time()
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % 100 == 1
+        try:
+            conn = self._connect()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO query_embeddings
+                    (query_key, model, embedding, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (query_key, model, encode_embedding(vector), now, now),
+            )
+            # Evict in batches instead of on every insert
+            if evict:
+                conn.execute(
+                    """
+                    DELETE FROM query_embeddings
+                    WHERE rowid IN (
+                        SELECT rowid FROM query_embeddings
+                        ORDER BY last_used_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_rows,),
+                )
+            conn.commit()
+        except Exception as e:
+            logger.warning("Query cache write failed: %s", e)
+
+    def count(self) -> int:
+        try:
+            return self._connect().execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+        except Exception:
+            return 0
+
+
+_memory_cache = _LRUCache(MEMORY_CACHE_SIZE)
+_disk_cache = _DiskCache(CACHE_DB_PATH, DISK_CACHE_SIZE, DISK_TOUCH_INTERVAL_SECONDS)
+
+_stats: Dict[str, int] = {
+    "memory_hits": 0, "disk_hits": 0, "misses": 0, "errors": 0, "api_calls": 0, "api_inputs": 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += n
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit/miss counters since process start, plus current cache sizes."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+    stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+    stats["memory_entries"] = len(_memory_cache)
+    stats["disk_entries"] = _disk_cache.count()
+    return stats
+
+
+# -----------------------------
+# Micro-batching
+# -----------------------------
+def _embed_texts(texts: List[str]) -> List[Optional["np.ndarray"]]:
+    """One backend call for all texts; every slot is None if the call fails."""
+    backend = get_backend()
+    if backend.remote:
+        _count("api_calls")
+        _count("api_inputs", len(texts))
+    try:
+        vectors = backend.embed(texts)
+    except Exception as e:
+        _count("errors")
+        logger.error("Embedding generation failed: %s", e)
+        return [None] * len(texts)
+
+    for vector in vectors:
+        if vector is not None:
+            vector.setflags(write=False)
+    return vectors
+
+
+class _EmbeddingBatcher:
+    """
+    Collects cache-miss texts from concurrent callers and embeds them with
+    one API call per window. The window opens when the first text arrives
+    and closes after window_ms or once max_size texts are queued. Texts with
+    the same cache key queued in the same window share one input and one
+    Future; the first caller's text is the one embedded.
+    """
+
+    def __init__(self, window_ms: float, max_size: int) -> None:
+        self.window = window_ms / 1000.0
+        self.max_size = max(1, max_size)
+        self._pending: "OrderedDict[str, Tuple[str, Future]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, key: str, text: str) -> Future:
+        with self._cond:
+            entry = self._pending.get(key)
+            if entry is not None:
+                return entry[1]
+            future = Future()
+            self._pending[key] = (text, future)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="query-embedding-batcher", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+            return future
+
+    def _next_batch(self) -> List[Tuple[str, Future]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.window
+            while len(self._pending) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch: List[Tuple[str, Future]] = []
+            while self._pending and len(batch) < self.max_size:
+                batch.append(self._pending.popitem(last=False)[1])
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                vectors = _embed_texts([text for text, _ in batch])
+            except Exception as e:
+                logger.error("Embedding batch failed: %s", e)
+                vectors = [None] * len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+
+_batcher = _EmbeddingBatcher(BATCH_WINDOW_MS, BATCH_MAX_SIZE)
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def generate_query_embedding(query: str) -> Optional["np.ndarray"]:
+    """
+    Embedding vector for a search query from the configured backend.
+    Served from the memory LRU first. For a remote backend the SQLite cache
+    is tried next, and only a miss on both calls the API, batched with
+    other misses from the same few milliseconds. The cache key is the
+    normalized query, but the backend embeds the query as written. Blocks
+    the calling thread (at most EMBED_TIMEOUT_SECONDS for a batched call),
+    so async endpoints should run it in the thread pool.
+    Returns None if the backend is not available, fails or times out.
+    """
+    backend = get_backend()
+    if not NUMPY_AVAILABLE or backend.unavailable_reason() is not None:
+        return None
+
+    key = (normalize_query(query), backend.model_id())
+
+    vector = _memory_cache.get(key)
+    if vector is not None:
+        _count("memory_hits")
+        return vector
+
+    if backend.remote:
+        vector = _disk_cache.get(*key)
+        if vector is not None:
+            _count("disk_hits")
+            _memory_cache.put(key, vector)
+            return vector
+
+    _count("misses")
+
+    text = query.strip()
+    if backend.remote and BATCH_WINDOW_MS > 0:
+        try:
+            vector = _batcher.submit(key[0], text).result(timeout=EMBED_TIMEOUT_SECONDS)
+        except FuturesTimeoutError:
+            _count("errors")
+            logger.error("Query embedding timed out after %gs", EMBED_TIMEOUT_SECONDS)
+            return None
+    else:
+        vector = _embed_texts([text])[0]
+    if vector is None:
+        return None
+
+    _memory_cache.put(key, vector)
+    if backend.remote:
+        _disk_cache.put(key[0], key[1], vector)
+    return vector
@@ -8,12 +8,12 @@ Coordinates Layer 1 (Local) → Layer 2 (External) → Layer 3 (Filter)
 """
 
 from typing import Dict, List, Optional
-import re
 
 from routers.law_search.local_search import smart_search, search_by_section, search_by_keywords, search_by_law_name, \
     search_cpc_order_rule
 from routers.law_search.filter_organize import organize_results
 from routers.law_search.external_search import search_for_missing_sections
+from utils.legal_refs import scan_refs
 
 # ═══════════════════════════════════════════════════════════════
 # DOCUMENT SECTIONS - Keys match UI labels in drafter.py
@@ -161,29 +161,17 @@ DOCUMENT_SECTIONS = {
 def extract_references_from_text(text: str) -> Dict:
     """Extract legal references from user input."""
     references = {"sections": [], "articles": [], "orders": []}
-    text_lower = text.lower()
-
-    # Section patterns: "section 302 PPC", "u/s 497 CrPC", "sec 80 CPC"
-    section_pattern = re.findall(r"(?:section|sec|u/s)\s*(\d+[A-Z]?)\s*(crpc|ppc|cpc)", text_lower, re.IGNORECASE)
-    for match in section_pattern:
-        references["sections"].append({"number": match[0].upper(), "law": match[1].upper()})
-
-    # Also catch: "302 PPC", "497 CrPC" without prefix
-    direct_pattern = re.findall(r"\b(\d+[A-Z]?)\s+(ppc|crpc|cpc)\b", text_lower, re.IGNORECASE)
-    for match in direct_pattern:
-        ref = {"number": match[0].upper(), "law": match[1].upper()}
-        if ref not in references["sections"]:
-            references["sections"].append(ref)
-
-    # Article patterns: "Article 199", "Art. 25"
-    article_pattern = re.findall(r"article\s*(\d+)", text_lower, re.IGNORECASE)
-    for match in article_pattern:
-        references["articles"].append(match)
-
-    # Order/Rule patterns: "Order XXI Rule 26", "O.39 R.1"
-    order_pattern = re.findall(r"order\s*([ivxlc]+|\d+)\s*rule\s*(\d+)", text_lower, re.IGNORECASE)
-    for match in order_pattern:
-        references["orders"].append({"order": match[0], "rule": match[1]})
+
+    # "section 302 PPC", "u/s 497 CrPC", "302 PPC", "Article 199", "Order XXI Rule 26"
+    for ref in scan_refs(text):
+        if ref.kind == "section" and ref.law in ("CRPC", "PPC", "CPC"):
+            item = {"number": ref.number, "law": ref.law}
+            if item not in references["sections"]:
+                references["sections"].append(item)
+        elif ref.kind == "article":
+            references["articles"].append(ref.number)
+        elif ref.kind == "order_rule":
+            references["orders"].append({"order": ref.order_no, "rule": ref.rule_no})
 
     return references
 
@@ -244,23 +232,9 @@ def search_for_document(category: str, facts: str) -> Dict:
             all_results["sections"].append(result)
 
     for order_ref in user_refs["orders"]:
-        # Convert roman numerals if needed
-        order_num = order_ref["order"]
-        if order_num.isdigit():
-            order_num = int(order_num)
-        else:
-            roman_map = {
-                "i": 1, "ii": 2, "iii": 3, "iv": 4, "v": 5, "vi": 6, "vii": 7,
-                "viii": 8, "ix": 9, "x": 10, "xi": 11, "xii": 12, "xiii": 13,
-                "xiv": 14, "xv": 15, "xvi": 16, "xvii": 17, "xviii": 18, "xix": 19,
-                "xx": 20, "xxi": 21, "xxxix": 39, "xl": 40,
-            }
-            order_num = roman_map.get(order_num.lower(), 0)
-
-        if order_num > 0:
-            result = search_cpc_order_rule(order_num, int(order_ref["rule"]))
-            if result and result.get("found"):
-                all_results["sections"].append(result)
+        result = search_cpc_order_rule(order_ref["order"], order_ref["rule"])
+        if result and result.get("found"):
+            all_results["sections"].append(result)
 
     # Step 5: Keyword search
     keywords = doc_config.get("keywords", [])
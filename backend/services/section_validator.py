@@ -17,6 +17,8 @@ import re
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
+from utils.legal_refs import scan_refs
+
 try:
     from services.law_rules import (
         get_applicable_sections,
@@ -53,20 +55,6 @@ class ValidationResult:
 class SectionValidator:
     """Validates and corrects section citations in legal drafts."""
 
-    # Patterns to detect section citations in text
-    SECTION_PATTERNS = [
-        # "Section 80 CPC", "Section 302 PPC"
-        r"(?:section|sec\.?|s\.?)\s*(\d+[-A-Za-z]*)\s+(cpc|crpc|ppc|qso|mflo|constitution)",
-        # "under Section 80 of CPC"
-        r"(?:under|of)\s+(?:section|sec\.?)\s*(\d+[-A-Za-z]*)\s+(?:of\s+)?(?:the\s+)?(cpc|crpc|ppc|qso|mflo)",
-        # "Article 199"
-        r"article\s*(\d+)",
-        # "u/s 302 PPC"
-        r"u/s\s*(\d+[-A-Za-z]*)\s*(ppc|crpc|cpc)",
-        # "Order XXXIX Rule 1"
-        r"order\s+([IVXLC]+|\d+)\s+rule\s+(\d+)",
-    ]
-
     # Common wrong section usage patterns
     WRONG_SECTION_RULES = {
         # Section 80 CPC should ONLY be for government
@@ -165,34 +153,14 @@ class SectionValidator:
     def _extract_cited_sections(self, text: str) -> List[Tuple[str, str]]:
         """Extract all section citations from text."""
         citations = []
-        text_lower = text.lower()
-
-        # Pattern 1: Section X CPC/PPC/CrPC
-        pattern1 = r"(?:section|sec\.?|s\.?)\s*(\d+[-A-Za-z]*)\s+(cpc|crpc|ppc|qso|mflo|c\.?p\.?c|cr\.?p\.?c|p\.?p\.?c)"
-        for match in re.finditer(pattern1, text_lower, re.IGNORECASE):
-            section = match.group(1).upper()
-            law = self._normalize_law_name(match.group(2))
-            citations.append((law, section))
-
-        # Pattern 2: Article X (Constitution)
-        pattern2 = r"article\s*(\d+)"
-        for match in re.finditer(pattern2, text_lower, re.IGNORECASE):
-            section = match.group(1)
-            citations.append(("Constitution", section))
-
-        # Pattern 3: u/s X PPC
-        pattern3 = r"u/s\s*(\d+[-A-Za-z]*)\s*(ppc|crpc|cpc)"
-        for match in re.finditer(pattern3, text_lower, re.IGNORECASE):
-            section = match.group(1).upper()
-            law = self._normalize_law_name(match.group(2))
-            citations.append((law, section))
-
-        # Pattern 4: Order X Rule Y (CPC)
-        pattern4 = r"order\s+([ivxlc]+|\d+)\s+rule\s+(\d+)"
-        for match in re.finditer(pattern4, text_lower, re.IGNORECASE):
-            order = match.group(1).upper()
-            rule = match.group(2)
-            citations.append(("CPC", f"Order {order} Rule {rule}"))
+        for ref in scan_refs(text):
+            if ref.kind == "section" and ref.law in ("CPC", "CRPC", "PPC", "QSO", "MFLO"):
+                # Section X CPC/PPC/CrPC, u/s X PPC
+                citations.append((self._normalize_law_name(ref.law), ref.number))
+            elif ref.kind == "article":
+                citations.append(("Constitution", ref.number))
+            elif ref.kind == "order_rule":
+                citations.append(("CPC", f"Order {ref.order_no} Rule {ref.rule_no}"))
 
         # Deduplicate
         return list(set(citations))
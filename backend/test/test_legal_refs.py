@@ -0,0 +1,168 @@
+"""
+════════════════════════════════════════════════════════════════
+FILE LOCATION: backend/test/test_legal_refs.py
+════════════════════════════════════════════════════════════════
+
+LEGAL REFERENCE CONFORMANCE
+- Runs utils.legal_refs.scan_refs over a corpus of reference forms seen
+  in judgments and drafts, and over text that must not match
+- Checks each span's kind / law / number / order / rule and matched text
+- Checks the parsers built on the scanner agree with it
+- Prints clean PASS/FAIL
+
+RUN:
+  (venv) PS ...\\backend> python test/test_legal_refs.py
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is on PYTHONPATH
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from utils.legal_refs import scan_refs
+
+
+# ---------- CORPUS ----------
+# text -> [(kind, law, number, order_no, rule_no, matched text)]
+S, A, O = "section", "article", "order_rule"
+CORPUS = [
+    # Sections, prefix first
+    ("convicted under Section 302 PPC", [(S, "PPC", "302", None, None, "under Section 302 PPC")]),
+    ("bail u/s 497 Cr.P.C. was refused", [(S, "CRPC", "497", None, None, "u/s 497 Cr.P.C.")]),
+    ("S. 22-A CrPC", [(S, "CRPC", "22-A", None, None, "S. 22-A CrPC")]),
+    ("sec 80 of the CPC", [(S, "CPC", "80", None, None, "sec 80 of the CPC")]),
+    ("under section 302(b), P.P.C.", [(S, "PPC", "302", None, None, "under section 302(b), P.P.C.")]),
+    ("Section 12(2) C.P.C.", [(S, "CPC", "12(2)", None, None, "Section 12(2) C.P.C.")]),
+    ("section 489-F PPC", [(S, "PPC", "489-F", None, None, "section 489-F PPC")]),
+    ("section 489 – F PPC", [(S, "PPC", "489-F", None, None, "section 489 – F PPC")]),
+    ("Section 5 QSO", [(S, "QSO", "5", None, None, "Section 5 QSO")]),
+    ("section 7 of the MFLO", [(S, "MFLO", "7", None, None, "section 7 of the MFLO")]),
+    ("Section 302 read with", [(S, None, "302", None, None, "Section 302")]),
+    # Law and number without a prefix
+    ("PPC 302", [(S, "PPC", "302", None, None, "PPC 302")]),
+    ("CrPC section 154", [(S, "CRPC", "154", None, None, "CrPC section 154")]),
+    ("an FIR under 324 PPC", [(S, "PPC", "324", None, None, "324 PPC")]),
+    ("22-A CrPC", [(S, "CRPC", "22-A", None, None, "22-A CrPC")]),
+    ("25 GWA and FCA 17", [(S, "GWA", "25", None, None, "25 GWA"), (S, "FCA", "17", None, None, "FCA 17")]),
+    # Articles
+    ("Article 199 of the Constitution", [(A, "CONST", "199", None, None, "Article 199 of the Constitution")]),
+    ("Art. 25", [(A, "CONST", "25", None, None, "Art. 25")]),
+    ("Article 10A", [(A, "CONST", "10A", None, None, "Article 10A")]),
+    ("Article 199(1)(c)", [(A, "CONST", "199(1)", None, None, "Article 199(1)(c)")]),
+    # CPC Order/Rule, Roman and Arabic
+    ("Order XXI Rule 26 CPC", [(O, "CPC", "", 21, 26, "Order XXI Rule 26 CPC")]),
+    ("O.39 R.1", [(O, "CPC", "", 39, 1, "O.39 R.1")]),
+    ("O.VII R.11 C.P.C.", [(O, "CPC", "", 7, 11, "O.VII R.11 C.P.C.")]),
+    ("Order 21, Rule 26", [(O, "CPC", "", 21, 26, "Order 21, Rule 26")]),
+    ("Order XXXIX Rules 1", [(O, "CPC", "", 39, 1, "Order XXXIX Rules 1")]),
+    ("Order XXI Rule 26 of the C.P.C.", [(O, "CPC", "", 21, 26, "Order XXI Rule 26 of the C.P.C.")]),
+    # Several in one sentence, in order
+    ("bail u/s 497 Cr.P.C. read with Order XXXIX Rule 1 and Article 199", [
+        (S, "CRPC", "497", None, None, "u/s 497 Cr.P.C."),
+        (O, "CPC", "", 39, 1, "Order XXXIX Rule 1"),
+        (A, "CONST", "199", None, None, "Article 199"),
+    ]),
+    ("Sections 302, 34 PPC", [(S, None, "302", None, None, "Sections 302"), (S, "PPC", "34", None, None, "34 PPC")]),
+    # Not references
+    ("Code of Criminal Procedure, Cr.P.C. 1898", []),
+    ("the Constitution 1973", []),
+    ("PLD 2019 SC 12 and 2023 SCMR 45", []),
+    ("the order dated 12.3.2020 was set aside", []),
+    ("Part 3 of the schedule; transport 5 PPC", [(S, "PPC", "5", None, None, "5 PPC")]),
+    ("", []),
+]
+
+
+def print_banner(title: str):
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+
+
+def run_corpus() -> bool:
+    print_banner("🚀 SCANNER CONFORMANCE")
+    all_ok = True
+    for text, expected in CORPUS:
+        got = [(r.kind, r.law, r.number, r.order_no, r.rule_no, text[r.start:r.end]) for r in scan_refs(text)]
+        if got == expected:
+            print(f"✅ PASS  {text!r}")
+        else:
+            all_ok = False
+            print(f"❌ FAIL  {text!r}")
+            print(f"   expected: {expected}")
+            print(f"   got:      {got}")
+    return all_ok
+
+
+def run_parsers() -> bool:
+    print_banner("🔗 PARSERS ON THE SCANNER")
+    from routers.law_resolve import parse_cpc_order_rule, parse_simple_refs
+    from services.search_orchestrator import extract_references_from_text
+    from utils.law_index import _parse_refs_from_text
+    from utils.law_lookup import ProcRef, parse_procedural_refs
+
+    text = "u/s 497 Cr.P.C., section 489-F PPC, Article 199 of the Constitution, O.XXI R.26 CPC, PPC 302"
+    checks = {
+        "law_lookup.parse_procedural_refs": (parse_procedural_refs(text), [
+            ProcRef("CRPC", "section", "497"),
+            ProcRef("PPC", "section", "489-F"),
+            ProcRef("CONST", "section", "199"),
+            ProcRef("CPC", "order_rule", "", 21, 26),
+            ProcRef("PPC", "section", "302"),
+        ]),
+        "law_index._parse_refs_from_text": (_parse_refs_from_text(text), [
+            ("CRPC", "section", "497"), ("PPC", "section", "489-F"), ("CONST", "article", "199"),
+            ("PPC", "section", "302"),
+        ]),
+        "law_resolve.parse_simple_refs": (parse_simple_refs(text), [
+            {"code": "CRPC", "number": "497"}, {"code": "PPC", "number": "489F"},
+            {"code": "CONST", "number": "199"}, {"code": "PPC", "number": "302"},
+        ]),
+        "law_resolve.parse_cpc_order_rule": (parse_cpc_order_rule(text), [{"order_no": "21", "rule_no": "26"}]),
+        "search_orchestrator.extract_references_from_text": (extract_references_from_text(text), {
+            "sections": [{"number": "497", "law": "CRPC"}, {"number": "489-F", "law": "PPC"},
+                         {"number": "302", "law": "PPC"}],
+            "articles": ["199"],
+            "orders": [{"order": 21, "rule": 26}],
+        }),
+    }
+    try:
+        from services.section_validator import SectionValidator
+    except Exception as e:  # law_rules needs the full backend environment
+        print(f"(SectionValidator skipped: {e})")
+    else:
+        checks["SectionValidator._extract_cited_sections"] = (
+            sorted(SectionValidator()._extract_cited_sections(text)),
+            sorted([("CrPC", "497"), ("PPC", "489-F"), ("Constitution", "199"), ("CPC", "Order 21 Rule 26"),
+                    ("PPC", "302")]),
+        )
+
+    all_ok = True
+    for name, (got, expected) in checks.items():
+        if got == expected:
+            print(f"✅ PASS  {name}")
+        else:
+            all_ok = False
+            print(f"❌ FAIL  {name}")
+            print(f"   expected: {expected}")
+            print(f"   got:      {got}")
+    return all_ok
+
+
+def main():
+    ok_corpus = run_corpus()
+    ok_parsers = run_parsers()
+
+    print_banner("✅ FINAL RESULT")
+    if ok_corpus and ok_parsers:
+        print("✅ ALL TESTS PASSED")
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# backend/utils/citations.py
+# Law-report citation parsing and the judgment_citations index
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.courts import COURTS
+
+# -----------------------------
+# Reporters and courts
+# -----------------------------
+# Law reports, and the courts' own neutral citations (2024 LHC 1234)
+REPORTERS = (
+    "PLD", "SCMR", "PSC", "CLC", "CLD", "YLR", "MLD", "PCRLJ", "PLC", "PTD", "PLJ", "NLR", "KLR", "GBLR",
+    "SCP", "FSC", "LHC", "SHC", "IHC", "PHC", "BHC",
+)
+NEUTRAL_REPORTERS = {"SCP", "FSC", "LHC", "SHC", "IHC", "PHC", "BHC"}
+
+# Court token (PLD 2019 Lah. 12, 2019 SHC KHI 12, 2020 YLR 5 (Pesh)) -> court code
+_COURT_TOKENS = {
+    **{token.upper(): code for code, court in COURTS.items() for token in court["citation_tokens"]},
+    **{code: code for code in COURTS},
+    "KHI": "SHC", "HYD": "SHC", "SUK": "SHC", "LRK": "SHC", "MIR": "SHC",
+}
+
+
+def _spaced(word: str) -> str:
+    # P.Cr.L.J. / P Cr LJ / PCrLJ all spell PCRLJ
+    return r"[\s.]*".join(word)
+
+
+def _alternation(words: Iterable[str], spaced: bool = False) -> str:
+    ordered = sorted(words, key=len, reverse=True)
+    return "|".join(_spaced(w) if spaced else re.escape(w) for w in ordered)
+
+
+_REPORTER = _alternation(REPORTERS, spaced=True)
+_COURT = _alternation(_COURT_TOKENS)
+_CITATION = re.compile(rf"""
+    (?<![A-Z0-9])
+    (?:
+        (?P<year>\d{{4}})\s*(?P<reporter>{_REPORTER})          # 2023 SCMR 45, 2019 PCr.LJ 300
+      | (?P<reporter2>{_REPORTER})\s*(?P<year2>\d{{4}})        # PLD 2024 SC 1276, SCMR 2023 45
+    )
+    (?![A-Z])[\s.,]*
+    (?:(?P<court>{_COURT})(?![A-Z])[\s.,]*)?
+    (?P<page>\d{{1,5}})?
+    (?:\s*\(\s*(?P<court2>{_COURT})\.?\s*\))?                   # 2019 YLR 12 (Lah.)
+""", re.VERBOSE)
+
+
+# -----------------------------
+# Parsing
+# -----------------------------
+class Citation(NamedTuple):
+    reporter: str
+    year: int
+    court: Optional[str]  # court code (utils/courts.py) when the citation names or implies one
+    page: Optional[int]
+
+    def __str__(self) -> str:
+        parts = [self.reporter, str(self.year), self.court, str(self.page) if self.page else None]
+        return " ".join(p for p in parts if p)
+
+
+def _to_citation(match: re.Match) -> Optional[Citation]:
+    reporter = re.sub(r"[\s.]", "", match.group("reporter") or match.group("reporter2"))
+    year = int(match.group("year") or match.group("year2"))
+    if not 1900 <= year <= 2099:
+        return None
+    token = match.group("court") or match.group("court2")
+    court = _COURT_TOKENS.get(token) if token else None
+    if reporter in ("SCMR", "PSC"):
+        court = "SCP"
+    elif reporter in NEUTRAL_REPORTERS:
+        court = reporter
+    page = int(match.group("page")) if match.group("page") else None
+    return Citation(reporter, year, court, page)
+
+
+def find_citations(text: str) -> List[Citation]:
+    """Every complete (page-bearing) law-report citation in `text`, in order, without repeats."""
+    found = []
+    for match in _CITATION.finditer(text.upper()):
+        citation = _to_citation(match)
+        if citation and citation.page and citation not in found:
+            found.append(citation)
+    return found
+
+
+def normalize_citation(text: str) -> Optional[Citation]:
+    """
+    Citation typed by a user, in any of the spacing / punctuation variants
+    the scrapers store: 'PLD 2024 SC 1276', 'pld2024 sc 1276', '2023 SCMR 45',
+    'SCMR 2023 45', '2019 P.Cr.L.J. 300', 'PLD 2019 Lah. 12'. The page may
+    be missing ('2024 SCMR', 'PLD 2019 Lahore'). None if there is none.
+    """
+    match = _CITATION.search(text.upper())
+    return _to_citation(match) if match else None
+
+
+# -----------------------------
+# judgment_citations
+# -----------------------------
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS judgment_citations (
+        judgment_id INTEGER NOT NULL,
+        reporter TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        court TEXT,
+        page INTEGER NOT NULL,
+        PRIMARY KEY (judgment_id, reporter, year, page)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_judgment_citations_lookup ON judgment_citations(reporter, year, page, court)",
+    """
+    CREATE TRIGGER IF NOT EXISTS judgment_citations_ad AFTER DELETE ON judgments BEGIN
+        DELETE FROM judgment_citations WHERE judgment_id = OLD.id;
+    END
+    """,
+)
+
+
+def create_citation_table(conn: sqlite3.Connection) -> None:
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+def index_citations(conn: sqlite3.Connection, judgment_id: int, citation: Optional[str]) -> int:
+    """
+    Record the citations in a judgment's citation field; call right after
+    inserting the judgment. Returns the number indexed.
+    """
+    create_citation_table(conn)
+    rows = [(judgment_id, c.reporter, c.year, c.court, c.page) for c in find_citations(citation or "")]
+    conn.execute("DELETE FROM judgment_citations WHERE judgment_id = ?", (judgment_id,))
+    conn.executemany("INSERT OR IGNORE INTO judgment_citations VALUES (?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def citation_where(citation: Citation, alias: str = "c") -> Tuple[str, list]:
+    """
+    WHERE clause matching `citation` on judgment_citations: an equality seek
+    on (reporter, year[, page]). A court narrows the match but rows whose
+    court is unknown still match.
+    """
+    col = f"{alias}." if alias else ""
+    clauses = [f"{col}reporter = ?", f"{col}year = ?"]
+    params: list = [citation.reporter, citation.year]
+    if citation.page is not None:
+        clauses.append(f"{col}page = ?")
+        params.append(citation.page)
+    if citation.court:
+        clauses.append(f"({col}court = ? OR {col}court IS NULL)")
+        params.append(citation.court)
+    return " AND ".join(clauses), params
@@ -0,0 +1,129 @@
+# backend/utils/courts.py
+# Court detection for judgments (judgments.court short codes)
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# -----------------------------
+# Court codes
+# -----------------------------
+# code -> display name, source domains, court tokens used in law-report citations
+COURTS: Dict[str, Dict[str, List[str] | str]] = {
+    "SCP": {
+        "name": "Supreme Court of Pakistan",
+        "domains": ["supremecourt.gov.pk"],
+        "citation_tokens": ["SC", "SCMR"],
+    },
+    "FSC": {
+        "name": "Federal Shariat Court",
+        "domains": ["federalshariatcourt.gov.pk"],
+        "citation_tokens": ["FSC"],
+    },
+    "LHC": {
+        "name": "Lahore High Court",
+        "domains": ["lhc.gov.pk"],
+        "citation_tokens": ["Lah", "Lahore"],
+    },
+    "SHC": {
+        "name": "Sindh High Court",
+        "domains": ["shc.gov.pk", "sindhhighcourt.gov.pk"],
+        "citation_tokens": ["Kar", "Karachi", "Sindh"],
+    },
+    "IHC": {
+        "name": "Islamabad High Court",
+        "domains": ["ihc.gov.pk", "islamabadhighcourt.gov.pk"],
+        "citation_tokens": ["Isl", "Islamabad"],
+    },
+    "PHC": {
+        "name": "Peshawar High Court",
+        "domains": ["phc.gov.pk", "peshawarhighcourt.gov.pk"],
+        "citation_tokens": ["Pesh", "Peshawar"],
+    },
+    "BHC": {
+        "name": "Balochistan High Court",
+        "domains": ["bhc.gov.pk", "balochistanhighcourt.gov.pk"],
+        "citation_tokens": ["Quetta", "Bal", "Balochistan"],
+    },
+}
+
+# PakistanLII groups cases by court database: /pk/cases/PKSC/, /pk/cases/PKLHC/ ...
+_PAKLII_DB = re.compile(r"/cases/PK([A-Z]+)/", re.I)
+# LHC system PDFs embed the court in the file name: 2024LHC1234.pdf
+_NEUTRAL_CITATION = re.compile(r"\d{4}(SC|FSC|LHC|SHC|IHC|PHC|BHC)\d+", re.I)
+# PLD 2019 SC 123 / PLD 2020 Lah. 45 / 2018 SCMR 100
+_REPORT_COURT = re.compile(r"\b(?:PLD|PCr\.?LJ|CLC|YLR|MLD|PLC|PTD|CLD)\s*\d{4}\s*([A-Za-z]+)\.?\s*\d+", re.I)
+_SCMR = re.compile(r"\b\d{4}\s*SCMR\b", re.I)
+
+_TOKEN_TO_CODE = {
+    token.lower(): code
+    for code, court in COURTS.items()
+    for token in court["citation_tokens"]
+}
+
+
+def court_from_url(url: Optional[str]) -> Optional[str]:
+    """Court code from a judgment's source URL, or None."""
+    if not url:
+        return None
+    host = (urlparse(url).hostname or "").lower()
+    for code, court in COURTS.items():
+        for domain in court["domains"]:
+            if host == domain or host.endswith("." + domain):
+                return code
+
+    for pattern in (_PAKLII_DB, _NEUTRAL_CITATION):
+        match = pattern.search(url)
+        if match:
+            code = match.group(1).upper()
+            code = "SCP" if code == "SC" else code
+            if code in COURTS:
+                return code
+    return None
+
+
+def court_from_citation(citation: Optional[str]) -> Optional[str]:
+    """Court code from a law-report citation (e.g. 'PLD 2019 SC 123'), or None."""
+    if not citation:
+        return None
+    if _SCMR.search(citation):
+        return "SCP"
+    match = _REPORT_COURT.search(citation)
+    if match:
+        return _TOKEN_TO_CODE.get(match.group(1).lower())
+    return None
+
+
+def detect_court(pdf_url: Optional[str], citation: Optional[str] = None) -> Optional[str]:
+    """Court code for a judgment: the source URL wins, the citation is the fallback."""
+    return court_from_url(pdf_url) or court_from_citation(citation)
+
+
+def add_court_column(conn: sqlite3.Connection) -> bool:
+    """
+    Add judgments.court if the table lacks it; True if it was added.
+    scripts/add_court_column.py backfills existing rows and indexes it.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(judgments)")}
+    if "court" in columns:
+        return False
+    conn.execute("ALTER TABLE judgments ADD COLUMN court TEXT")
+    return True
+
+
+def court_url_case_sql(column: str = "pdf_url") -> str:
+    """
+    SQL CASE expression mapping a URL column to a court code by domain, for
+    use in triggers where the Python detector is not available.
+    """
+    whens = []
+    for code, court in COURTS.items():
+        tests = " OR ".join(
+            f"{column} LIKE '%://{domain}/%' OR {column} LIKE '%.{domain}/%'"
+            for domain in court["domains"]
+        )
+        whens.append(f"WHEN {tests} THEN '{code}'")
+    return "CASE " + " ".join(whens) + " END"
@@ -0,0 +1,105 @@
+"""
+Async data access for the API.
+
+Route handlers are `async def`, so any sqlite3 / pandas call made directly
+in them blocks the event loop: one slow LIKE scan stalls every other request
+on the worker. Blocking database work is instead handed to a dedicated,
+bounded thread pool:
+
+    from utils.db_async import run_db
+
+    @router.get("/stats")
+    async def get_stats():
+        return await run_db(_get_stats)       # _get_stats is plain sync code
+
+The pool is separate from Starlette's default threadpool (used by
+run_in_threadpool for HTTP calls to OpenAI / Groq), so slow network calls
+cannot starve queries and vice versa. Its size matches the connection
+pool, so a running query never waits for a connection; extra queries queue
+here instead of piling up threads.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from utils.db_pool import POOL_SIZE
+
+T = TypeVar("T")
+
+DB_THREADS = int(os.getenv("DB_THREADS", str(POOL_SIZE)))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_active = 0
+_queued = 0
+_counter_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix="db")
+        return _executor
+
+
+class _Job:
+    """A queued call that moves itself from queued to active when a thread picks it up."""
+
+    def __init__(self, fn: Callable[..., T], args: Any, kwargs: Any) -> None:
+        self.call = functools.partial(fn, *args, **kwargs)
+        self.started = False
+
+    def run(self) -> T:
+        global _active, _queued
+        with _counter_lock:
+            self.started = True
+            _queued -= 1
+            _active += 1
+        try:
+            return self.call()
+        finally:
+            with _counter_lock:
+                _active -= 1
+
+    def done(self, _future: Any) -> None:
+        # Cancelled (awaiting task cancelled) before a thread picked it up
+        global _queued
+        with _counter_lock:
+            if not self.started:
+                self.started = True
+                _queued -= 1
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking database code on the DB thread pool and await its result."""
+    global _queued
+    job = _Job(fn, args, kwargs)
+    with _counter_lock:
+        _queued += 1
+    try:
+        future = _get_executor().submit(job.run)
+    except BaseException:
+        job.done(None)
+        raise
+    future.add_done_callback(job.done)
+    return await asyncio.wrap_future(future)
+
+
+def executor_stats() -> Dict[str, int]:
+    """Pool size plus queries running / waiting right now."""
+    with _counter_lock:
+        return {"threads": DB_THREADS, "active": _active, "queued": _queued}
+
+
+def shutdown(wait: bool = True) -> None:
+    """Stop the DB threads (e.g. on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,173 @@
+"""
+Shared SQLite connection pool for the API.
+
+Request handlers used to open a fresh sqlite3 connection per call, paying
+for the open, schema parse and a cold page cache every time. Connections
+handed out here are opened once per database file, read-only
+(file:...?mode=ro), tuned with PRAGMAs, and reused.
+
+    from utils.db_pool import LEGAL_DB_PATH, connection
+
+    with connection() as conn:            # legal_db.sqlite
+        conn.execute("SELECT ...")
+
+    conn = acquire(path)                  # or explicitly
+    try:
+        ...
+    finally:
+        conn.close()                      # returns it to the pool
+
+Scripts that write to the DB keep using sqlite3.connect directly. The
+pool never writes: WAL mode is switched on by the migration scripts
+(migrate_embeddings.py, add_section_keys.py), and a missing file raises
+FileNotFoundError instead of being created.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEGAL_DB_PATH = os.getenv("LEGAL_DB_PATH", os.path.join(_BACKEND_DIR, "data", "legal_db.sqlite"))
+
+# Idle connections kept per database file (more are opened under load and
+# closed when returned to a full pool).
+POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool."""
+
+    pool: Optional["ConnectionPool"] = None
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def discard(self) -> None:
+        """Really close the underlying connection."""
+        self.pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """Read-only connections to one SQLite file, reused LIFO (warmest first)."""
+
+    def __init__(self, path: str, size: int = POOL_SIZE) -> None:
+        self.path = os.path.abspath(path)
+        self.size = size
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def _open(self) -> PooledConnection:
+        uri = f"file:{quote(self.path)}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.pool = self
+        self.opened += 1
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Database not found: {self.path}")
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            if conn is not None:
+                self.reused += 1
+        if conn is None:
+            conn = self._open()
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.discard()
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.discard()
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.discard()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: Optional[str] = None) -> ConnectionPool:
+    """The pool for a database file (legal_db.sqlite by default)."""
+    key = os.path.abspath(path or LEGAL_DB_PATH)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
+
+
+def acquire(path: Optional[str] = None) -> PooledConnection:
+    """
+    A pooled read-only connection (sqlite3.Row rows); close() returns it.
+    Raises FileNotFoundError if the database file does not exist.
+    """
+    return get_pool(path).acquire()
+
+
+@contextmanager
+def connection(path: Optional[str] = None) -> Iterator[PooledConnection]:
+    """Context-managed pooled connection, returned to the pool on exit."""
+    with get_pool(path).connection() as conn:
+        yield conn
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Connections opened vs reused per database file since process start."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {
+        os.path.basename(p.path): {"opened": p.opened, "reused": p.reused, "idle": len(p._idle)}
+        for p in pools
+    }
+
+
+def close_all() -> None:
+    """Close every idle pooled connection (e.g. on shutdown or after a DB swap)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
@@ -0,0 +1,91 @@
+"""
+Binary storage format for judgments.embedding.
+
+Every scraper writes embeddings through encode_embedding() so the column
+holds one format only: a small versioned header followed by raw
+little-endian float32 values. Readers decode with np.frombuffer, which is
+zero-copy and needs no unpickling.
+
+Layout (little-endian):
+    offset 0   4s  magic b"PTLE"
+    offset 4   B   format version (1)
+    offset 5   B   dtype code (1 = float32)
+    offset 6   H   reserved (0)
+    offset 8   I   dimension
+    offset 12  dimension * float32
+
+Rows written before this format existed are pickles (np.float32 arrays or
+lists of float64). decode_embedding() still reads them; run
+scripts/migrate_embeddings.py once to rewrite them in place.
+"""
+
+import pickle
+import struct
+import sys
+from array import array
+from typing import Sequence
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+MAGIC = b"PTLE"
+FORMAT_VERSION = 1
+DTYPE_FLOAT32 = 1
+
+HEADER = struct.Struct("<4sBBHI")
+HEADER_SIZE = HEADER.size
+
+
+def encode_embedding(vector: Sequence[float]) -> bytes:
+    """
+    Encode an embedding vector (list, tuple or NumPy array) as a binary blob.
+    """
+    if NUMPY_AVAILABLE:
+        data = np.asarray(vector, dtype="<f4").ravel()
+        return HEADER.pack(MAGIC, FORMAT_VERSION, DTYPE_FLOAT32, 0, data.shape[0]) + data.tobytes()
+
+    data = array("f", vector)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return HEADER.pack(MAGIC, FORMAT_VERSION, DTYPE_FLOAT32, 0, len(data)) + data.tobytes()
+
+
+def is_binary_embedding(blob: bytes) -> bool:
+    """True if the blob uses the binary format (as opposed to a legacy pickle)."""
+    return blob is not None and len(blob) >= HEADER_SIZE and bytes(blob[:4]) == MAGIC
+
+
+def embedding_dim(blob: bytes) -> int:
+    """
+    Validate a binary blob header and return its dimension.
+    Raises ValueError on an unknown version/dtype or a truncated payload.
+    """
+    magic, version, dtype_code, _, dim = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary embedding blob")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported embedding format version {version}")
+    if dtype_code != DTYPE_FLOAT32:
+        raise ValueError(f"Unsupported embedding dtype code {dtype_code}")
+    if len(blob) != HEADER_SIZE + 4 * dim:
+        raise ValueError(f"Embedding blob length {len(blob)} does not match dim {dim}")
+    return dim
+
+
+def decode_embedding(blob: bytes) -> "np.ndarray":
+    """
+    Decode a stored embedding into a 1-D float32 array.
+
+    Binary blobs are returned as a read-only, zero-copy view over the blob.
+    Legacy pickled rows are unpickled and converted.
+    """
+    if is_binary_embedding(blob):
+        dim = embedding_dim(blob)
+        return np.frombuffer(blob, dtype="<f4", count=dim, offset=HEADER_SIZE)
+
+    return np.asarray(pickle.loads(blob), dtype=np.float32).ravel()
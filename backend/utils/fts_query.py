@@ -0,0 +1,176 @@
+"""
+Safe FTS5 query compiler for judgments_fts.
+
+User input goes into MATCH only after compilation: every term becomes a
+double-quoted FTS5 string, so punctuation, hyphens, stray quotes and
+reserved words ("489-F", "non-bailable", "O.XXI R.26", "NOT guilty")
+can no longer raise a syntax error and push the query onto a LIKE scan.
+
+Supported syntax (operators are upper case, as in FTS5):
+
+    bail murder                 both terms (AND)
+    bail OR "pre-arrest bail"   either
+    "Section 302 PPC"           exact phrase
+    bail*                       prefix: bail, bailable, ...
+    -dismissed / NOT dismissed  exclude
+    NEAR(bail cancellation, 5)  within 5 tokens (default 10)
+    bail NEAR/5 cancellation    same, infix form
+
+Parentheses are not grouping: OR binds only the two terms beside it.
+
+    from utils.fts_query import compile_fts_query
+
+    compile_fts_query('489-F cheque -civil')
+    # '("489 f" AND "cheque") NOT "civil"'
+
+Terms are split with the unicode61 rules judgments_fts uses (letters,
+numbers and private-use characters are token characters, combining
+diacritics are dropped, everything else separates). A term with no token
+characters is ignored. FTS5 re-tokenizes each quoted string itself, so a
+disagreement on an exotic character changes what matches, never whether
+the query parses.
+"""
+
+import re
+import unicodedata
+from typing import List, NamedTuple, Union
+
+NEAR_DEFAULT = 10
+NEAR_MAX = 1000
+
+_TOKEN = re.compile(r'''
+    (?P<neg>-)?                                    # -term, -"phrase": exclude
+    (?:
+        NEAR\((?P<near>[^)]*)\)?                   # NEAR(a b, 5)
+      | "(?P<phrase>[^"]*)"?(?P<phrase_star>\*)?   # "exact phrase", "prefix phrase"*
+      | (?P<word>[^\s"()]+)                        # bail, bail*, 489-F, OR, NEAR/5
+    )
+''', re.VERBOSE)
+_NEAR_INFIX = re.compile(r"NEAR(?:/(\d+))?")
+_NEAR_DISTANCE = re.compile(r",\s*(\d+)\s*$")
+
+
+def _is_token_char(ch: str) -> bool:
+    category = unicodedata.category(ch)
+    return category[0] in "LN" or category == "Co"
+
+
+def fts_tokens(text: str) -> List[str]:
+    """Lower-cased tokens of `text` as the unicode61 tokenizer splits it."""
+    # Combining diacritics (U+0300-U+036F) are folded away, not separators
+    text = unicodedata.normalize("NFC", "".join(
+        ch for ch in unicodedata.normalize("NFD", text) if not "\u0300" <= ch <= "\u036f"
+    ))
+    tokens, current = [], []
+    for ch in text:
+        if _is_token_char(ch):
+            current.append(ch)
+        elif current:
+            tokens.append("".join(current).lower())
+            current = []
+    if current:
+        tokens.append("".join(current).lower())
+    return tokens
+
+
+class Phrase(NamedTuple):
+    tokens: List[str]
+    prefix: bool = False
+
+    def sql(self) -> str:
+        return '"' + " ".join(self.tokens) + '"' + ("*" if self.prefix else "")
+
+
+class Near(NamedTuple):
+    phrases: List[Phrase]
+    distance: int = NEAR_DEFAULT
+
+    def sql(self) -> str:
+        return f"NEAR({' '.join(p.sql() for p in self.phrases)}, {self.distance})"
+
+
+Node = Union[Phrase, Near]
+
+
+def _phrase(text: str, prefix: bool) -> Union[Phrase, None]:
+    tokens = fts_tokens(text)
+    return Phrase(tokens, prefix) if tokens else None
+
+
+def _near_group(body: str) -> Union[Node, None]:
+    distance = NEAR_DEFAULT
+    match = _NEAR_DISTANCE.search(body)
+    if match:
+        distance = min(int(match.group(1)), NEAR_MAX)
+        body = body[:match.start()]
+    phrases = []
+    for m in _TOKEN.finditer(body):
+        if m.group("phrase") is not None:
+            node = _phrase(m.group("phrase"), bool(m.group("phrase_star")))
+        elif m.group("word") is not None:
+            node = _phrase(m.group("word").rstrip("*"), m.group("word").endswith("*"))
+        else:
+            node = None
+        if node:
+            phrases.append(node)
+    if len(phrases) < 2:
+        return phrases[0] if phrases else None
+    return Near(phrases, distance)
+
+
+def _join(nodes: List[str], op: str) -> str:
+    return nodes[0] if len(nodes) == 1 else "(" + f" {op} ".join(nodes) + ")"
+
+
+def compile_fts_query(query: str) -> str:
+    """
+    FTS5 MATCH expression for a user query, or "" when nothing in it can
+    be searched (only punctuation, or only exclusions). The result is
+    always valid FTS5 syntax.
+    """
+    clauses: List[List[Node]] = []  # AND of ORs
+    excluded: List[Node] = []
+    pending_or = pending_not = False
+    pending_near = None
+
+    for m in _TOKEN.finditer(query):
+        word = m.group("word")
+        node: Union[Node, None] = None
+        if m.group("near") is not None:
+            node = _near_group(m.group("near"))
+        elif m.group("phrase") is not None:
+            node = _phrase(m.group("phrase"), bool(m.group("phrase_star")))
+        elif not m.group("neg") and word in ("OR", "AND", "NOT"):
+            pending_or = word == "OR"
+            pending_not = word == "NOT"
+            continue
+        elif not m.group("neg") and _NEAR_INFIX.fullmatch(word):
+            distance = _NEAR_INFIX.fullmatch(word).group(1)
+            pending_near = min(int(distance), NEAR_MAX) if distance else NEAR_DEFAULT
+            continue
+        else:
+            node = _phrase(word.rstrip("*"), word.endswith("*"))
+
+        if node is None:
+            continue
+        if m.group("neg") or pending_not:
+            excluded.append(node)
+        elif pending_near is not None and clauses and isinstance(node, Phrase):
+            last = clauses[-1][-1]
+            phrases = last.phrases if isinstance(last, Near) else [last]
+            clauses[-1][-1] = Near(phrases + [node], pending_near)
+        elif pending_or and clauses:
+            clauses[-1].append(node)
+        else:
+            clauses.append([node])
+        pending_or = pending_not = False
+        pending_near = None
+
+    if not clauses:
+        return ""
+    positive = " AND ".join(_join([n.sql() for n in alternatives], "OR") for alternatives in clauses)
+    if not excluded:
+        return positive
+    if len(clauses) > 1:
+        positive = f"({positive})"
+    return f"{positive} NOT {_join([n.sql() for n in excluded], 'OR')}"
@@ -1,11 +1,27 @@
 import re
 import sqlite3
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import ContextManager, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from utils.db_pool import connection
+from utils.legal_refs import scan_refs
+from utils.title_trigrams import TrigramTitleIndex
 
 
 DB_PATH_DEFAULT = Path("data") / "law_index.sqlite"
+# law_blocks.law_code values a section reference can resolve to
+_BLOCK_LAWS = {"PPC", "CRPC", "CPC", "QSO", "FCA", "GWA", "MFLO"}
+# Bound parameters per IN (...) list; SQLite's default limit is 999 before 3.32
+_MAX_IN_PARAMS = 900
 
 
 @dataclass
@@ -38,42 +54,14 @@ def _parse_refs_from_text(text: str) -> List[Tuple[str, str, str]]:
       - u/s 497 CrPC
 
     Returns list of (law_code, kind, number)
-    kind is "section" or "article"
+    kind is "section" or "article"; spans come from utils.legal_refs
     """
     out: List[Tuple[str, str, str]] = []
-
-    # Article references
-    for m in re.finditer(r"\b(?:article|art\.?)\s*(\d{1,4})\b", text, flags=re.IGNORECASE):
-        out.append(("CONST", "article", _normalize_num(m.group(1))))
-
-    # Law code + number patterns
-    # PPC 302, CrPC 497, CPC 9, QSO 129, etc.
-    for m in re.finditer(
-        r"\b(PPC|CrPC|CPC|QSO|FCA|GWA|MFLO)\s*(\d{1,4}(?:\s*[-–]\s*[A-Za-z])?(?:\s*\(\s*\d+\s*\))?)\b",
-        text,
-        flags=re.IGNORECASE,
-    ):
-        law = m.group(1).upper()
-        num = _normalize_num(m.group(2))
-        out.append((law, "section", num))
-
-    # 22-A CrPC style
-    for m in re.finditer(
-        r"\b(\d{1,4}\s*[-–]\s*[A-Za-z])\s*(CrPC|CPC)\b", text, flags=re.IGNORECASE
-    ):
-        num = _normalize_num(m.group(1))
-        law = m.group(2).upper()
-        out.append((law, "section", num))
-
-    # "u/s 497 CrPC" style
-    for m in re.finditer(
-        r"\b(?:u\/s|under\s*section|section)\s*(\d{1,4}(?:\s*[-–]\s*[A-Za-z])?)\s*(PPC|CrPC|CPC)\b",
-        text,
-        flags=re.IGNORECASE,
-    ):
-        num = _normalize_num(m.group(1))
-        law = m.group(2).upper()
-        out.append((law, "section", num))
+    for ref in scan_refs(text):
+        if ref.kind == "article":
+            out.append(("CONST", "article", ref.number))
+        elif ref.kind == "section" and ref.law in _BLOCK_LAWS:
+            out.append((ref.law, "section", ref.number))
 
     # Deduplicate while preserving order
     seen = set()
@@ -92,11 +80,12 @@ class LawIndex:
         self.db_path = db_path
         if not self.db_path.exists():
             raise FileNotFoundError(f"SQLite index not found: {self.db_path.resolve()}")
+        # Trigram index over law_blocks.title, built on the first title search
+        self._titles: Optional[Tuple[TrigramTitleIndex, List[int], "np.ndarray", Dict[Tuple[str, str], int]]] = None
+        self._titles_lock = threading.Lock()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connection(str(self.db_path))
 
     def get_block(self, law_code: str, kind: str, number: str) -> Optional[LawHit]:
         law_code = law_code.upper()
@@ -122,46 +111,113 @@ class LawIndex:
                 source_file=row["source_file"],
             )
 
-    def search_by_title(self, law_code: str, kind: str, query: str, limit: int = 5) -> List[LawHit]:
+    def _title_index(self) -> Tuple[TrigramTitleIndex, List[int], "np.ndarray", Dict[Tuple[str, str], int]]:
+        """(trigram index, block id per position, group per position, (law_code, kind) -> group)."""
+        with self._titles_lock:
+            if self._titles is None:
+                ids: List[int] = []
+                groups: List[int] = []
+                group_ids: Dict[Tuple[str, str], int] = {}
+                titles: List[str] = []
+                with self._connect() as conn:
+                    for row in conn.execute("SELECT id, law_code, kind, title FROM law_blocks ORDER BY id"):
+                        ids.append(row["id"])
+                        groups.append(group_ids.setdefault((row["law_code"], row["kind"]), len(group_ids)))
+                        titles.append(row["title"] or "")
+                self._titles = (TrigramTitleIndex(titles), ids, np.array(groups, dtype=np.int32), group_ids)
+            return self._titles
+
+    def search_by_title(
+        self, law_code: str, kind: str, query: str, limit: int = 5, min_score: float = 0.4
+    ) -> List[LawHit]:
         """
         Lightweight fallback search if number lookup fails.
-        Example: query "information in cognizable cases" might find CrPC 154.
+        Example: query "information in cognizable cases" might find CrPC 154,
+        and so do "cognizable information" and misspellings of it: titles
+        are ranked by trigram similarity (utils.title_trigrams), best first.
+        The trigram index is built in memory on the first call. Without
+        numpy this falls back to title LIKE '%query%'.
         """
-        law_code = law_code.upper()
-        kind = kind.lower()
-        q = """
-        SELECT law_code, kind, number, title, text, source_file
-        FROM law_blocks
-        WHERE law_code=? AND kind=? AND title LIKE ?
-        LIMIT ?
-        """
-        like = f"%{query.strip()}%"
+        if not NUMPY_AVAILABLE:
+            q = """
+            SELECT law_code, kind, number, title, text, source_file
+            FROM law_blocks
+            WHERE law_code=? AND kind=? AND title LIKE ?
+            LIMIT ?
+            """
+            like = f"%{query.strip()}%"
+            with self._connect() as conn:
+                rows = conn.execute(q, (law_code.upper(), kind.lower(), like, int(limit))).fetchall()
+        else:
+            index, ids, groups, group_ids = self._title_index()
+            group = group_ids.get((law_code.upper(), kind.lower()))
+            if group is None:
+                return []
+            matches = index.search(query, limit=int(limit), min_score=min_score, mask=groups == group)
+            if not matches:
+                return []
+
+            block_ids = [ids[position] for position, _ in matches]
+            q = f"""
+            SELECT id, law_code, kind, number, title, text, source_file
+            FROM law_blocks
+            WHERE id IN ({",".join("?" * len(block_ids))})
+            """
+            with self._connect() as conn:
+                by_id = {row["id"]: row for row in conn.execute(q, block_ids).fetchall()}
+            # skip blocks deleted since the index was built
+            rows = [by_id[block_id] for block_id in block_ids if block_id in by_id]
+
         out: List[LawHit] = []
-        with self._connect() as conn:
-            rows = conn.execute(q, (law_code, kind, like, int(limit))).fetchall()
-            for row in rows:
-                out.append(
-                    LawHit(
-                        law_code=row["law_code"],
-                        kind=row["kind"],
-                        number=row["number"],
-                        title=row["title"],
-                        text=row["text"],
-                        source_file=row["source_file"],
-                    )
+        for row in rows:
+            out.append(
+                LawHit(
+                    law_code=row["law_code"],
+                    kind=row["kind"],
+                    number=row["number"],
+                    title=row["title"],
+                    text=row["text"],
+                    source_file=row["source_file"],
                 )
+            )
         return out
 
     def resolve_refs(self, refs: Sequence[Tuple[str, str, str]]) -> List[LawHit]:
         """
-        Validates refs against DB and returns only those that exist.
+        Validates refs against DB and returns only those that exist, in
+        order. One connection and one IN (...) query per (law_code, kind).
         """
-        hits: List[LawHit] = []
-        for law_code, kind, number in refs:
-            hit = self.get_block(law_code, kind, number)
-            if hit:
-                hits.append(hit)
-        return hits
+        keys = [(law_code.upper(), kind.lower(), _normalize_num(number)) for law_code, kind, number in refs]
+        wanted: Dict[Tuple[str, str], List[str]] = {}
+        for law_code, kind, number in dict.fromkeys(keys):
+            wanted.setdefault((law_code, kind), []).append(number)
+        if not wanted:
+            return []
+
+        found: Dict[Tuple[str, str, str], LawHit] = {}
+        with self._connect() as conn:
+            for (law_code, kind), numbers in wanted.items():
+                for start in range(0, len(numbers), _MAX_IN_PARAMS):
+                    chunk = numbers[start:start + _MAX_IN_PARAMS]
+                    rows = conn.execute(
+                        f"""
+                        SELECT law_code, kind, number, title, text, source_file
+                        FROM law_blocks
+                        WHERE law_code=? AND kind=? AND number IN ({",".join("?" * len(chunk))})
+                        """,
+                        (law_code, kind, *chunk),
+                    ).fetchall()
+                    for row in rows:
+                        # first row per key, as get_block's LIMIT 1
+                        found.setdefault((law_code, kind, row["number"]), LawHit(
+                            law_code=row["law_code"],
+                            kind=row["kind"],
+                            number=row["number"],
+                            title=row["title"],
+                            text=row["text"],
+                            source_file=row["source_file"],
+                        ))
+        return [found[key] for key in keys if key in found]
 
     def extract_and_resolve_from_text(self, text: str) -> List[LawHit]:
         """
@@ -170,6 +226,15 @@ class LawIndex:
         refs = _parse_refs_from_text(text)
         return self.resolve_refs(refs)
 
+    def extract_and_resolve_from_texts(self, texts: Sequence[str]) -> List[List[LawHit]]:
+        """
+        Same for many texts (a judgment batch): every ref is resolved in
+        one resolve_refs call, then handed back per text.
+        """
+        refs_per_text = [_parse_refs_from_text(text) for text in texts]
+        hits = {(h.law_code, h.kind, h.number): h for h in self.resolve_refs([r for refs in refs_per_text for r in refs])}
+        return [[hits[ref] for ref in refs if ref in hits] for refs in refs_per_text]
+
 
 def format_hits_for_prompt(hits: Sequence[LawHit], max_chars_each: int = 1800) -> str:
     """
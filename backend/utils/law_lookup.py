@@ -1,7 +1,9 @@
 import re
-import sqlite3
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from typing import TYPE_CHECKING, List, Optional, Dict
+
+if TYPE_CHECKING:
+    from utils.statute_index import StatuteIndex, StatuteSection
 
 
 # -----------------------------
@@ -70,7 +72,8 @@ def normalize_section_number(raw: str) -> str:
     if m:
         return f"{m.group(1)}(2)"
 
-    m = re.fullmatch(r"(\d+)(II|2)", s, flags=re.IGNORECASE)
+    # only the roman shorthand: a bare trailing 2 is part of the number (302, 12)
+    m = re.fullmatch(r"(\d+)(II)", s, flags=re.IGNORECASE)
     if m:
         return f"{m.group(1)}(2)"
 
@@ -116,52 +119,29 @@ class ProcRef:
     rule_no: Optional[int] = None
 
 
-_SECTION_PATTERNS = [
-    # Section 12(2) CPC, S.497 CrPC, u/s 489-F PPC, etc
-    re.compile(r"\b(?:u/s|under\s+section|section|s\.)\s*([0-9]+(?:\([0-9]+\)|[A-Za-z]|-[A-Za-z]|-F|F|II)?)\s*(CPC|CrPC|PPC|CONST|CONSTITUTION|QSO|MFLO)\b", re.IGNORECASE),
-    # Article 199 Constitution
-    re.compile(r"\b(?:article|art\.)\s*([0-9]+[A-Za-z]?)\s*(CONSTITUTION|CONST)\b", re.IGNORECASE),
-]
+# Laws resolved from law_sections (utils/statute_index.LAW_CODES)
+_PROC_LAWS = {"CPC", "CRPC", "PPC", "CONST", "QSO", "MFLO"}
 
-_ORDER_RULE_PATTERNS = [
-    # Order XXI Rule 26 CPC
-    re.compile(r"\bOrder\s+([0-9]+|[IVXLCDM]+)\s+Rule\s+([0-9]+|[IVXLCDM]+)\s*(CPC)?\b", re.IGNORECASE),
-    # O.21 R.26 CPC
-    re.compile(r"\bO\.?\s*([0-9]+|[IVXLCDM]+)\s*R\.?\s*([0-9]+|[IVXLCDM]+)\s*(CPC)?\b", re.IGNORECASE),
-]
 
 def parse_procedural_refs(text: str) -> List[ProcRef]:
-    t = text or ""
-    refs: List[ProcRef] = []
+    # legal_refs imports roman_to_int from this module
+    from utils.legal_refs import scan_refs
 
-    # order/rule first (most important to avoid wrong "26" matching)
-    for pat in _ORDER_RULE_PATTERNS:
-        for m in pat.finditer(t):
-            o_raw = (m.group(1) or "").strip()
-            r_raw = (m.group(2) or "").strip()
-            o = int(o_raw) if o_raw.isdigit() else roman_to_int(o_raw)
-            r = int(r_raw) if r_raw.isdigit() else roman_to_int(r_raw)
-            if o and r:
-                refs.append(ProcRef(law_hint="CPC", kind="order_rule", number="", order_no=o, rule_no=r))
-
-    # sections/articles
-    for pat in _SECTION_PATTERNS:
-        for m in pat.finditer(t):
-            num = (m.group(1) or "").strip()
-            law = (m.group(2) or "").strip().upper()
-            if law == "CONSTITUTION":
-                law = "CONST"
-            refs.append(ProcRef(law_hint=law, kind="section", number=num))
-
-    # dedupe (stable)
+    refs: List[ProcRef] = []
     seen = set()
-    out = []
-    for r in refs:
-        key = (r.law_hint, r.kind, normalize_section_number(r.number), r.order_no, r.rule_no)
+    for span in scan_refs(text):
+        if span.kind == "order_rule":
+            ref = ProcRef(law_hint="CPC", kind="order_rule", number="", order_no=span.order_no, rule_no=span.rule_no)
+        elif span.law in _PROC_LAWS:
+            # articles are CONST sections in law_sections
+            ref = ProcRef(law_hint=span.law, kind="section", number=span.number)
+        else:
+            continue
+        key = (ref.law_hint, ref.kind, normalize_section_number(ref.number), ref.order_no, ref.rule_no)
         if key not in seen:
             seen.add(key)
-            out.append(r)
-    return out
+            refs.append(ref)
+    return refs
 
 
 # -----------------------------
@@ -180,135 +160,43 @@ class LawBlock:
 class LawLookup:
     """
     Safe lookup over legal_db.sqlite law_sections without hallucinating.
+    Served from the in-memory statute index (utils/statute_index.py).
     """
     def __init__(self, sqlite_path: str):
         self.sqlite_path = sqlite_path
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.sqlite_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _index(self) -> "StatuteIndex":
+        # statute_index imports this module's normalizers
+        from utils.statute_index import get_statute_index
+
+        return get_statute_index(self.sqlite_path)
 
     @staticmethod
-    def _law_name_like(law_hint: str) -> str:
-        hint = (law_hint or "").upper()
-        if hint == "CPC":
-            return "%Civil Procedure%"
-        if hint == "CRPC":
-            return "%Criminal Procedure%"
-        if hint == "PPC":
-            return "%Penal Code%"
-        if hint in ("CONST", "CONSTITUTION"):
-            return "%Constitution%"
-        if hint == "QSO":
-            return "%Shahadat%"
-        if hint == "MFLO":
-            return "%Muslim Family Laws%"
-        return "%"
+    def _block(row: "StatuteSection", kind: str) -> LawBlock:
+        return LawBlock(
+            law_name=row.law_name,
+            kind=kind,
+            section_number=row.section_number,
+            section_title=row.section_title,
+            section_text=row.section_text,
+            source_file=row.source_file,
+        )
 
     def find_section(self, law_hint: str, raw_section_number: str) -> Optional[LawBlock]:
         """
         Find a normal section (e.g., CrPC 497, PPC 302, Const 199).
-        Uses strong normalization and multiple variants.
+        Section numbers are matched on their canonical key (22-A == 22A).
         """
-        wanted_norm = normalize_section_number(raw_section_number)
-        if not wanted_norm:
-            return None
-
-        variants = section_variants(raw_section_number)
-        law_like = self._law_name_like(law_hint)
-
-        # quick SQL prefilter by law_name
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT law_name, section_number, section_title, section_text, source_file
-                FROM law_sections
-                WHERE law_name LIKE ?
-                """,
-                (law_like,)
-            ).fetchall()
-
-        # python-side normalization match (safe and accurate)
-        best = None
-        for row in rows:
-            db_num = row["section_number"] or ""
-            db_norm = normalize_section_number(db_num)
-            if db_norm == wanted_norm or db_num in variants:
-                # prefer longer text (usually full section)
-                text_len = len(row["section_text"] or "")
-                if best is None or text_len > best[0]:
-                    best = (text_len, row)
-
-        if not best:
-            return None
-
-        row = best[1]
-        return LawBlock(
-            law_name=row["law_name"],
-            kind="section",
-            section_number=row["section_number"] or "",
-            section_title=row["section_title"] or "",
-            section_text=row["section_text"] or "",
-            source_file=row["source_file"] or "",
-        )
+        row = self._index().section(law_hint, raw_section_number)
+        return self._block(row, "section") if row else None
 
     def find_cpc_order_rule(self, order_no: int, rule_no: int) -> Optional[LawBlock]:
         """
-        Find CPC Order/Rule safely by searching for BOTH order and rule markers in title/text.
-        This avoids the dangerous 'just number=26' matching.
+        Find CPC Order/Rule by the (order, rule) pair, never by the bare
+        rule number, so 'Rule 26' cannot match section 26.
         """
-        law_like = self._law_name_like("CPC")
-
-        # patterns to match both numeric and roman forms in text
-        # Example: "Order XXI" OR "Order 21"
-        order_patterns = [
-            f"%order {order_no}%",
-        ]
-        rule_patterns = [
-            f"%rule {rule_no}%",
-        ]
-
-        # also allow roman form if common in source texts
-        # (we do not generate roman string here; LIKE will still match numeric forms in most PDFs)
-        with self._connect() as conn:
-            candidates = conn.execute(
-                """
-                SELECT law_name, section_number, section_title, section_text, source_file
-                FROM law_sections
-                WHERE law_name LIKE ?
-                """,
-                (law_like,)
-            ).fetchall()
-
-        best = None
-        o = str(order_no)
-        r = str(rule_no)
-
-        for row in candidates:
-            title = (row["section_title"] or "").lower()
-            body = (row["section_text"] or "").lower()
-
-            # must contain BOTH signals somewhere
-            if ("order" in title or "order" in body) and ("rule" in title or "rule" in body):
-                if f"order {o}" in title or f"order {o}" in body:
-                    if f"rule {r}" in title or f"rule {r}" in body:
-                        text_len = len(row["section_text"] or "")
-                        if best is None or text_len > best[0]:
-                            best = (text_len, row)
-
-        if not best:
-            return None
-
-        row = best[1]
-        return LawBlock(
-            law_name=row["law_name"],
-            kind="order_rule",
-            section_number=row["section_number"] or "",
-            section_title=row["section_title"] or "",
-            section_text=row["section_text"] or "",
-            source_file=row["source_file"] or "",
-        )
+        row = self._index().order_rule(order_no, rule_no)
+        return self._block(row, "order_rule") if row else None
 
     def resolve_refs(self, query_text: str) -> Dict[str, LawBlock]:
         """
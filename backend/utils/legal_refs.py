@@ -0,0 +1,122 @@
+"""
+Legal reference scanner: sections, articles and CPC Order/Rule references
+in one pass over the text.
+
+One precompiled alternation covers every form the parsers used to look
+for with their own regex lists:
+
+    Section 302 PPC, S. 497 Cr.P.C., u/s 489-F PPC, sec 80 of the CPC
+    302 PPC, 22-A CrPC, PPC 302, CrPC section 154
+    Article 199, Art. 25 of the Constitution
+    Order XXI Rule 26 CPC, O.39 R.1, Order 21, Rule 26
+
+    from utils.legal_refs import scan_refs
+
+    for ref in scan_refs("bail u/s 497 Cr.P.C. read with Order XXXIX Rule 1"):
+        ref.kind, ref.law, ref.number, ref.order_no, ref.rule_no, ref.start, ref.end
+    # ('section', 'CRPC', '497', None, None, 5, 21)
+    # ('order_rule', 'CPC', '', 39, 1, 32, 51)
+
+Spans come back in text order and never overlap, so "Rule 26" inside an
+Order/Rule reference is not also a section. `law` is the upper-case code
+with dots and spaces removed (PPC, CRPC, CPC, QSO, MFLO, FCA, GWA, CONST)
+or None for a bare "section 302". Articles are always CONST. `number` is
+the section as written minus spaces (489-F, 12(2)); a trailing clause such
+as the (b) of 302(b) is not part of it.
+
+tests: python test/test_legal_refs.py; throughput: scripts/bench_legal_refs.py
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+
+from utils.law_lookup import roman_to_int
+
+# Law abbreviations as written ("Cr.P.C.", "C P C", "Constitution") -> code
+LAW_ALIASES = {
+    "PPC": "PPC",
+    "CRPC": "CRPC",
+    "CPC": "CPC",
+    "QSO": "QSO",
+    "MFLO": "MFLO",
+    "FCA": "FCA",
+    "GWA": "GWA",
+    "CONST": "CONST",
+    "CONSTITUTION": "CONST",
+}
+
+
+def _dotted(word: str) -> str:
+    # C.P.C. / C P C / CPC; Cr.P.C. keeps "Cr" together
+    parts = ["CR" if word.startswith("CR") else word[0]] + list(word[2 if word.startswith("CR") else 1:])
+    return r"\.?\s?".join(re.escape(p) for p in parts) + r"\.?"
+
+
+_LAW = "|".join(
+    "CONSTITUTION|CONST\\.?" if alias == "CONSTITUTION" else _dotted(alias)
+    for alias in sorted(LAW_ALIASES, key=len, reverse=True)
+    if alias != "CONST"
+)
+_CPC = _dotted("CPC")
+# 302, 489-F, 22A, 12(2), 12-2; a letter suffix must end the word (not the P of "302PPC")
+_NUM = r"\d{1,4}(?:\s?[-–]\s?[A-Z](?![A-Z])|[A-Z](?![A-Z])|\(\d{1,2}\)|-\d{1,2}(?![\d(]))?"
+_CLAUSE = r"(?:\s?\([a-z0-9]{1,4}\))*"
+_ROMAN_OR_NUM = r"\d{1,3}|[IVXLC]{1,8}"
+
+# A bare law + number or number + law never takes a year ("Cr.P.C. 1898")
+_REF = re.compile(rf"""
+    \b(?=[OSUACPQMFG0-9])(?<![A-Z0-9])                                         # cheap reject of other words
+    (?:
+        (?:ORDER|O\.?)\s*(?P<order>{_ROMAN_OR_NUM})\s*[,.]?\s*                     # Order XXI Rule 26,
+        (?:RULES?|R\.?)\s*(?P<rule>{_ROMAN_OR_NUM})(?![A-Z0-9])                      # O.21 R.26
+        (?:\s*(?:OF\s+(?:THE\s+)?)?(?:{_CPC})(?![A-Z]))?
+      | (?:U/S|UNDER\s+SECTION|SECTIONS?|SEC\.?|S\.)\s*(?P<num>{_NUM}){_CLAUSE}    # Section 302(b), P.P.C.
+        (?:\s*,?\s*(?:OF\s+(?:THE\s+)?)?(?P<law>{_LAW})(?![A-Z]))?
+      | (?:ARTICLES?|ART\.?)\s*(?P<art>\d{{1,3}}[A-Z]?(?![A-Z])(?:\(\d{{1,2}}\))?){_CLAUSE}  # Article 199(1)(c)
+        (?:\s*(?:OF\s+(?:THE\s+)?)?(?:CONSTITUTION|CONST\.?)(?![A-Z]))?
+      | (?P<law2>{_LAW})\s*(?:SECTION\s*|S\.\s*)?(?!\d{{4}})(?P<num2>{_NUM})(?![A-Z0-9])  # PPC 302
+      | (?!\d{{4}})(?P<num3>{_NUM}){_CLAUSE}\s*,?\s*(?P<law3>{_LAW})(?![A-Z])      # 302 PPC, 22-A CrPC
+    )
+""", re.VERBOSE | re.IGNORECASE)
+
+
+class RefSpan(NamedTuple):
+    kind: str               # 'section', 'article' or 'order_rule'
+    law: Optional[str]      # code (see LAW_ALIASES); None if the text names no law
+    number: str             # section / article number; '' for order_rule
+    order_no: Optional[int]
+    rule_no: Optional[int]
+    start: int
+    end: int
+
+
+def law_code(token: str) -> str:
+    """'Cr.P.C.' -> 'CRPC', 'Constitution' -> 'CONST'."""
+    compact = re.sub(r"[\s.]", "", token).upper()
+    return LAW_ALIASES.get(compact, compact)
+
+
+def _number(raw: str) -> str:
+    return re.sub(r"\s", "", raw).replace("–", "-").upper()
+
+
+def _int(raw: str) -> Optional[int]:
+    return int(raw) if raw.isdigit() else roman_to_int(raw)
+
+
+def scan_refs(text: str) -> List[RefSpan]:
+    """Every legal reference in `text`, in order (repeats included)."""
+    refs: List[RefSpan] = []
+    for m in _REF.finditer(text or ""):
+        start, end = m.span()
+        if m.group("order"):
+            order_no, rule_no = _int(m.group("order")), _int(m.group("rule"))
+            if order_no and rule_no:
+                refs.append(RefSpan("order_rule", "CPC", "", order_no, rule_no, start, end))
+        elif m.group("art"):
+            refs.append(RefSpan("article", "CONST", _number(m.group("art")), None, None, start, end))
+        else:
+            num = m.group("num") or m.group("num2") or m.group("num3")
+            law = m.group("law") or m.group("law2") or m.group("law3")
+            refs.append(RefSpan("section", law_code(law) if law else None, _number(num), None, None, start, end))
+    return refs
@@ -0,0 +1,507 @@
+"""
+In-memory index over law_sections.
+
+Section lookups (PPC 302, CrPC 497, Article 199, CPC O.21 R.26) are the
+most frequent query in drafting and research. Instead of LIKE scans over
+law_sections, every row is loaded once into immutable dicts:
+
+    (law code, section key) -> StatuteSection      e.g. ("PPC", "489F")
+    section key             -> sections in every law
+    (order, rule)           -> CPC Order/Rule row (cpc_order_rules, see
+                               scripts/build_cpc_order_rules.py)
+    law code                -> section keys in sorted order, for prefix
+                               (autocomplete) lookups by bisection
+    section titles          -> trigram index for fuzzy title search
+                               (utils/title_trigrams.py), built on first use
+
+    from utils.statute_index import get_statute_index
+
+    index = get_statute_index()                 # legal_db.sqlite
+    index.section("CrPC", "22-A")
+    index.order_rule(21, 26)
+    index.suggest("48", law="PPC")          # 48, 480 ... 489, 489A ... 489F
+    index.search_titles("cognizable information", law="CrPC")
+
+The index is built on first use (main.py warms it at startup) and is not
+refreshed automatically: scripts that rewrite law_sections run offline,
+so restart the API or call reload_statute_index() afterwards.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from utils.db_pool import LEGAL_DB_PATH, connection
+from utils.law_lookup import roman_to_int
+from utils.title_trigrams import TrigramTitleIndex
+
+# -----------------------------
+# Law codes
+# -----------------------------
+# code -> (exact law_name values, law_name substring for other editions).
+# Rows whose law_name is listed exactly win over substring matches.
+LAW_CODES: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "CPC": (("Code of Civil Procedure 1908",), "civil procedure"),
+    "CRPC": (("Code of Criminal Procedure 1898",), "criminal procedure"),
+    "PPC": (("Pakistan Penal Code 1860",), "penal code"),
+    "CONST": (("Constitution of Pakistan 1973",), "constitution"),
+    "QSO": (("Qanun-e-Shahadat Order 1984",), "shahadat"),
+    "MFLO": ((), "muslim family laws"),
+}
+
+_CODE_ALIASES = {
+    "CONSTITUTION": "CONST",
+    "ART": "CONST",
+    "ARTICLE": "CONST",
+    "QANUN-E-SHAHADAT": "QSO",
+}
+
+# CPC rule headings, for databases without order_number / rule_number
+_ORDER_RULE_TITLE = re.compile(r"\border\s+([0-9]+|[ivxlcdm]+)\s*,?\s*rule\s+([0-9]+)\b", re.IGNORECASE)
+
+
+def canonical_law_code(law: str) -> Optional[str]:
+    """'CrPC', 'Cr.P.C.', 'Constitution' -> 'CRPC', 'CRPC', 'CONST'; None if unknown."""
+    code = re.sub(r"[\s.]+", "", law or "").upper()
+    code = _CODE_ALIASES.get(code, code)
+    return code if code in LAW_CODES else None
+
+
+def law_code_for_name(law_name: str) -> Optional[str]:
+    """Law code for a law_sections.law_name value, or None for other statutes."""
+    lowered = (law_name or "").lower()
+    for code, (names, pattern) in LAW_CODES.items():
+        if law_name in names or pattern in lowered:
+            return code
+    return None
+
+
+# -----------------------------
+# Section keys
+# -----------------------------
+# section_key() is persisted in law_sections.section_key and kept current by
+# triggers (scripts/add_section_keys.py), so every step exists twice: in
+# Python and as a SQL expression over "{s}". Keep the pairs in sync; the
+# migration script reports rows where they disagree.
+def _clean(s: str) -> str:
+    return re.sub(r"[ \t\r\n.]", "", s).upper()
+
+
+def _strip_zeros(s: str) -> str:
+    stripped = s.lstrip("0")
+    return stripped if s.startswith("0") and stripped[:1].isdigit() else s
+
+
+def _roman_two(s: str) -> str:
+    s = s.replace("(II)", "(2)")
+    m = re.fullmatch(r"(\d+)-?II", s)
+    return f"{m.group(1)}(2)" if m else s
+
+
+def _hyphen_digits(s: str) -> str:
+    m = re.fullmatch(r"(\d+)-(\d+)", s)
+    return f"{m.group(1)}({m.group(2)})" if m else s
+
+
+def _hyphen_letter(s: str) -> str:
+    m = re.match(r"(\d+)-([A-Z].*)$", s)
+    return m.group(1) + m.group(2) if m else s
+
+
+_KEY_STEPS = [
+    (
+        _clean,
+        "upper(replace(replace(replace(replace(replace({s}, ' ', ''), char(9), ''), char(13), ''), char(10), ''), '.', ''))",
+    ),
+    (
+        _strip_zeros,
+        "CASE WHEN {s} GLOB '0*' AND ltrim({s}, '0') GLOB '[0-9]*' THEN ltrim({s}, '0') ELSE {s} END",
+    ),
+    (
+        _roman_two,
+        "CASE"
+        " WHEN replace({s}, '(II)', '(2)') GLOB '[0-9]*-II'"
+        " AND substr({s}, 1, length({s}) - 3) NOT GLOB '*[^0-9]*'"
+        " THEN substr({s}, 1, length({s}) - 3) || '(2)'"
+        " WHEN replace({s}, '(II)', '(2)') GLOB '[0-9]*II'"
+        " AND substr({s}, 1, length({s}) - 2) NOT GLOB '*[^0-9]*'"
+        " THEN substr({s}, 1, length({s}) - 2) || '(2)'"
+        " ELSE replace({s}, '(II)', '(2)') END",
+    ),
+    (
+        _hyphen_digits,
+        "CASE WHEN {s} GLOB '[0-9]*-[0-9]*' AND replace({s}, '-', '') NOT GLOB '*[^0-9]*'"
+        " AND length({s}) - length(replace({s}, '-', '')) = 1"
+        " THEN substr({s}, 1, instr({s}, '-') - 1) || '(' || substr({s}, instr({s}, '-') + 1) || ')'"
+        " ELSE {s} END",
+    ),
+    (
+        _hyphen_letter,
+        "CASE WHEN instr({s}, '-') > 1 AND substr({s}, 1, instr({s}, '-') - 1) NOT GLOB '*[^0-9]*'"
+        " AND substr({s}, instr({s}, '-') + 1, 1) GLOB '[A-Z]'"
+        " THEN substr({s}, 1, instr({s}, '-') - 1) || substr({s}, instr({s}, '-') + 1)"
+        " ELSE {s} END",
+    ),
+]
+
+
+@lru_cache(maxsize=8192)
+def section_key(raw: str) -> str:
+    """
+    Canonical section number used as the index key.
+    '22-A', '22a' -> '22A'; '337-A(1)' -> '337A(1)'; '12-2', '12-II', '12II' -> '12(2)'; '007' -> '7'
+    """
+    s = raw or ""
+    for step, _ in _KEY_STEPS:
+        s = step(s)
+    return s
+
+
+def order_rule_key(order_no: int, rule_no: int) -> str:
+    """section_key of a CPC Order/Rule row: 'O21R26'."""
+    return f"O{int(order_no)}R{int(rule_no)}"
+
+
+def section_key_sql_steps(column: str) -> List[str]:
+    """
+    SQL expressions computing section_key one step at a time: the first
+    reads `column`, every later one rewrites section_key in place.
+    """
+    steps = [sql for _, sql in _KEY_STEPS]
+    return [steps[0].format(s=column)] + [sql.format(s="section_key") for sql in steps[1:]]
+
+
+def law_code_sql(column: str) -> str:
+    """SQL CASE mapping a law_name column to its law code (NULL for other statutes)."""
+    whens = []
+    for code, (names, pattern) in LAW_CODES.items():
+        exact = [f"{column} = '{name}'" for name in names]
+        cond = " OR ".join(exact + [f"lower({column}) LIKE '%{pattern}%'"])
+        whens.append(f"WHEN {cond} THEN '{code}'")
+    return "CASE " + " ".join(whens) + " END"
+
+
+def _leading_number(key: str) -> str:
+    m = re.match(r"\d+", key)
+    return m.group(0) if m else key
+
+
+# -----------------------------
+# CPC Order/Rule table
+# -----------------------------
+# (order, rule) -> law_sections row, one per pair across every CPC edition;
+# filled by scripts/build_cpc_order_rules.py
+ORDER_RULE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cpc_order_rules (
+        order_number INTEGER NOT NULL,
+        rule_number INTEGER NOT NULL,
+        section_id INTEGER NOT NULL UNIQUE,
+        PRIMARY KEY (order_number, rule_number)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cpc_order_rules_ad AFTER DELETE ON law_sections BEGIN
+        DELETE FROM cpc_order_rules WHERE section_id = OLD.id;
+    END
+    """,
+)
+
+
+def create_order_rule_table(conn: sqlite3.Connection) -> None:
+    for statement in ORDER_RULE_SCHEMA:
+        conn.execute(statement)
+
+
+def fetch_order_rule(conn: sqlite3.Connection, order_no: int, rule_no: int) -> Optional[sqlite3.Row]:
+    """One (order, rule) primary-key seek on cpc_order_rules, for scripts (see fetch_section)."""
+    return conn.execute(
+        """
+        SELECT s.law_name, s.section_number, s.section_title, s.section_text, s.source_file
+        FROM cpc_order_rules AS r
+        JOIN law_sections AS s ON s.id = r.section_id
+        WHERE r.order_number = ? AND r.rule_number = ?
+        """,
+        (int(order_no), int(rule_no)),
+    ).fetchone()
+
+
+# -----------------------------
+# Index
+# -----------------------------
+class StatuteSection(NamedTuple):
+    law_name: str
+    law_code: Optional[str]
+    section_number: str
+    section_title: str
+    section_text: str
+    source_file: str
+    order_number: Optional[int] = None
+    rule_number: Optional[int] = None
+    key: str = ""  # section_key(section_number)
+
+
+def _preference(row: StatuteSection) -> Tuple[int, int]:
+    # Canonical edition first, then the longest text (usually the full section)
+    names = LAW_CODES[row.law_code][0] if row.law_code else ()
+    return (1 if row.law_name in names else 0, len(row.section_text))
+
+
+class StatuteIndex:
+    """Immutable lookup tables over every law_sections row."""
+
+    def __init__(self, rows: List[StatuteSection]) -> None:
+        sections: Dict[Tuple[str, str], StatuteSection] = {}
+        by_key: Dict[str, List[StatuteSection]] = {}
+        by_number: Dict[str, List[StatuteSection]] = {}
+        order_rules: Dict[Tuple[int, int], StatuteSection] = {}
+
+        for row in rows:
+            if row.order_number is not None and row.rule_number is not None:
+                # CPC rules reuse section_number for the rule number; keep
+                # them out of the section tables so "CPC 1" is not Order X Rule 1.
+                pair = (row.order_number, row.rule_number)
+                current = order_rules.get(pair)
+                if current is None or _preference(row) > _preference(current):
+                    order_rules[pair] = row
+                continue
+
+            key = row.key
+            if not key:
+                continue
+            by_key.setdefault(key, []).append(row)
+            by_number.setdefault(_leading_number(key), []).append(row)
+            if row.law_code:
+                current = sections.get((row.law_code, key))
+                if current is None or _preference(row) > _preference(current):
+                    sections[(row.law_code, key)] = row
+
+        self.sections: Mapping[Tuple[str, str], StatuteSection] = MappingProxyType(sections)
+        self.by_key: Mapping[str, Tuple[StatuteSection, ...]] = MappingProxyType(
+            {k: tuple(v) for k, v in by_key.items()}
+        )
+        self._by_number: Mapping[str, Tuple[StatuteSection, ...]] = MappingProxyType({
+            k: tuple(sorted(v, key=lambda r: (len(r.section_number), r.section_number)))
+            for k, v in by_number.items()
+        })
+        self.order_rules: Mapping[Tuple[int, int], StatuteSection] = MappingProxyType(order_rules)
+
+        # Sorted keys per law code (None: every law) with their rows in the
+        # same order; every key sharing a prefix sits in one contiguous run.
+        prefixes: Dict[Optional[str], List[Tuple[str, str]]] = {None: []}
+        for code, key in sections:
+            prefixes.setdefault(code, []).append((key, code))
+            prefixes[None].append((key, code))
+        prefix_keys: Dict[Optional[str], Tuple[str, ...]] = {}
+        prefix_rows: Dict[Optional[str], Tuple[StatuteSection, ...]] = {}
+        for code, pairs in prefixes.items():
+            pairs.sort()
+            prefix_keys[code] = tuple(key for key, _ in pairs)
+            prefix_rows[code] = tuple(sections[(c, key)] for key, c in pairs)
+        self._prefix_keys: Mapping[Optional[str], Tuple[str, ...]] = MappingProxyType(prefix_keys)
+        self._prefix_rows: Mapping[Optional[str], Tuple[StatuteSection, ...]] = MappingProxyType(prefix_rows)
+
+        self._titles: Optional[Tuple[TrigramTitleIndex, Tuple[StatuteSection, ...], Dict[str, "np.ndarray"]]] = None
+        self._titles_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self.by_key.values()) + len(self.order_rules)
+
+    def section(self, law: str, raw_section_number: str) -> Optional[StatuteSection]:
+        """
+        One section of one law. `law` is a code or alias (PPC, CrPC,
+        Constitution); anything else is matched as a law_name substring.
+        """
+        key = section_key(raw_section_number)
+        if not key:
+            return None
+        code = canonical_law_code(law)
+        if code:
+            return self.sections.get((code, key))
+        wanted = (law or "").lower()
+        matches = [row for row in self.by_key.get(key, ()) if wanted in row.law_name.lower()]
+        return max(matches, key=_preference) if matches else None
+
+    def sections_for(self, raw_section_number: str, law: Optional[str] = None, limit: int = 5) -> List[StatuteSection]:
+        """
+        Exact matches first, then sub-sections sharing the leading number
+        (302 -> 302, 302A, 302B ...), shortest section number first.
+        """
+        key = section_key(raw_section_number)
+        if not key:
+            return []
+        code = canonical_law_code(law) if law else None
+        wanted = (law or "").lower()
+
+        def keep(row: StatuteSection) -> bool:
+            if not law:
+                return True
+            return row.law_code == code if code else wanted in row.law_name.lower()
+
+        out = [row for row in self.by_key.get(key, ()) if keep(row)]
+        for row in self._by_number.get(_leading_number(key), ()):
+            if len(out) >= limit:
+                break
+            if row.key != key and row.key.startswith(key) and keep(row):
+                out.append(row)
+        return out[:limit]
+
+    def suggest(self, raw_prefix: str, law: Optional[str] = None, limit: int = 10) -> List[StatuteSection]:
+        """
+        Sections whose key starts with `raw_prefix`, in key order, for
+        as-you-type completion: "48" -> 48, 480 ... 489, 489A ... 489F.
+        `law` is a code or alias; None searches every law. A trailing
+        hyphen is dropped so "489-" completes to 489A ... 489F.
+        """
+        prefix = section_key(raw_prefix.rstrip("- "))
+        code = canonical_law_code(law) if law else None
+        if not prefix or (law and not code):
+            return []
+        keys = self._prefix_keys.get(code, ())
+        rows = self._prefix_rows.get(code, ())
+        out = []
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and len(out) < limit and keys[i].startswith(prefix):
+            out.append(rows[i])
+            i += 1
+        return out
+
+    def search_titles(
+        self, query: str, law: Optional[str] = None, limit: int = 5, min_score: float = 0.4
+    ) -> List[StatuteSection]:
+        """
+        Sections (and CPC rules) whose title is most like `query`, best
+        first: "cognizable information" finds "Information in cognizable
+        cases". `law` is a code or alias; None searches every law.
+        Without numpy, titles containing `query` are returned instead, in
+        index order, as a LIKE '%query%' would.
+        """
+        code = canonical_law_code(law) if law else None
+        if law and not code:
+            return []
+        if not NUMPY_AVAILABLE:
+            needle = query.strip().lower()
+            rows = (row for row in (*self.sections.values(), *self.order_rules.values())
+                    if row.section_title and (code is None or row.law_code == code))
+            return [row for row in rows if needle in row.section_title.lower()][:limit]
+        with self._titles_lock:
+            if self._titles is None:
+                rows = tuple(row for row in (*self.sections.values(), *self.order_rules.values()) if row.section_title)
+                codes = np.array([row.law_code or "" for row in rows])
+                masks = {c: codes == c for c in LAW_CODES}
+                self._titles = (TrigramTitleIndex([row.section_title for row in rows]), rows, masks)
+        titles, rows, masks = self._titles
+        matches = titles.search(query, limit=limit, min_score=min_score, mask=masks[code] if code else None)
+        return [rows[p] for p, _ in matches]
+
+    def order_rule(self, order_no: int, rule_no: int) -> Optional[StatuteSection]:
+        """CPC Order/Rule, e.g. order_rule(21, 26) for Order XXI Rule 26."""
+        return self.order_rules.get((int(order_no), int(rule_no)))
+
+    # -----------------------------
+    # Building
+    # -----------------------------
+    @classmethod
+    def build(cls, conn: sqlite3.Connection) -> "StatuteIndex":
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(law_sections)")}
+        if not columns:
+            return cls([])
+
+        def col(name: str) -> str:
+            return f"law_sections.{name}" if name in columns else f"NULL AS {name}"
+
+        # scripts/build_cpc_order_rules.py: the one row serving each (order, rule)
+        has_rule_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cpc_order_rules'"
+        ).fetchone() is not None
+        cur = conn.execute(f"""
+            SELECT law_name, section_number, section_title, section_text,
+                   {col('source_file')}, {col('order_number')}, {col('rule_number')},
+                   {"r.section_id IS NOT NULL" if has_rule_table else "1"}
+            FROM law_sections
+            {"LEFT JOIN cpc_order_rules AS r ON r.section_id = law_sections.id" if has_rule_table else ""}
+        """)
+        has_order_columns = "order_number" in columns
+        rows = []
+        for law_name, number, title, text, source_file, order_no, rule_no, serves_rule in cur:
+            law_name = law_name or ""
+            code = law_code_for_name(law_name)
+            if code == "CPC" and order_no is not None and not serves_rule:
+                continue  # another edition of a rule already in cpc_order_rules
+            if code == "CPC" and not has_order_columns:
+                m = _ORDER_RULE_TITLE.search(title or "")
+                if m:
+                    order_no = _order_number(m.group(1))
+                    rule_no = int(m.group(2))
+            rows.append(StatuteSection(
+                law_name=law_name,
+                law_code=code,
+                section_number=number or "",
+                section_title=title or "",
+                section_text=text or "",
+                source_file=source_file or "",
+                order_number=order_no if code == "CPC" else None,
+                rule_number=rule_no if code == "CPC" else None,
+                key=section_key(number or ""),
+            ))
+        return cls(rows)
+
+
+def _order_number(raw: str) -> Optional[int]:
+    return int(raw) if raw.isdigit() else roman_to_int(raw)
+
+
+def fetch_section(conn: sqlite3.Connection, law: str, raw_section_number: str) -> Optional[sqlite3.Row]:
+    """
+    One (law_code, section_key) index seek, for code outside the API
+    process (scripts) that has no in-memory index. Needs the columns from
+    scripts/add_section_keys.py.
+    """
+    code = canonical_law_code(law)
+    key = section_key(raw_section_number)
+    if not code or not key:
+        return None
+    return conn.execute(
+        """
+        SELECT law_name, section_number, section_title, section_text, source_file
+        FROM law_sections
+        WHERE law_code = ? AND section_key = ?
+        """,
+        (code, key),
+    ).fetchone()
+
+
+_indexes: Dict[str, StatuteIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_statute_index(path: Optional[str] = None) -> StatuteIndex:
+    """The index for a database file (legal_db.sqlite by default), built once."""
+    key = os.path.abspath(path or LEGAL_DB_PATH)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            if not os.path.exists(key):
+                return StatuteIndex([])
+            with connection(key) as conn:
+                index = _indexes[key] = StatuteIndex.build(conn)
+        return index
+
+
+def reload_statute_index(path: Optional[str] = None) -> StatuteIndex:
+    """Rebuild after law_sections has been rewritten."""
+    with _indexes_lock:
+        _indexes.pop(os.path.abspath(path or LEGAL_DB_PATH), None)
+    return get_statute_index(path)
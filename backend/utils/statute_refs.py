@@ -0,0 +1,96 @@
+# backend/utils/statute_refs.py
+# Statute -> judgment postings: which judgments cite PPC 302, CrPC 497, CPC O.21 R.26
+
+from __future__ import annotations
+
+import sqlite3
+from typing import List, Optional, Set, Tuple
+
+from utils.law_lookup import parse_procedural_refs
+from utils.statute_index import canonical_law_code, order_rule_key, section_key
+
+SCHEMA = (
+    # (law_code, section_key) as in law_sections (utils/statute_index.py),
+    # one row per judgment whose full_text refers to that provision
+    """
+    CREATE TABLE IF NOT EXISTS statute_judgments (
+        law_code TEXT NOT NULL,
+        section_key TEXT NOT NULL,
+        judgment_id INTEGER NOT NULL,
+        PRIMARY KEY (law_code, section_key, judgment_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_statute_judgments_judgment ON statute_judgments(judgment_id)",
+    """
+    CREATE TRIGGER IF NOT EXISTS statute_judgments_ad AFTER DELETE ON judgments BEGIN
+        DELETE FROM statute_judgments WHERE judgment_id = OLD.id;
+    END
+    """,
+)
+
+ORDERS = ("authority", "recent")
+
+
+def create_postings_table(conn: sqlite3.Connection) -> None:
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+def statute_refs(text: str) -> Set[Tuple[str, str]]:
+    """(law_code, section_key) for every provision `text` refers to with a known law."""
+    keys = set()
+    for ref in parse_procedural_refs(text or ""):
+        code = canonical_law_code(ref.law_hint)
+        if not code:
+            continue
+        if ref.kind == "order_rule":
+            keys.add((code, order_rule_key(ref.order_no, ref.rule_no)))
+        elif section_key(ref.number):
+            keys.add((code, section_key(ref.number)))
+    return keys
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is not None
+
+
+def index_statute_refs(conn: sqlite3.Connection, judgment_id: int, full_text: Optional[str]) -> int:
+    """
+    Record the provisions a judgment refers to; call right after inserting
+    the judgment. Returns the number indexed. Does nothing (returns 0) until
+    scripts/build_statute_postings.py has created the table: a table holding
+    only newly scraped judgments would hide the LIKE fallback for the rest.
+    """
+    if not _has_table(conn, "statute_judgments"):
+        return 0
+    rows = [(code, key, judgment_id) for code, key in statute_refs(full_text)]
+    conn.execute("DELETE FROM statute_judgments WHERE judgment_id = ?", (judgment_id,))
+    conn.executemany("INSERT OR IGNORE INTO statute_judgments VALUES (?, ?, ?)", rows)
+    return len(rows)
+
+
+def judgments_for_section(
+    conn: sqlite3.Connection,
+    law_code: str,
+    key: str,
+    limit: int = 10,
+    order: str = "authority",
+) -> Optional[List[int]]:
+    """
+    Ids of judgments referring to (law_code, section_key), most
+    authoritative first (citation graph, services/citation_graph.py) or
+    newest first. None if scripts/build_statute_postings.py has not been run.
+    """
+    if not _has_table(conn, "statute_judgments"):
+        return None
+    by_authority = order == "authority" and _has_table(conn, "judgment_authority")
+    rows = conn.execute(f"""
+        SELECT s.judgment_id
+        FROM statute_judgments AS s
+        JOIN judgments AS j ON j.id = s.judgment_id
+        {"LEFT JOIN judgment_authority AS a ON a.judgment_id = s.judgment_id" if by_authority else ""}
+        WHERE s.law_code = ? AND s.section_key = ?
+        ORDER BY {"a.authority DESC," if by_authority else ""} j.judgment_date DESC, s.judgment_id DESC
+        LIMIT ?
+    """, (law_code, key, limit)).fetchall()
+    return [row[0] for row in rows]
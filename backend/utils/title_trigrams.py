@@ -0,0 +1,128 @@
+"""
+Fuzzy title search over an in-memory trigram inverted index.
+
+LIKE '%query%' on titles misses reordered and misspelled queries
+("cognizable information" for "Information in cognizable cases",
+"cognisable") and scans every row. Here each title is broken into the
+character trigrams of its words (" co", "cog", ... "le "), and a query is
+scored against every title sharing enough trigrams with it by the Dice
+coefficient 2|Q ∩ T| / (|Q| + |T|):
+
+    from utils.title_trigrams import TrigramTitleIndex
+
+    index = TrigramTitleIndex(titles)
+    index.search("cognizable information", limit=5)    # [(position, score), ...]
+
+A title holding every trigram of the query is kept whatever its score,
+so a short query ("bail", "cheque") still finds the long titles LIKE
+found, ranked below closer matches.
+
+Candidates come only from the query's rarest trigrams: a title scoring at
+least `min_score` must share m = ceil(min_score * |Q| / (2 - min_score))
+of them, so it contains one of the |Q| - m + 1 rarest. Common trigrams
+("the", "of ") are only checked against those candidates, never walked.
+
+Postings are one sorted int32 array per trigram (CSR over all titles),
+about 4 bytes per (title, trigram) pair. Overlaps are counted with numpy;
+a common trigram whose postings dwarf the candidates is checked by binary
+search instead of walked (scripts/bench_title_trigrams.py). Without numpy
+(NUMPY_AVAILABLE is False) callers fall back to substring matching.
+"""
+
+import re
+from array import array
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def title_grams(text: str) -> FrozenSet[str]:
+    """Trigrams of every word, padded with a space on each side: 'bail' -> ' ba', 'bai', 'ail', 'il '."""
+    grams = set()
+    for word in _WORD.findall((text or "").lower()):
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramTitleIndex:
+    """Immutable trigram postings over a list of titles, searched by position."""
+
+    def __init__(self, titles: Sequence[str]) -> None:
+        gram_ids: Dict[str, int] = {}
+        flat = array("I")
+        lengths = array("I")
+        for title in titles:
+            ids = [gram_ids.setdefault(gram, len(gram_ids)) for gram in title_grams(title)]
+            flat.extend(ids)
+            lengths.append(len(ids))
+
+        grams = np.frombuffer(flat, dtype=np.uint32) if flat else np.zeros(0, dtype=np.uint32)
+        self._lengths = np.frombuffer(lengths, dtype=np.uint32).astype(np.int32) if lengths else np.zeros(0, np.int32)
+        positions = np.repeat(np.arange(len(self._lengths), dtype=np.int32), self._lengths)
+        # Stable sort keeps each trigram's positions ascending
+        order = np.argsort(grams, kind="stable")
+        self._postings = positions[order]
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(grams, minlength=len(gram_ids)))))
+        self._gram_ids = gram_ids
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def _posting(self, gram_id: int) -> "np.ndarray":
+        return self._postings[self._offsets[gram_id]:self._offsets[gram_id + 1]]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        min_score: float = 0.4,
+        mask: Optional["np.ndarray"] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        (position, Dice score) of the best titles, highest first, ties by
+        position. `mask` (bool per position, e.g. one law) limits the search.
+        """
+        grams = title_grams(query)
+        if not grams or limit <= 0 or not len(self):
+            return []
+        q = len(grams)
+        # Unknown trigrams still count in |Q|; they just match nothing
+        known = sorted(
+            (self._gram_ids[g] for g in grams if g in self._gram_ids),
+            key=lambda g: self._offsets[g + 1] - self._offsets[g],
+        )
+        need = max(1, int(np.ceil(min_score * q / (2 - min_score) - 1e-9)))
+        if len(known) < need:
+            return []
+        rare, common = known[:len(known) - need + 1], known[len(known) - need + 1:]
+
+        counts = np.bincount(np.concatenate([self._posting(g) for g in rare]), minlength=len(self))
+        candidates = np.flatnonzero(counts)
+        lengths = self._lengths[candidates]
+        # A title with d trigrams shares at most d of them
+        keep = lengths >= need
+        if mask is not None:
+            keep &= mask[candidates]
+        candidates, lengths = candidates[keep], lengths[keep]
+        for g in common:
+            posting = self._posting(g)
+            if len(posting) <= 8 * len(candidates):
+                counts[posting] += 1  # positions are unique within a posting
+            else:
+                i = np.minimum(np.searchsorted(posting, candidates), len(posting) - 1)
+                counts[candidates[posting[i] == candidates]] += 1
+        overlap = counts[candidates]
+
+        score = 2 * overlap / (q + lengths)
+        hit = (score >= min_score) | (overlap == q)
+        candidates, score = candidates[hit], score[hit]
+        top = np.lexsort((candidates, -score))[:limit]
+        return [(int(candidates[i]), round(float(score[i]), 4)) for i in top]